@@ -0,0 +1,210 @@
+"""
+Retention and archival of EventLog and ErrorLog rows.
+
+Rows older than the retention window are written to gzip-compressed JSONL files
+partitioned by creation date under LOG_ARCHIVE_ROOT, indexed in LogArchive,
+and deleted from the live tables one chunk per transaction.
+"""
+import gzip
+import json
+import logging
+import os
+import secrets
+from collections import defaultdict
+from datetime import date, datetime, timezone as dt_timezone
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+
+from .audit_images import materialize_images, reconstruct_images
+from .error_utils import delete_error_logs
+from .models import ErrorLog, EventLog, LogArchive
+
+logger = logging.getLogger(__name__)
+
+# Archived row key -> queryset.values() lookup, matching the API serializers
+EVENT_ARCHIVE_COLUMNS = {
+    'id': 'id',
+    'action': 'action',
+    'actor': 'actor_id',
+    'actor_username': 'actor__username',
+    'target_user': 'target_user_id',
+    'target_username': 'target_user__username',
+    'details': 'details',
+    'before_image': 'before_image',
+    'after_image': 'after_image',
+    'record_type': 'record_type',
+    'record_id': 'record_id',
+    'created_at': 'created_at',
+}
+ERROR_ARCHIVE_COLUMNS = {
+    'id': 'id',
+    'error_code': 'error_code',
+    'level': 'level',
+    'user': 'user_id',
+    'user_username': 'user__username',
+    'request_path': 'request_path',
+    'request_method': 'request_method',
+    'user_agent': 'user_agent',
+    'ip_address': 'ip_address',
+    'error_message': 'error_message',
+    'technical_details': 'technical_details',
+    'stack_trace': 'stack_trace',
+    'resolved': 'resolved',
+    'resolved_at': 'resolved_at',
+    'resolved_by': 'resolved_by_id',
+    'resolved_by_username': 'resolved_by__username',
+    'created_at': 'created_at',
+    'fingerprint': 'fingerprint',
+    'occurrence_count': 'occurrence_count',
+    'first_seen_at': 'first_seen_at',
+    'last_seen_at': 'last_seen_at',
+    'sample_of': 'sample_of_id',
+}
+
+
+def archive_root() -> str:
+    return getattr(settings, 'LOG_ARCHIVE_ROOT', os.path.join(settings.MEDIA_ROOT, 'archives'))
+
+
+def _archive_rows(queryset, columns: dict) -> List[dict]:
+    return [
+        {key: row[lookup] for key, lookup in columns.items()}
+        for row in queryset.values(*columns.values())
+    ]
+
+
+def _event_archive_rows(queryset) -> List[dict]:
+    """Like ``_archive_rows`` but with delta-encoded images rebuilt in full."""
+    rows = list(queryset.values(*EVENT_ARCHIVE_COLUMNS.values(), 'image_delta', 'delta_base', 'delta_depth'))
+    images = reconstruct_images(rows)
+    archived = []
+    for row in rows:
+        row['before_image'], row['after_image'] = images[row['id']]
+        archived.append({key: row[lookup] for key, lookup in EVENT_ARCHIVE_COLUMNS.items()})
+    return archived
+
+
+def _delete_events(ids: List[int]):
+    # Later events that diff against the archived ones must carry full images first
+    materialize_images(EventLog.objects.filter(delta_base__in=ids).exclude(id__in=ids))
+    EventLog.objects.filter(id__in=ids).delete()
+
+
+def _write_archive_file(log_type: str, day: date, rows: List[dict]) -> LogArchive:
+    """Write ``rows`` to a new gzip JSONL file and return its unsaved index row."""
+    prefix = log_type.lower()
+    min_id, max_id = rows[0]['id'], rows[-1]['id']
+    # The random suffix keeps file names unguessable if MEDIA_ROOT is ever served
+    relative_path = os.path.join(
+        prefix, f'{day:%Y}', f'{day:%m}',
+        f'{prefix}-{day:%Y-%m-%d}-{min_id}-{max_id}-{secrets.token_hex(4)}.jsonl.gz',
+    )
+    full_path = os.path.join(archive_root(), relative_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+    temp_path = f'{full_path}.tmp'
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as archive_file:
+        for row in rows:
+            archive_file.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+    os.replace(temp_path, full_path)
+
+    return LogArchive(
+        log_type=log_type, day=day, path=relative_path,
+        row_count=len(rows), min_id=min_id, max_id=max_id,
+    )
+
+
+def _archive_chunk(log_type: str, rows: List[dict], delete_rows: Callable[[], object]) -> int:
+    """
+    Write one chunk of rows to per-day files, then index them and delete the
+    rows in one transaction. Files are removed again if that transaction fails.
+    Returns the number of files written.
+    """
+    by_day = defaultdict(list)
+    for row in rows:
+        by_day[row['created_at'].astimezone(dt_timezone.utc).date()].append(row)
+
+    archives = []
+    try:
+        for day, day_rows in sorted(by_day.items()):
+            archives.append(_write_archive_file(log_type, day, day_rows))
+        with transaction.atomic():
+            LogArchive.objects.bulk_create(archives)
+            delete_rows()
+    except Exception:
+        for archive in archives:
+            try:
+                os.remove(os.path.join(archive_root(), archive.path))
+            except OSError:
+                pass
+        raise
+    return len(archives)
+
+
+def archive_event_logs(cutoff: datetime, chunk_size: int = None) -> Tuple[int, int]:
+    """
+    Archive and delete EventLog rows created before ``cutoff``.
+    Returns ``(rows_archived, files_written)``.
+    """
+    chunk_size = chunk_size or getattr(settings, 'LOG_ARCHIVE_CHUNK_SIZE', 1000)
+    expired = EventLog.objects.filter(created_at__lt=cutoff).order_by('id')
+    archived = files = 0
+    while True:
+        rows = _event_archive_rows(expired[:chunk_size])
+        if not rows:
+            break
+        ids = [row['id'] for row in rows]
+        files += _archive_chunk('EVENT', rows, lambda: _delete_events(ids))
+        archived += len(rows)
+    return archived, files
+
+
+def archive_error_logs(cutoff: datetime, chunk_size: int = None) -> Tuple[int, int]:
+    """
+    Archive and delete grouped ErrorLog rows last seen before ``cutoff``,
+    together with their occurrence samples.
+    Returns ``(rows_archived, files_written)``.
+    """
+    chunk_size = chunk_size or getattr(settings, 'LOG_ARCHIVE_CHUNK_SIZE', 1000)
+    expired = ErrorLog.objects.filter(sample_of__isnull=True, last_seen_at__lt=cutoff).order_by('id')
+    archived = files = 0
+    while True:
+        ids = list(expired.values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            break
+        rows = _archive_rows(
+            ErrorLog.objects.filter(Q(id__in=ids) | Q(sample_of_id__in=ids)).order_by('id'),
+            ERROR_ARCHIVE_COLUMNS,
+        )
+        files += _archive_chunk('ERROR', rows, lambda: delete_error_logs(ErrorLog.objects.filter(id__in=ids)))
+        archived += len(rows)
+    return archived, files
+
+
+def iter_archived_rows(log_type: str, start: date, end: date) -> Iterator[dict]:
+    """Yield archived rows created between ``start`` and ``end`` (inclusive), newest first."""
+    archives = LogArchive.objects.filter(log_type=log_type, day__gte=start, day__lte=end).order_by('-day', '-min_id')
+    for archive in archives:
+        full_path = os.path.join(archive_root(), archive.path)
+        try:
+            with gzip.open(full_path, 'rt', encoding='utf-8') as archive_file:
+                rows = [json.loads(line) for line in archive_file]
+        except OSError as e:
+            logger.warning(f"Could not read log archive {archive.path}: {e}")
+            continue
+        yield from reversed(rows)
+
+
+def expired_counts(event_cutoff: datetime = None, error_cutoff: datetime = None) -> Iterable[Tuple[str, int]]:
+    """Rows that would be archived for each cutoff, for dry runs."""
+    if event_cutoff is not None:
+        yield 'EVENT', EventLog.objects.filter(created_at__lt=event_cutoff).count()
+    if error_cutoff is not None:
+        yield 'ERROR', ErrorLog.objects.filter(
+            Q(sample_of__isnull=True, last_seen_at__lt=error_cutoff)
+            | Q(sample_of__last_seen_at__lt=error_cutoff)
+        ).count()
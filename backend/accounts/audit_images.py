@@ -0,0 +1,209 @@
+"""
+Delta encoding of EventLog before/after images.
+
+Events about the same record form a chain: instead of two full snapshots, an
+event stores a field-level diff against the after image of the record's
+previous event (``delta_base``). Every EVENT_IMAGE_KEYFRAME_INTERVAL-th event
+stores full images again, so rebuilding an image never replays a long chain.
+Encoding happens in batches when the buffered audit sink flushes; events
+written synchronously are keyframes, which later deltas can build on.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Max, Q
+
+from .models import EventLog
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FIELDS = ('id', 'record_type', 'record_id', 'before_image', 'after_image', 'image_delta', 'delta_base', 'delta_depth')
+
+Images = Tuple[Optional[dict], Optional[dict]]
+
+
+def diff_images(old: dict, new: dict) -> dict:
+    """Return the top-level changes turning ``old`` into ``new``."""
+    delta = {}
+    changed = {key: value for key, value in new.items() if key not in old or old[key] != value}
+    removed = [key for key in old if key not in new]
+    if changed:
+        delta['set'] = changed
+    if removed:
+        delta['unset'] = removed
+    return delta
+
+
+def apply_delta(image: dict, delta: dict) -> dict:
+    """Apply a diff produced by ``diff_images``."""
+    result = dict(image)
+    result.update(delta.get('set', {}))
+    for key in delta.get('unset', ()):
+        result.pop(key, None)
+    return result
+
+
+def _row(event) -> dict:
+    if isinstance(event, dict):
+        return event
+    return {field: getattr(event, field) for field in IMAGE_FIELDS}
+
+
+def _record_chains(record_type: str, record_id: int, rows: Dict[int, dict], needed: set):
+    """Load ``needed`` events of one record and the rest of their chains into ``rows``."""
+    needed = {event_id for event_id in needed if event_id not in rows}
+    if not needed:
+        return
+    chain = (
+        EventLog.objects.filter(record_type=record_type, record_id=record_id, id__lte=max(needed))
+        .order_by('-id')
+        .values(*IMAGE_FIELDS)
+    )
+    for row in chain.iterator(chunk_size=100):
+        rows[row['id']] = row
+        needed.discard(row['id'])
+        if row['image_delta'] is not None and row['delta_base'] not in rows:
+            needed.add(row['delta_base'])
+        if not needed:
+            break
+
+
+def reconstruct_images(events: Iterable) -> Dict[int, Images]:
+    """
+    Return ``{event_id: (before_image, after_image)}`` for EventLog instances or
+    ``values()`` rows, replaying deltas from the nearest keyframe. Needs one
+    query per record that has delta-encoded events among ``events``.
+    """
+    rows = {}
+    needed = defaultdict(set)
+    for event in events:
+        row = _row(event)
+        rows[row['id']] = row
+        if row['image_delta'] is not None:
+            needed[(row['record_type'], row['record_id'])].add(row['delta_base'])
+    for (record_type, record_id), base_ids in needed.items():
+        _record_chains(record_type, record_id, rows, base_ids)
+
+    images = {}
+
+    def resolve(event_id):
+        chain = []
+        while event_id not in images:
+            row = rows.get(event_id)
+            if row is None:
+                logger.warning(f"Event image chain is missing event {event_id}")
+                break
+            if row['image_delta'] is None:
+                images[event_id] = (row['before_image'], row['after_image'])
+                break
+            chain.append(row)
+            event_id = row['delta_base']
+        base_after = images.get(event_id, (None, None))[1]
+        for row in reversed(chain):
+            if base_after is None:
+                images[row['id']] = (None, None)
+                continue
+            before = apply_delta(base_after, row['image_delta'].get('before', {}))
+            after = apply_delta(before, row['image_delta'].get('after', {}))
+            images[row['id']] = (before, after)
+            base_after = after
+
+    result = {}
+    for event in events:
+        event_id = _row(event)['id']
+        resolve(event_id)
+        result[event_id] = images[event_id]
+    return result
+
+
+def _latest_events(keys, before_id: int) -> Dict[tuple, dict]:
+    condition = Q()
+    for record_type, record_id in keys:
+        condition |= Q(record_type=record_type, record_id=record_id)
+    latest_ids = (
+        EventLog.objects.filter(condition, id__lt=before_id)
+        .values('record_type', 'record_id')
+        .annotate(latest_id=Max('id'))
+        .values('latest_id')
+        .order_by()
+    )
+    return {
+        (row['record_type'], row['record_id']): row
+        for row in EventLog.objects.filter(id__in=latest_ids).values(*IMAGE_FIELDS)
+    }
+
+
+def encode_event_images(events: Iterable[EventLog]) -> List[EventLog]:
+    """
+    Delta-encode just-inserted EventLog instances in place and return the ones
+    changed; the caller saves their image fields.
+
+    An event with both images and a record reference becomes a diff against the
+    after image of the record's previous event (stored earlier or earlier in
+    ``events``), unless that would exceed EVENT_IMAGE_KEYFRAME_INTERVAL deltas
+    in a row. Events without a usable base keep their full images as a keyframe.
+    """
+    interval = getattr(settings, 'EVENT_IMAGE_KEYFRAME_INTERVAL', 20)
+    if interval <= 1:
+        return []
+    events = sorted(
+        (event for event in events if event.pk and event.record_type and event.record_id is not None),
+        key=lambda event: event.pk,
+    )
+    if not events:
+        return []
+
+    latest = _latest_events({(event.record_type, event.record_id) for event in events}, events[0].pk)
+    deltas = [row for row in latest.values() if row['image_delta'] is not None]
+    full_images = reconstruct_images(deltas) if deltas else {}
+    # (event id, delta depth, full after image) of each record's previous event
+    bases = {
+        key: (row['id'], row['delta_depth'], full_images.get(row['id'], (None, row['after_image']))[1])
+        for key, row in latest.items()
+    }
+
+    encoded = []
+    for event in events:
+        key = (event.record_type, event.record_id)
+        before, after = event.before_image, event.after_image
+        base = bases.get(key)
+        depth = 0
+        if (
+            base is not None and base[1] + 1 < interval and event.image_delta is None
+            and isinstance(base[2], dict) and isinstance(before, dict) and isinstance(after, dict)
+        ):
+            depth = base[1] + 1
+            encoded.append((event, {
+                'before': diff_images(base[2], before),
+                'after': diff_images(before, after),
+            }, base[0], depth))
+        bases[key] = (event.pk, depth, after)
+
+    # Assign only once every diff is computed, so a failure leaves full images
+    for event, image_delta, base_id, depth in encoded:
+        event.image_delta = image_delta
+        event.delta_base = base_id
+        event.delta_depth = depth
+        event.before_image = None
+        event.after_image = None
+    return [event for event, _, _, _ in encoded]
+
+
+def materialize_images(events: Iterable[EventLog]) -> int:
+    """
+    Turn delta-encoded events into keyframes, e.g. before their base events are
+    archived and deleted. Returns the number of events rewritten.
+    """
+    events = [event for event in events if event.image_delta is not None]
+    if not events:
+        return 0
+    images = reconstruct_images(events)
+    for event in events:
+        event.before_image, event.after_image = images[event.id]
+        event.image_delta = None
+        event.delta_base = None
+        event.delta_depth = 0
+    EventLog.objects.bulk_update(events, ['before_image', 'after_image', 'image_delta', 'delta_base', 'delta_depth'])
+    return len(events)
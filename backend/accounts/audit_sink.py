@@ -0,0 +1,310 @@
+"""
+Audit sink: the single place EventLog rows are written from request paths.
+
+With AUDIT_SINK = 'sync' (the default) ``record_event`` inserts the row
+immediately, as ``EventLog.objects.create`` did. With 'buffered', events are
+queued in-process once the surrounding transaction commits and written with
+one ``bulk_create`` every AUDIT_BUFFER_SIZE events or AUDIT_BUFFER_SECONDS.
+Queued events are also appended to a per-process spool file under
+AUDIT_SPOOL_DIR, so events left behind by a crashed or restarted worker are
+replayed by the next process (or ``python manage.py replay_audit_spool``).
+Delivery from the spool is at-least-once.
+
+Before/after images are delta-encoded only when a buffered batch is flushed
+(or replayed), with one lookup per batch; sync writes store full images so
+no audited request pays for reading the record's previous event.
+"""
+import atexit
+import glob
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .audit_images import encode_event_images
+from .models import EventLog
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+IMAGE_UPDATE_FIELDS = ['before_image', 'after_image', 'image_delta', 'delta_base', 'delta_depth']
+
+SPOOL_FIELDS = (
+    'action', 'actor_id', 'target_user_id', 'details', 'before_image', 'after_image',
+    'record_type', 'record_id', 'created_at',
+)
+
+
+def audit_mode() -> str:
+    return getattr(settings, 'AUDIT_SINK', 'sync')
+
+
+def spool_dir() -> str:
+    return getattr(settings, 'AUDIT_SPOOL_DIR', os.path.join(settings.BASE_DIR, 'audit_spool'))
+
+
+def _event_row(event: EventLog) -> dict:
+    return {field: getattr(event, field) for field in SPOOL_FIELDS}
+
+
+def _write_events(events: List[EventLog], encode_images: bool = False):
+    """
+    Insert ``events`` with one bulk_create, keeping their recorded times.
+    With ``encode_images`` their images are then delta-encoded as one batch.
+    """
+    created_at = [event.created_at for event in events]
+    with transaction.atomic():
+        EventLog.objects.bulk_create(events)
+        if not all(event.pk for event in events):
+            return
+        # auto_now_add stamps the flush time; restore when each event happened
+        for event, recorded_at in zip(events, created_at):
+            event.created_at = recorded_at
+        EventLog.objects.bulk_update(events, ['created_at'])
+        if encode_images:
+            try:
+                with transaction.atomic():
+                    encoded = encode_event_images(events)
+                    if encoded:
+                        EventLog.objects.bulk_update(encoded, IMAGE_UPDATE_FIELDS)
+            except Exception:
+                logger.warning("Failed to delta-encode event images; storing full images", exc_info=True)
+
+
+class _AuditBuffer:
+    """In-process event queue mirrored to an append-only spool file."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = []
+        self._started_at = time.monotonic()
+        self._generation = 0
+        self._spool = None
+        self._timer = None
+        os.makedirs(spool_dir(), exist_ok=True)
+        # Restarted workers can reuse a PID, so each buffer gets its own token
+        # and never appends to (or flushes away) a dead worker's spool
+        base = os.path.join(spool_dir(), f'spool-{os.getpid()}-{secrets.token_hex(4)}')
+        self._spool_path = f'{base}.jsonl'
+        # Held for the life of the process; replay treats unlocked owners as dead
+        self._lock_path = f'{base}.lock'
+        self._lock_file = open(self._lock_path, 'w')
+        if fcntl is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def add(self, event: EventLog):
+        with self._lock:
+            if self._spool is None:
+                self._spool = open(self._spool_path, 'a', encoding='utf-8')
+            self._spool.write(json.dumps(_event_row(event), cls=DjangoJSONEncoder) + '\n')
+            self._spool.flush()
+            if not self._events:
+                self._started_at = time.monotonic()
+            self._events.append(event)
+            due = (
+                len(self._events) >= getattr(settings, 'AUDIT_BUFFER_SIZE', 100)
+                or time.monotonic() - self._started_at >= getattr(settings, 'AUDIT_BUFFER_SECONDS', 2)
+            )
+            self._ensure_timer()
+        if due:
+            self.flush()
+
+    def _ensure_timer(self):
+        if self._timer is None or not self._timer.is_alive():
+            self._timer = threading.Thread(target=self._run_timer, name='audit-buffer', daemon=True)
+            self._timer.start()
+
+    def _run_timer(self):
+        interval = max(getattr(settings, 'AUDIT_BUFFER_SECONDS', 2), 0.1)
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                idle = not self._events
+            if idle:
+                return
+            try:
+                self.flush()
+            finally:
+                # This thread must not keep a database connection open
+                from django.db import connection
+                connection.close()
+
+    def flush(self):
+        with self._lock:
+            events, self._events = self._events, []
+            if not events:
+                return
+            # Hand the spooled lines for this batch to a file of their own
+            self._spool.close()
+            self._spool = None
+            self._generation += 1
+            batch_path = f'{self._spool_path}.{self._generation}.flushing'
+            os.replace(self._spool_path, batch_path)
+        try:
+            _write_events(events, encode_images=True)
+        except Exception:
+            logger.warning(
+                f"Failed to write {len(events)} audit events; kept in {batch_path} for replay", exc_info=True
+            )
+            return
+        os.remove(batch_path)
+
+    def close(self):
+        """Flush at exit and drop the lock file unless events remain for replay."""
+        self.flush()
+        if not glob.glob(f'{self._spool_path}*') and os.path.exists(self._lock_path):
+            os.remove(self._lock_path)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def _get_buffer() -> _AuditBuffer:
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = _AuditBuffer()
+            atexit.register(_buffer.close)
+            try:
+                replay_spool()
+            except Exception:
+                logger.warning("Failed to replay audit spool", exc_info=True)
+    return _buffer
+
+
+def flush_audit_events():
+    """Write any buffered events now."""
+    if _buffer is not None:
+        _buffer.flush()
+
+
+def record_event(**fields) -> Optional[EventLog]:
+    """
+    Record an EventLog row through the configured sink.
+    Returns the saved event in sync mode and None when it was queued.
+    """
+    if audit_mode() != 'buffered':
+        return EventLog.objects.create(**fields)
+    event = EventLog(**fields)
+    event.created_at = timezone.now()
+    transaction.on_commit(lambda: _get_buffer().add(event))
+    return None
+
+
+def record_events(events: Iterable[EventLog]):
+    """Record several unsaved EventLog instances with one bulk_create (or queue them)."""
+    events = list(events)
+    if not events:
+        return
+    now = timezone.now()
+    for event in events:
+        event.created_at = event.created_at or now
+    if audit_mode() != 'buffered':
+        _write_events(events)
+        return
+
+    def queue():
+        audit_buffer = _get_buffer()
+        for event in events:
+            audit_buffer.add(event)
+    transaction.on_commit(queue)
+
+
+def _owner_alive(owner: str) -> bool:
+    """
+    Whether the process that wrote ``owner``'s spool files still runs: it holds
+    an exclusive lock on its lock file, which the OS releases when it dies, so
+    a reused PID is never mistaken for the original writer.
+    """
+    lock_path = os.path.join(spool_dir(), f'spool-{owner}.lock')
+    if fcntl is None:
+        pid = int(owner.split('-', 1)[0])
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+    try:
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    return False
+
+
+def _spool_owner(path: str) -> Optional[str]:
+    """Return ``'<pid>-<token>'`` for a spool or batch file name, None if unrecognized."""
+    parts = os.path.basename(path).split('.', 1)[0].split('-')
+    if len(parts) != 3 or not parts[1].isdigit():
+        return None
+    return f'{parts[1]}-{parts[2]}'
+
+
+def replay_spool(include_live: bool = False) -> int:
+    """
+    Insert events from spool files left by processes that are no longer running
+    (all spool files but this process's own with ``include_live``).
+    Each file is claimed by renaming it, so concurrent replays never share one.
+    Returns the number of events replayed.
+    """
+    replayed = 0
+    own_owner = _spool_owner(_buffer._spool_path) if _buffer is not None else None
+    dead_owners = set()
+    for path in sorted(glob.glob(os.path.join(spool_dir(), 'spool-*'))):
+        if path.endswith(('.replaying', '.lock')):
+            continue
+        owner = _spool_owner(path)
+        if owner is None or owner == own_owner:
+            continue
+        if not include_live and owner not in dead_owners:
+            if _owner_alive(owner):
+                continue
+            dead_owners.add(owner)
+        claimed = f'{path}.{os.getpid()}.replaying'
+        try:
+            os.replace(path, claimed)
+        except FileNotFoundError:
+            continue
+
+        events = []
+        with open(claimed, encoding='utf-8') as spool_file:
+            for line in spool_file:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    # A crash can leave a partially written last line
+                    continue
+                row['created_at'] = parse_datetime(row['created_at']) if row.get('created_at') else timezone.now()
+                events.append(EventLog(**row))
+        try:
+            if events:
+                _write_events(events, encode_images=True)
+        except Exception:
+            # Put the file back for the next replay
+            os.replace(claimed, path)
+            raise
+        os.remove(claimed)
+        replayed += len(events)
+
+    for owner in dead_owners:
+        try:
+            os.remove(os.path.join(spool_dir(), f'spool-{owner}.lock'))
+        except FileNotFoundError:
+            pass
+    return replayed
@@ -0,0 +1,70 @@
+"""
+Caching helpers for financial statements keyed by the ledger version.
+"""
+import hashlib
+import logging
+from functools import wraps
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from rest_framework.response import Response
+
+from .models import LedgerVersion
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_CACHE_ALIAS = 'statements'
+LEDGER_VERSION_PK = 1
+
+
+def get_ledger_version() -> int:
+    """Return the current ledger version (0 before the first bump)."""
+    version = LedgerVersion.objects.filter(pk=LEDGER_VERSION_PK).values_list('version', flat=True).first()
+    return version or 0
+
+
+def _bump():
+    updated = LedgerVersion.objects.filter(pk=LEDGER_VERSION_PK).update(version=F('version') + 1)
+    if not updated:
+        LedgerVersion.objects.get_or_create(pk=LEDGER_VERSION_PK, defaults={'version': 1})
+
+
+def bump_ledger_version():
+    """
+    Invalidate cached statements once the current transaction commits.
+    Bumping after commit keeps the counter row out of posting transactions,
+    so concurrent approvals do not queue on it.
+    """
+    transaction.on_commit(_bump)
+
+
+def _statement_cache_key(name: str, request, version: int) -> str:
+    params = sorted((key, tuple(sorted(request.query_params.getlist(key)))) for key in request.query_params)
+    digest = hashlib.md5(repr(params).encode()).hexdigest()
+    return f'statement:{name}:v{version}:{digest}'
+
+
+def cached_statement(name: str):
+    """
+    Cache successful responses of a statement view keyed by (statement,
+    query parameters, ledger version). Place below ``@permission_classes``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            cache = caches[STATEMENT_CACHE_ALIAS]
+            key = _statement_cache_key(name, request, get_ledger_version())
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                try:
+                    cache.set(key, response.data)
+                except Exception:
+                    logger.warning(f"Failed to cache {name} statement", exc_info=True)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,156 @@
+"""
+Transactional email outbox.
+
+``enqueue_email`` takes the same arguments as ``send_mail`` but only inserts an
+EmailOutbox row, so the message commits or rolls back with the surrounding
+transaction and requests never wait on the mail server. ``drain_outbox`` (the
+run_outbox command) claims due messages and sends them from a thread pool,
+each worker reusing one mail connection for its share of the batch.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def outbox_enabled() -> bool:
+    return getattr(settings, 'EMAIL_OUTBOX_ENABLED', True)
+
+
+def enqueue_email(subject, message, from_email, recipient_list, fail_silently=False) -> int:
+    """
+    Queue one email for the run_outbox command. Returns 1 if a message was
+    queued (0 without recipients), like ``send_mail``'s sent count.
+    """
+    recipients = [address for address in recipient_list if address]
+    if not recipients:
+        return 0
+    if not outbox_enabled():
+        return send_mail(subject, message, from_email, recipients, fail_silently=fail_silently)
+    try:
+        EmailOutbox.objects.create(
+            subject=subject[:255], body=message, from_email=from_email or '', recipients=recipients,
+        )
+    except Exception:
+        if not fail_silently:
+            raise
+        logger.warning(f"Failed to queue email '{subject}'", exc_info=True)
+        return 0
+    return 1
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the ``attempts``-th failed send."""
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_SECONDS', 60)
+    ceiling = getattr(settings, 'EMAIL_OUTBOX_MAX_RETRY_SECONDS', 3600)
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), ceiling))
+
+
+def claim_batch(limit: int) -> List[EmailOutbox]:
+    """
+    Mark up to ``limit`` due messages as SENDING and return them. Messages left
+    in SENDING longer than EMAIL_OUTBOX_LEASE_SECONDS (a sender died) are due again.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_LEASE_SECONDS', 600))
+    due = Q(status='PENDING', next_attempt_at__lte=now) | Q(status='SENDING', locked_at__lt=stale)
+    with transaction.atomic():
+        candidates = EmailOutbox.objects.filter(due).order_by('id')
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.values_list('id', flat=True)[:limit])
+        # Re-checking the condition keeps two senders from claiming the same row
+        EmailOutbox.objects.filter(due, id__in=ids).update(status='SENDING', locked_at=now)
+    return list(EmailOutbox.objects.filter(id__in=ids, status='SENDING', locked_at=now).order_by('id'))
+
+
+def _send_share(messages: List[EmailOutbox]) -> List[Tuple[EmailOutbox, Optional[str]]]:
+    """Send ``messages`` over one mail connection. Returns ``(message, error)`` pairs."""
+    results = []
+    mail_connection = get_connection()
+    try:
+        mail_connection.open()
+        for message in messages:
+            try:
+                EmailMessage(
+                    message.subject, message.body, message.from_email or settings.DEFAULT_FROM_EMAIL,
+                    message.recipients, connection=mail_connection,
+                ).send()
+                results.append((message, None))
+            except Exception as e:
+                results.append((message, f"{type(e).__name__}: {e}"))
+                # The connection may be unusable after a failure
+                mail_connection.close()
+                mail_connection.open()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        done = {message.id for message, _ in results}
+        results.extend((message, error) for message in messages if message.id not in done)
+    finally:
+        try:
+            mail_connection.close()
+        except Exception:
+            pass
+    return results
+
+
+def _record_results(results: List[Tuple[EmailOutbox, Optional[str]]]) -> Tuple[int, int, int]:
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    now = timezone.now()
+    sent = retried = dead = 0
+    for message, error in results:
+        message.attempts += 1
+        message.locked_at = None
+        if error is None:
+            message.status = 'SENT'
+            message.sent_at = now
+            message.body = ''
+            message.last_error = ''
+            sent += 1
+        elif message.attempts >= max_attempts:
+            message.status = 'DEAD'
+            # Bodies can hold temporary passwords; keep only the subject and recipients
+            message.body = ''
+            message.last_error = error
+            dead += 1
+            logger.error(f"Email outbox message {message.id} dead-lettered after {message.attempts} attempts: {error}")
+        else:
+            message.status = 'PENDING'
+            message.next_attempt_at = now + retry_delay(message.attempts)
+            message.last_error = error
+            retried += 1
+    EmailOutbox.objects.bulk_update(
+        [message for message, _ in results],
+        ['status', 'attempts', 'locked_at', 'sent_at', 'body', 'last_error', 'next_attempt_at'],
+    )
+    return sent, retried, dead
+
+
+def drain_outbox(workers: int = None, batch_size: int = None) -> Tuple[int, int, int]:
+    """
+    Send every due message. Mail goes out from ``workers`` threads; database
+    writes stay on the calling thread. Returns ``(sent, retried, dead)``.
+    """
+    workers = max(1, workers or getattr(settings, 'EMAIL_OUTBOX_WORKERS', 4))
+    batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 100)
+    totals = [0, 0, 0]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            messages = claim_batch(batch_size)
+            if not messages:
+                break
+            shares = [messages[i::workers] for i in range(workers) if messages[i::workers]]
+            results = [pair for share in pool.map(_send_share, shares) for pair in share]
+            for i, count in enumerate(_record_results(results)):
+                totals[i] += count
+    return tuple(totals)
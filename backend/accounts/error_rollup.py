@@ -0,0 +1,103 @@
+"""
+Hourly ErrorLog rollups used by the error statistics and time-series endpoints.
+
+Rows are bucketed by the hour they were created in. ``record_error`` adds new
+rows and repeat occurrences, ``shift_resolution`` moves rows between the
+resolved and unresolved buckets, ``remove_from_rollups`` drops rows about to
+be deleted, and ``rebuild_error_rollups`` recomputes everything from ErrorLog
+when the table needs repairing.
+"""
+from datetime import datetime
+from typing import Iterable, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, QuerySet, Sum
+from django.db.models.functions import TruncHour
+
+from .models import ErrorLog, ErrorLogRollup
+
+# (hour, error_code, level, resolved)
+BucketKey = Tuple[datetime, str, str, bool]
+
+
+def bucket_hour(moment: datetime) -> datetime:
+    """Truncate a timestamp to the start of its hour."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def add_to_bucket(key: BucketKey, count: int = 0, occurrences: int = 0):
+    """Add ``count`` rows and ``occurrences`` to one rollup bucket, creating it if needed."""
+    if not count and not occurrences:
+        return
+    hour, error_code, level, resolved = key
+    bucket = ErrorLogRollup.objects.filter(hour=hour, error_code=error_code, level=level, resolved=resolved)
+    changes = {'count': F('count') + count, 'occurrences': F('occurrences') + occurrences}
+    if bucket.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            ErrorLogRollup.objects.create(
+                hour=hour, error_code=error_code, level=level, resolved=resolved,
+                count=max(count, 0), occurrences=max(occurrences, 0),
+            )
+    except IntegrityError:
+        # Another worker created the bucket first
+        bucket.update(**changes)
+
+
+def record_error(error_log: ErrorLog):
+    """Count a newly created (non-sample) ErrorLog row."""
+    add_to_bucket(
+        (bucket_hour(error_log.created_at), error_log.error_code, error_log.level, error_log.resolved),
+        count=1, occurrences=error_log.occurrence_count,
+    )
+
+
+def _grouped_rows(queryset: QuerySet) -> Iterable[dict]:
+    return (
+        queryset.filter(sample_of__isnull=True)
+        .annotate(hour=TruncHour('created_at'))
+        .values('hour', 'error_code', 'level', 'resolved')
+        .annotate(rows=Count('id'), total=Sum('occurrence_count'))
+        .order_by()
+    )
+
+
+def shift_resolution(queryset: QuerySet, resolved: bool):
+    """
+    Move the rows of ``queryset`` that are not yet in the ``resolved`` state
+    to the matching buckets. Call before updating the rows themselves.
+    """
+    for row in _grouped_rows(queryset.filter(resolved=not resolved)):
+        add_to_bucket(
+            (row['hour'], row['error_code'], row['level'], not resolved),
+            count=-row['rows'], occurrences=-row['total'],
+        )
+        add_to_bucket(
+            (row['hour'], row['error_code'], row['level'], resolved),
+            count=row['rows'], occurrences=row['total'],
+        )
+
+
+def remove_from_rollups(queryset: QuerySet):
+    """Subtract the rows of ``queryset`` from their buckets. Call before deleting them."""
+    for row in _grouped_rows(queryset):
+        add_to_bucket(
+            (row['hour'], row['error_code'], row['level'], row['resolved']),
+            count=-row['rows'], occurrences=-row['total'],
+        )
+
+
+def rebuild_error_rollups() -> int:
+    """Recompute every rollup bucket from ErrorLog. Returns the number of buckets."""
+    buckets = [
+        ErrorLogRollup(
+            hour=row['hour'], error_code=row['error_code'], level=row['level'],
+            resolved=row['resolved'], count=row['rows'], occurrences=row['total'],
+        )
+        for row in _grouped_rows(ErrorLog.objects.all())
+    ]
+    with transaction.atomic():
+        ErrorLogRollup.objects.all().delete()
+        ErrorLogRollup.objects.bulk_create(buckets, batch_size=1000)
+    return len(buckets)
@@ -1,22 +1,100 @@
 """
 Utility functions for error logging and database-stored error messages.
 """
+import atexit
+import hashlib
+import random
+import threading
+import time
 import traceback
 import logging
+from datetime import timedelta
 from typing import Optional, Dict, Any
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, QuerySet
 from django.http import HttpRequest
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from .models import ErrorMessage, ErrorLog
+from .error_rollup import add_to_bucket, bucket_hour, record_error, remove_from_rollups, shift_resolution
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+# Process-local copy of all active error messages. Every worker compares a
+# version derived from the ErrorMessage table (latest updated_at and row count)
+# every few seconds, so edits made through any worker are picked up without a
+# shared cache. ERROR_MESSAGE_CACHE_TTL forces a reload for changes made with
+# queryset.update(), which does not touch updated_at.
+ERROR_MESSAGE_VERSION_CHECK_SECONDS = 5
+_message_cache = {'messages': None, 'version': None, 'loaded_at': 0.0, 'checked_at': 0.0}
+_message_cache_lock = threading.Lock()
+
+
+def _message_dict(error_msg: ErrorMessage) -> Dict[str, str]:
+    return {
+        'message': error_msg.message,
+        'title': error_msg.title,
+        'error_type': error_msg.error_type,
+        'technical_details': error_msg.technical_details
+    }
+
+
+def _error_messages_version() -> tuple:
+    stamp = ErrorMessage.objects.aggregate(changed=Max('updated_at'), rows=Count('id'))
+    return stamp['changed'], stamp['rows']
+
+
+def preload_error_messages() -> Dict[str, Dict[str, str]]:
+    """Load every active error message into the process-local cache."""
+    version = _error_messages_version()
+    messages = {
+        error_msg.code: _message_dict(error_msg)
+        for error_msg in ErrorMessage.objects.filter(is_active=True)
+    }
+    now = time.monotonic()
+    with _message_cache_lock:
+        _message_cache.update(
+            messages=messages,
+            version=version,
+            loaded_at=now,
+            checked_at=now,
+        )
+    return messages
+
+
+def invalidate_error_messages():
+    """Drop this process's cache; other workers notice the new table version."""
+    with _message_cache_lock:
+        _message_cache['messages'] = None
+
+
+def _cached_error_messages() -> Dict[str, Dict[str, str]]:
+    messages = _message_cache['messages']
+    now = time.monotonic()
+    if messages is None:
+        return preload_error_messages()
+    
+    ttl = getattr(settings, 'ERROR_MESSAGE_CACHE_TTL', 300)
+    if now - _message_cache['loaded_at'] > ttl:
+        return preload_error_messages()
+    
+    if now - _message_cache['checked_at'] > ERROR_MESSAGE_VERSION_CHECK_SECONDS:
+        _message_cache['checked_at'] = now
+        if _error_messages_version() != _message_cache['version']:
+            return preload_error_messages()
+    return messages
+
+
 def get_error_message(error_code: str, fallback_message: str = None) -> Dict[str, str]:
     """
     Get error message from database by error code.
     
+    Messages are served from a process-local cache that is invalidated when
+    an ErrorMessage is saved or deleted.
+    
     Args:
         error_code: The error code to look up
         fallback_message: Message to use if error code not found
@@ -24,22 +102,182 @@ def get_error_message(error_code: str, fallback_message: str = None) -> Dict[str
     Returns:
         Dict with 'message' and 'title' keys
     """
-    try:
-        error_msg = ErrorMessage.objects.get(code=error_code, is_active=True)
-        return {
-            'message': error_msg.message,
-            'title': error_msg.title,
-            'error_type': error_msg.error_type,
-            'technical_details': error_msg.technical_details
-        }
-    except ErrorMessage.DoesNotExist:
-        logger.warning(f"Error code '{error_code}' not found in database")
-        return {
-            'message': fallback_message or f"An error occurred (Code: {error_code})",
-            'title': 'System Error',
-            'error_type': 'SYSTEM',
-            'technical_details': f'Error code {error_code} not found in database'
-        }
+    error_data = _cached_error_messages().get(error_code)
+    if error_data is not None:
+        return dict(error_data)
+    
+    logger.warning(f"Error code '{error_code}' not found in database")
+    return {
+        'message': fallback_message or f"An error occurred (Code: {error_code})",
+        'title': 'System Error',
+        'error_type': 'SYSTEM',
+        'technical_details': f'Error code {error_code} not found in database'
+    }
+
+
+def error_fingerprint(error_code: str, request_path: str = "", user_id: Optional[int] = None,
+                      exception_type: str = "") -> str:
+    """Hash the parts that identify a repeat of the same error."""
+    raw = f"{error_code}|{request_path}|{user_id or ''}|{exception_type}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class _OccurrenceBuffer:
+    """
+    In-memory counter for repeats of already-logged errors.
+
+    Maps fingerprint to its grouped ErrorLog row so repeats need no query at all,
+    and folds the counts into the rows every ERROR_LOG_BUFFER_SIZE occurrences,
+    every ERROR_LOG_BUFFER_SECONDS, and at interpreter exit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}     # fingerprint -> (row_id, rollup bucket, last_seen_at)
+        self._pending = {}  # row_id -> [rollup bucket, count, last_seen_at]
+        self._size = 0
+        self._started_at = time.monotonic()
+
+    def grouped_row(self, fingerprint: str, since):
+        """Return ``(row_id, bucket)`` of the open group for ``fingerprint``, if cached."""
+        with self._lock:
+            row = self._rows.get(fingerprint)
+        if row and row[2] >= since:
+            return row[0], row[1]
+        return None
+
+    def remember(self, fingerprint: str, row_id: int, bucket, seen_at):
+        with self._lock:
+            self._rows[fingerprint] = (row_id, bucket, seen_at)
+
+    def add(self, fingerprint: str, row_id: int, bucket, seen_at):
+        with self._lock:
+            self._rows[fingerprint] = (row_id, bucket, seen_at)
+            pending = self._pending.setdefault(row_id, [bucket, 0, seen_at])
+            pending[1] += 1
+            pending[2] = seen_at
+            self._size += 1
+            due = (
+                self._size >= getattr(settings, 'ERROR_LOG_BUFFER_SIZE', 100)
+                or time.monotonic() - self._started_at >= getattr(settings, 'ERROR_LOG_BUFFER_SECONDS', 10)
+            )
+        if due:
+            self.flush()
+
+    def forget(self, row_ids=None):
+        """Drop cached groups (all of them when ``row_ids`` is None), e.g. after they were resolved."""
+        with self._lock:
+            if row_ids is None:
+                self._rows = {}
+                return
+            row_ids = set(row_ids)
+            self._rows = {key: row for key, row in self._rows.items() if row[0] not in row_ids}
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._size = 0
+            self._started_at = time.monotonic()
+        for row_id, (bucket, count, seen_at) in pending.items():
+            try:
+                ErrorLog.objects.filter(pk=row_id).update(
+                    occurrence_count=F('occurrence_count') + count, last_seen_at=seen_at
+                )
+                add_to_bucket(bucket, occurrences=count)
+            except Exception as e:
+                logger.warning(f"Failed to flush {count} occurrence(s) of error log {row_id}: {e}")
+
+
+_occurrence_buffer = _OccurrenceBuffer()
+atexit.register(_occurrence_buffer.flush)
+
+
+def flush_error_occurrences():
+    """Write buffered repeat counts to the database."""
+    _occurrence_buffer.flush()
+
+
+def forget_error_groups(row_ids=None):
+    """Stop counting repeats against ``row_ids`` (or any cached group) in this process."""
+    _occurrence_buffer.forget(row_ids)
+
+
+def resolve_error_logs(queryset: QuerySet, resolved_by_user: Optional[User] = None) -> int:
+    """Mark every error log in ``queryset`` resolved with a single UPDATE. Returns the row count."""
+    _occurrence_buffer.flush()
+    with transaction.atomic():
+        shift_resolution(queryset, resolved=True)
+        count = queryset.update(resolved=True, resolved_at=timezone.now(), resolved_by=resolved_by_user)
+    _occurrence_buffer.forget()
+    return count
+
+
+def unresolve_error_logs(queryset: QuerySet) -> int:
+    """Reopen every error log in ``queryset`` with a single UPDATE. Returns the row count."""
+    _occurrence_buffer.flush()
+    with transaction.atomic():
+        shift_resolution(queryset, resolved=False)
+        count = queryset.update(resolved=False, resolved_at=None, resolved_by=None)
+    return count
+
+
+ERROR_LOG_DELETE_CHUNK = 1000
+
+
+def delete_error_logs(queryset: QuerySet) -> int:
+    """
+    Delete every error log in ``queryset`` and the occurrence samples of those
+    rows, ERROR_LOG_DELETE_CHUNK rows at a time so the delete collector never
+    loads the whole selection. Returns the number of rows deleted (samples not
+    included).
+    """
+    _occurrence_buffer.flush()
+    count = 0
+    with transaction.atomic():
+        remove_from_rollups(queryset)
+        ids = list(queryset.values_list('pk', flat=True))
+        for start in range(0, len(ids), ERROR_LOG_DELETE_CHUNK):
+            chunk = ids[start:start + ERROR_LOG_DELETE_CHUNK]
+            ErrorLog.objects.filter(sample_of_id__in=chunk).exclude(id__in=chunk).delete()
+            count += ErrorLog.objects.filter(id__in=chunk).delete()[1].get(ErrorLog._meta.label, 0)
+    _occurrence_buffer.forget()
+    return count
+
+
+def _record_repeat(fingerprint: str, now) -> Optional[int]:
+    """
+    Count ``now`` against the open grouped row for ``fingerprint``, if any.
+    Returns the grouped row ID, or None when a new row must be created.
+    """
+    window = getattr(settings, 'ERROR_LOG_DEDUP_WINDOW_SECONDS', 300)
+    if window <= 0:
+        return None
+    since = now - timedelta(seconds=window)
+    buffered = getattr(settings, 'ERROR_LOG_BUFFERED', False)
+
+    group = _occurrence_buffer.grouped_row(fingerprint, since) if buffered else None
+    if group is None:
+        row = (
+            ErrorLog.objects.filter(
+                fingerprint=fingerprint, resolved=False, sample_of__isnull=True, last_seen_at__gte=since
+            )
+            .order_by('-last_seen_at')
+            .values_list('id', 'created_at', 'error_code', 'level')
+            .first()
+        )
+        if row is None:
+            return None
+        group = (row[0], (bucket_hour(row[1]), row[2], row[3], False))
+    row_id, bucket = group
+
+    if buffered:
+        _occurrence_buffer.add(fingerprint, row_id, bucket, now)
+    else:
+        ErrorLog.objects.filter(pk=row_id).update(
+            occurrence_count=F('occurrence_count') + 1, last_seen_at=now
+        )
+        add_to_bucket(bucket, occurrences=1)
+    return row_id
 
 
 def log_error(
@@ -50,7 +288,7 @@ def log_error(
     exception: Optional[Exception] = None,
     additional_details: Optional[str] = None,
     **kwargs
-) -> ErrorLog:
+) -> Optional[ErrorLog]:
     """
     Log an error to the database.
     
@@ -63,8 +301,13 @@ def log_error(
         additional_details: Additional details to include
         **kwargs: Additional fields for ErrorLog
         
+    Repeats of an unresolved error with the same fingerprint within
+    ERROR_LOG_DEDUP_WINDOW_SECONDS increment its occurrence_count instead of
+    creating a row; ERROR_LOG_SAMPLE_RATE of them are also stored in full
+    with ``sample_of`` pointing at the grouped row.
+        
     Returns:
-        Created ErrorLog instance
+        Created ErrorLog instance, or None if the occurrence was only counted
     """
     # Get error message from database
     error_data = get_error_message(error_code)
@@ -95,6 +338,21 @@ def log_error(
     if exception:
         stack_trace = traceback.format_exc()
     
+    # Repeats of the same error inside the dedup window update one row
+    now = timezone.now()
+    user_id = user.pk if user is not None else None
+    fingerprint = error_fingerprint(
+        error_code, request_path, user_id, type(exception).__name__ if exception else ""
+    )
+    grouped_id = _record_repeat(fingerprint, now)
+    
+    log_level = getattr(logging, level, logging.ERROR)
+    if grouped_id is not None:
+        logger.log(log_level, f"Error repeated: {error_code} - {error_data['message']}")
+        # Keep a configurable share of repeats in full for their request details
+        if random.random() >= getattr(settings, 'ERROR_LOG_SAMPLE_RATE', 0.0):
+            return None
+    
     # Create error log entry
     error_log = ErrorLog.objects.create(
         error_code=error_code,
@@ -107,12 +365,22 @@ def log_error(
         error_message=error_data['message'],
         technical_details=technical_details,
         stack_trace=stack_trace,
+        fingerprint=fingerprint,
+        first_seen_at=now,
+        last_seen_at=now,
+        sample_of_id=grouped_id,
         **kwargs
     )
     
-    # Also log to Django's logging system
-    log_level = getattr(logging, level, logging.ERROR)
-    logger.log(log_level, f"Error logged: {error_code} - {error_data['message']}")
+    if grouped_id is None:
+        record_error(error_log)
+        if getattr(settings, 'ERROR_LOG_BUFFERED', False):
+            _occurrence_buffer.remember(
+                fingerprint, error_log.id,
+                (bucket_hour(error_log.created_at), error_code, level, False), now,
+            )
+        # Also log to Django's logging system
+        logger.log(log_level, f"Error logged: {error_code} - {error_data['message']}")
     
     return error_log
 
@@ -271,6 +539,10 @@ def create_default_error_messages():
          'Either as_of_date or both start_date and end_date are required.',
          'Financial statement API call missing required date parameters.'),
         
+        ('FINANCIAL_INVALID_DATE', 'VALIDATION', 'Invalid Date',
+         'Report dates must be valid dates in YYYY-MM-DD format.',
+         'Financial statement API call with a malformed or impossible date parameter.'),
+        
         ('FINANCIAL_MISSING_START_END_DATES', 'VALIDATION', 'Start and End Dates Required',
          'Both start_date and end_date are required.',
          'Financial statement API call missing start_date or end_date parameters.'),
@@ -352,6 +624,38 @@ def create_default_error_messages():
          'File type not allowed. Allowed types: pdf, doc, docx, xls, xlsx, csv, jpg, jpeg, png.',
          'User attempted to upload a file with an unsupported file extension.'),
         
+        ('JOURNAL_ENTRY_NOT_FOUND', 'USER_ACTION', 'Journal Entry Not Found',
+         'Journal entry not found.',
+         'Journal entry lookup failed for the provided ID.'),
+        
+        ('JOURNAL_BULK_NO_IDS', 'VALIDATION', 'No Entries Selected',
+         'Select at least one journal entry.',
+         'Bulk journal entry action called without a list of entry IDs.'),
+        
+        ('INVALID_CURSOR', 'VALIDATION', 'Invalid Page Cursor',
+         'The requested page could not be found. Please reload the list.',
+         'A list endpoint received a cursor query parameter it could not decode.'),
+        
+        ('EXPORT_INVALID_FORMAT', 'VALIDATION', 'Invalid Export Format',
+         'Export format must be csv or ndjson.',
+         'Export endpoint called with an unsupported fmt query parameter.'),
+        
+        ('ERROR_LOG_BULK_NO_TARGET', 'VALIDATION', 'No Error Logs Selected',
+         'Select error logs or provide filters for this bulk action.',
+         'Bulk error log action called without error_ids, a narrowing filter or "all": true.'),
+        
+        ('ERROR_LOG_BULK_UNKNOWN_FILTER', 'VALIDATION', 'Unknown Filter',
+         'One or more filters in this bulk action are not recognized.',
+         'Bulk error log action called with filter keys that _filter_logs does not support.'),
+        
+        ('DASHBOARD_SUMMARY_ERROR', 'SYSTEM', 'Dashboard Unavailable',
+         'Failed to load dashboard data. Please try again.',
+         'Unexpected error while computing the dashboard summary.'),
+        
+        ('EVENT_ARCHIVE_INVALID_RANGE', 'VALIDATION', 'Invalid Archive Date Range',
+         'Provide a start and end date no more than one year apart.',
+         'Event log archive read called without a valid start_date/end_date range of at most 366 days.'),
+        
         ('EMAIL_REQUIRED_FIELDS', 'VALIDATION', 'Email Fields Required',
          'Recipient, subject, and message are required.',
          'User attempted to send an email without providing all required fields.'),
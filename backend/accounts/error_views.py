@@ -3,15 +3,19 @@ Views for error message management and error log viewing.
 """
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDay
 
-from .models import ErrorMessage, ErrorLog
-from .serializers import ErrorMessageSerializer, ErrorLogSerializer
+from .models import ErrorMessage, ErrorLog, ErrorLogRollup
+from .serializers import ErrorMessageSerializer, ErrorLogSerializer, defer_omitted, select_requested
 from .permissions import IsAdmin
+from .error_utils import DatabaseErrorResponse, delete_error_logs, resolve_error_logs, unresolve_error_logs
+from .error_rollup import bucket_hour
 
 User = get_user_model()
 
@@ -74,41 +78,60 @@ class ErrorLogViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ErrorLogSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
     
-    def get_queryset(self):
-        """Filter error logs based on query parameters."""
-        queryset = ErrorLog.objects.all()
+    def _filter_logs(self, queryset, params):
+        """
+        Apply the error log filters in ``params`` (query parameters, or the
+        ``filters`` object of a bulk action so admins can preview it as a list).
+        """
+        # Full occurrence samples are hidden unless asked for
+        if str(params.get('include_samples', '')).lower() != 'true':
+            queryset = queryset.filter(sample_of__isnull=True)
+        
+        # Filter by fingerprint (also lists the samples of one grouped error)
+        fingerprint = params.get('fingerprint')
+        if fingerprint:
+            queryset = queryset.filter(fingerprint=fingerprint)
         
         # Filter by level
-        level = self.request.query_params.get('level')
+        level = params.get('level')
         if level:
             queryset = queryset.filter(level=level)
         
         # Filter by resolved status
-        resolved = self.request.query_params.get('resolved')
+        resolved = params.get('resolved')
         if resolved is not None:
-            queryset = queryset.filter(resolved=resolved.lower() == 'true')
+            queryset = queryset.filter(resolved=str(resolved).lower() == 'true')
         
         # Filter by error code
-        error_code = self.request.query_params.get('error_code')
+        error_code = params.get('error_code')
         if error_code:
             queryset = queryset.filter(error_code__icontains=error_code)
         
         # Filter by user
-        user_id = self.request.query_params.get('user_id')
+        user_id = params.get('user_id')
         if user_id:
             queryset = queryset.filter(user_id=user_id)
         
         # Filter by date range
-        date_from = self.request.query_params.get('date_from')
+        date_from = params.get('date_from')
         if date_from:
             queryset = queryset.filter(created_at__gte=date_from)
         
-        date_to = self.request.query_params.get('date_to')
+        date_to = params.get('date_to')
         if date_to:
             queryset = queryset.filter(created_at__lte=date_to)
         
+        # Errors not seen for a number of days
+        older_than_days = params.get('older_than_days')
+        if older_than_days not in (None, ''):
+            try:
+                cutoff = timezone.now() - timezone.timedelta(days=float(older_than_days))
+            except (TypeError, ValueError):
+                raise ValidationError({'older_than_days': 'Must be a number of days.'})
+            queryset = queryset.filter(last_seen_at__lt=cutoff)
+        
         # Search in error message or technical details
-        search = self.request.query_params.get('search')
+        search = params.get('search')
         if search:
             queryset = queryset.filter(
                 Q(error_message__icontains=search) |
@@ -116,13 +139,25 @@ class ErrorLogViewSet(viewsets.ReadOnlyModelViewSet):
                 Q(error_code__icontains=search)
             )
         
-        return queryset.order_by('-created_at')
+        return queryset
+    
+    def get_queryset(self):
+        """Filter error logs based on query parameters."""
+        queryset = self._filter_logs(ErrorLog.objects.all(), self.request.query_params)
+        
+        queryset = select_requested(queryset, self.request, {
+            'user': ['user_username'],
+            'resolved_by': ['resolved_by_username'],
+        })
+        queryset = defer_omitted(queryset, self.request, 'stack_trace', 'technical_details')
+        return queryset.order_by('-last_seen_at', '-created_at')
     
     @action(detail=True, methods=['post'])
     def resolve(self, request, pk=None):
         """Mark an error log as resolved."""
         error_log = self.get_object()
-        error_log.resolve(resolved_by_user=request.user)
+        resolve_error_logs(ErrorLog.objects.filter(pk=error_log.pk), resolved_by_user=request.user)
+        error_log.refresh_from_db(fields=['resolved', 'resolved_at', 'resolved_by'])
         
         return Response({
             'id': error_log.id,
@@ -139,14 +174,7 @@ class ErrorLogViewSet(viewsets.ReadOnlyModelViewSet):
         if not error_ids:
             return Response({'error': 'No error IDs provided'}, status=status.HTTP_400_BAD_REQUEST)
         
-        resolved_count = 0
-        for error_id in error_ids:
-            try:
-                error_log = ErrorLog.objects.get(id=error_id)
-                error_log.resolve(resolved_by_user=request.user)
-                resolved_count += 1
-            except ErrorLog.DoesNotExist:
-                continue
+        resolved_count = resolve_error_logs(ErrorLog.objects.filter(id__in=error_ids), resolved_by_user=request.user)
         
         return Response({
             'resolved_count': resolved_count,
@@ -154,40 +182,166 @@ class ErrorLogViewSet(viewsets.ReadOnlyModelViewSet):
             'message': f'Resolved {resolved_count} out of {len(error_ids)} errors'
         })
     
+    # Keys accepted in the ``filters`` object of bulk actions (see _filter_logs)
+    BULK_FILTERS = {
+        'include_samples', 'fingerprint', 'level', 'resolved', 'error_code', 'user_id',
+        'date_from', 'date_to', 'older_than_days', 'search',
+    }
+    # Filters that do not narrow the selection on their own
+    NON_NARROWING_FILTERS = {'include_samples'}
+    
+    def _bulk_target(self, request):
+        """
+        Error logs selected by a bulk action body: ``error_ids``, ``filters``
+        (same keys as the list query parameters, plus ``older_than_days``), or
+        both. Acting on every error log requires ``"all": true``.
+        Returns ``(queryset, error_response)``.
+        """
+        error_ids = request.data.get('error_ids') or []
+        filters = request.data.get('filters') or {}
+        if not isinstance(error_ids, list) or not isinstance(filters, dict):
+            raise ValidationError({'detail': 'error_ids must be a list and filters an object.'})
+        
+        unknown = sorted(set(filters) - self.BULK_FILTERS)
+        if unknown:
+            return None, DatabaseErrorResponse.create_response(
+                'ERROR_LOG_BULK_UNKNOWN_FILTER', status_code=400, unknown_filters=unknown
+            )
+        narrowing = any(
+            value not in (None, '') for key, value in filters.items() if key not in self.NON_NARROWING_FILTERS
+        )
+        if not error_ids and not narrowing and request.data.get('all') is not True:
+            return None, DatabaseErrorResponse.create_response('ERROR_LOG_BULK_NO_TARGET', status_code=400)
+        
+        queryset = ErrorLog.objects.all()
+        if error_ids:
+            queryset = queryset.filter(id__in=error_ids)
+        return self._filter_logs(queryset, filters), None
+    
+    def _bulk_action(self, request, verb, operation):
+        queryset, error_response = self._bulk_target(request)
+        if error_response is not None:
+            return error_response
+        count = operation(queryset)
+        return Response({
+            'action': verb,
+            'count': count,
+            'message': f'{verb.capitalize()}d {count} error log(s)'
+        })
+    
+    @action(detail=False, methods=['post'])
+    def bulk_resolve(self, request):
+        """Resolve every error log matching ``error_ids`` and/or ``filters`` with one UPDATE."""
+        return self._bulk_action(
+            request, 'resolve', lambda queryset: resolve_error_logs(queryset, resolved_by_user=request.user)
+        )
+    
+    @action(detail=False, methods=['post'])
+    def bulk_unresolve(self, request):
+        """Reopen every error log matching ``error_ids`` and/or ``filters`` with one UPDATE."""
+        return self._bulk_action(request, 'unresolve', unresolve_error_logs)
+    
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        """Delete every error log matching ``error_ids`` and/or ``filters``, with their samples."""
+        return self._bulk_action(request, 'delete', delete_error_logs)
+    
+    # Query parameters the hourly rollups can answer; any other filter falls back to ErrorLog
+    ROLLUP_FILTERS = {'level', 'resolved', 'error_code'}
+    
+    def _rollup_filters_only(self):
+        params = set(self.request.query_params) - {'fields', 'omit', 'format', 'hours', 'bucket', 'group_by'}
+        return params <= self.ROLLUP_FILTERS
+    
+    def _rollup_queryset(self):
+        queryset = ErrorLogRollup.objects.all()
+        level = self.request.query_params.get('level')
+        if level:
+            queryset = queryset.filter(level=level)
+        resolved = self.request.query_params.get('resolved')
+        if resolved is not None:
+            queryset = queryset.filter(resolved=resolved.lower() == 'true')
+        error_code = self.request.query_params.get('error_code')
+        if error_code:
+            queryset = queryset.filter(error_code__icontains=error_code)
+        return queryset
+    
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get error log statistics."""
-        queryset = self.get_queryset()
+        """
+        Get error log statistics.
         
-        # Total errors
-        total_errors = queryset.count()
+        Answered from the hourly rollups when only level/resolved/error_code
+        filters are given (the 24h window is then hour-aligned), otherwise with
+        one grouped conditional-aggregation query over the filtered error logs.
+        """
+        yesterday = timezone.now() - timezone.timedelta(days=1)
+        if self._rollup_filters_only():
+            groups = self._rollup_queryset().values('error_code', 'level', 'resolved').annotate(
+                rows=Sum('count'),
+                occurrences=Sum('occurrences'),
+                recent=Sum('count', filter=Q(hour__gte=bucket_hour(yesterday))),
+            )
+        else:
+            groups = self.get_queryset().values('error_code', 'level', 'resolved').annotate(
+                rows=Count('id'),
+                occurrences=Sum('occurrence_count'),
+                recent=Count('id', filter=Q(created_at__gte=yesterday)),
+            )
         
-        # Errors by level
+        total_errors = total_occurrences = resolved_count = recent_errors = 0
         errors_by_level = {}
-        for level, _ in ErrorLog.ERROR_LEVELS:
-            count = queryset.filter(level=level).count()
-            if count > 0:
-                errors_by_level[level] = count
-        
-        # Errors by resolution status
-        resolved_count = queryset.filter(resolved=True).count()
-        unresolved_count = total_errors - resolved_count
-        
-        # Recent errors (last 24 hours)
-        yesterday = timezone.now() - timezone.timedelta(days=1)
-        recent_errors = queryset.filter(created_at__gte=yesterday).count()
+        errors_by_code = {}
+        for group in groups.order_by():
+            rows = group['rows'] or 0
+            if not rows:
+                continue
+            total_errors += rows
+            total_occurrences += group['occurrences'] or 0
+            recent_errors += group['recent'] or 0
+            if group['resolved']:
+                resolved_count += rows
+            errors_by_level[group['level']] = errors_by_level.get(group['level'], 0) + rows
+            errors_by_code[group['error_code']] = errors_by_code.get(group['error_code'], 0) + rows
         
-        # Top error codes
-        from django.db.models import Count
-        top_error_codes = queryset.values('error_code').annotate(
-            count=Count('error_code')
-        ).order_by('-count')[:10]
+        top_error_codes = sorted(errors_by_code.items(), key=lambda item: (-item[1], item[0]))[:10]
         
         return Response({
             'total_errors': total_errors,
-            'errors_by_level': errors_by_level,
+            'total_occurrences': total_occurrences,
+            'errors_by_level': {
+                level: errors_by_level[level] for level, _ in ErrorLog.ERROR_LEVELS if errors_by_level.get(level)
+            },
             'resolved_count': resolved_count,
-            'unresolved_count': unresolved_count,
+            'unresolved_count': total_errors - resolved_count,
             'recent_errors_24h': recent_errors,
-            'top_error_codes': list(top_error_codes)
+            'top_error_codes': [{'error_code': code, 'count': count} for code, count in top_error_codes]
         })
+    
+    @action(detail=False, methods=['get'])
+    def timeseries(self, request):
+        """
+        Error counts over time from the hourly rollups.
+        
+        Query params: ``hours`` (look-back window, default 24, max 2160),
+        ``bucket`` (hour or day), ``group_by`` (level or error_code), plus the
+        level/resolved/error_code filters. Only non-empty buckets are returned.
+        """
+        try:
+            hours = max(1, min(int(request.query_params.get('hours', 24)), 24 * 90))
+        except (TypeError, ValueError):
+            hours = 24
+        truncate = TruncDay('hour') if request.query_params.get('bucket') == 'day' else F('hour')
+        group_by = request.query_params.get('group_by')
+        group_fields = [group_by] if group_by in ('level', 'error_code') else []
+        
+        since = bucket_hour(timezone.now()) - timezone.timedelta(hours=hours - 1)
+        rows = (
+            self._rollup_queryset()
+            .filter(hour__gte=since)
+            .annotate(bucket=truncate)
+            .values('bucket', *group_fields)
+            .annotate(count=Sum('count'), occurrences=Sum('occurrences'))
+            .order_by('bucket', *group_fields)
+        )
+        return Response([row for row in rows if row['count']])
@@ -0,0 +1,56 @@
+"""
+Streaming CSV/NDJSON export helpers.
+
+Rows are produced by generators and written to the response as they are read
+from the database, so large exports never build a list in memory.
+"""
+import csv
+import json
+from decimal import Decimal
+from typing import Iterable, Sequence
+
+from django.http import StreamingHttpResponse
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f'Cannot serialize {type(value).__name__}')
+
+
+def _csv_lines(header: Sequence[str], rows: Iterable[Sequence]):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(header: Sequence[str], rows: Iterable[Sequence]):
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), default=_json_default) + '\n'
+
+
+def streaming_export(header: Sequence[str], rows: Iterable[Sequence], filename: str, fmt: str = 'csv') -> StreamingHttpResponse:
+    """
+    Return a StreamingHttpResponse that writes ``rows`` as CSV or NDJSON.
+    ``rows`` should be a generator of tuples in ``header`` order.
+    """
+    lines = _ndjson_lines(header, rows) if fmt == 'ndjson' else _csv_lines(header, rows)
+    response = StreamingHttpResponse(lines, content_type=EXPORT_FORMATS.get(fmt, 'text/csv'))
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    return response
@@ -0,0 +1,289 @@
+"""
+Utility functions for computing account balances from posted journal lines.
+"""
+from datetime import date
+from decimal import Decimal
+from itertools import chain
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, IntegerField, Max, OuterRef, Q, QuerySet, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_date
+
+from .models import AccountBalanceSnapshot, ChartOfAccounts, JournalEntryAttachment, JournalEntryLine
+from .pagination import keyset_filter
+
+ZERO = Decimal('0.00')
+
+
+def parse_report_date(value) -> Optional[date]:
+    """
+    Parse a report date query parameter, returning None if missing or invalid.
+    Views check presence first, so None for a given value means FINANCIAL_INVALID_DATE.
+    """
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return parse_date(str(value).strip())
+    except ValueError:
+        return None
+
+
+def signed_amount(normal_side: str, debit: Decimal, credit: Decimal) -> Decimal:
+    """Return the net effect of debit/credit totals on an account's normal balance."""
+    if normal_side == 'DEBIT':
+        return debit - credit
+    return credit - debit
+
+
+def _posted_sum(field: str, line_filter: Q):
+    return Coalesce(
+        Sum(f'journal_lines__{field}', filter=line_filter),
+        Value(ZERO),
+        output_field=DecimalField(max_digits=15, decimal_places=2),
+    )
+
+
+def annotate_posted_totals(queryset: QuerySet, as_of: date, after: Optional[date] = None) -> QuerySet:
+    """
+    Annotate accounts with ``posted_debit``/``posted_credit`` totals of approved
+    lines dated on or before ``as_of`` (and strictly after ``after`` if given).
+
+    Runs as a single grouped aggregate over JournalEntryLine joined to JournalEntry.
+    """
+    line_filter = Q(
+        journal_lines__journal_entry__status='APPROVED',
+        journal_lines__journal_entry__entry_date__lte=as_of,
+    )
+    if after is not None:
+        line_filter &= Q(journal_lines__journal_entry__entry_date__gt=after)
+    return queryset.annotate(
+        posted_debit=_posted_sum('debit', line_filter),
+        posted_credit=_posted_sum('credit', line_filter),
+    )
+
+
+def posted_totals_by_account(account_ids: Optional[Iterable[int]] = None) -> Dict[int, Tuple[Decimal, Decimal]]:
+    """
+    Return ``{account_id: (debit, credit)}`` totals of all approved journal lines,
+    computed by one SUM ... GROUP BY account query.
+    """
+    lines = JournalEntryLine.objects.filter(journal_entry__status='APPROVED')
+    if account_ids is not None:
+        lines = lines.filter(account_id__in=list(account_ids))
+    totals = lines.values('account_id').annotate(
+        total_debit=Sum('debit'), total_credit=Sum('credit')
+    ).order_by()
+    return {
+        row['account_id']: (row['total_debit'] or ZERO, row['total_credit'] or ZERO)
+        for row in totals
+    }
+
+
+def _entry_subquery(model, aggregate, output_field):
+    rows = (
+        model.objects.filter(journal_entry=OuterRef('pk'))
+        .values('journal_entry')
+        .annotate(total=aggregate)
+        .values('total')
+    )
+    default = Value(ZERO) if isinstance(output_field, DecimalField) else Value(0)
+    return Coalesce(Subquery(rows, output_field=output_field), default, output_field=output_field)
+
+
+def with_line_totals(queryset: QuerySet) -> QuerySet:
+    """
+    Annotate journal entries with ``sum_debit``, ``sum_credit``, ``line_count``
+    and ``attachment_count`` using correlated subqueries, so list pages do not
+    need to load each entry's lines.
+    """
+    amount = DecimalField(max_digits=15, decimal_places=2)
+    return queryset.annotate(
+        sum_debit=_entry_subquery(JournalEntryLine, Sum('debit'), amount),
+        sum_credit=_entry_subquery(JournalEntryLine, Sum('credit'), amount),
+        line_count=_entry_subquery(JournalEntryLine, Count('id'), IntegerField()),
+        attachment_count=_entry_subquery(JournalEntryAttachment, Count('id'), IntegerField()),
+    )
+
+
+def latest_snapshot_date(as_of: date) -> Optional[date]:
+    """Return the most recent snapshot period end on or before ``as_of``."""
+    return AccountBalanceSnapshot.objects.filter(
+        period_end__lte=as_of
+    ).aggregate(latest=Max('period_end'))['latest']
+
+
+def accounts_as_of(as_of: date, queryset: Optional[QuerySet] = None) -> list:
+    """
+    Return accounts with ``as_of_debit``, ``as_of_credit`` and ``as_of_balance``
+    attributes computed from approved journal lines dated on or before ``as_of``.
+
+    Starts from the latest balance snapshot on or before ``as_of`` and only
+    aggregates the lines posted since, so cost does not grow with ledger history.
+    """
+    if queryset is None:
+        queryset = ChartOfAccounts.objects.all()
+    
+    snapshot_date = latest_snapshot_date(as_of)
+    snapshots = {}
+    if snapshot_date is not None:
+        snapshots = {
+            snap.account_id: snap
+            for snap in AccountBalanceSnapshot.objects.filter(period_end=snapshot_date)
+        }
+    
+    accounts = list(annotate_posted_totals(queryset, as_of, after=snapshot_date))
+    
+    # Accounts added after the snapshot was taken need their full history
+    missing_ids = [account.id for account in accounts if account.id not in snapshots]
+    full_totals = {}
+    if snapshot_date is not None and missing_ids:
+        full_totals = {
+            account.id: account
+            for account in annotate_posted_totals(
+                ChartOfAccounts.objects.filter(id__in=missing_ids), as_of
+            )
+        }
+    
+    for account in accounts:
+        snap = snapshots.get(account.id)
+        if snap is not None:
+            account.as_of_debit = snap.debit + account.posted_debit
+            account.as_of_credit = snap.credit + account.posted_credit
+            account.as_of_balance = snap.balance + signed_amount(
+                account.normal_side, account.posted_debit, account.posted_credit
+            )
+            continue
+        
+        totals = full_totals.get(account.id, account)
+        account.as_of_debit = totals.posted_debit
+        account.as_of_credit = totals.posted_credit
+        account.as_of_balance = account.initial_balance + signed_amount(
+            account.normal_side, totals.posted_debit, totals.posted_credit
+        )
+    return accounts
+
+
+def period_activity(start: date, end: date, queryset: Optional[QuerySet] = None, include_closing: bool = False) -> list:
+    """
+    Return accounts annotated with ``period_debit``, ``period_credit`` and
+    ``period_amount`` for approved lines dated between ``start`` and ``end``.
+
+    Closing entries are excluded by default so revenue and expense accounts
+    report their pre-closing activity.
+    """
+    if queryset is None:
+        queryset = ChartOfAccounts.objects.all()
+    
+    line_filter = Q(
+        journal_lines__journal_entry__status='APPROVED',
+        journal_lines__journal_entry__entry_date__gte=start,
+        journal_lines__journal_entry__entry_date__lte=end,
+    )
+    if not include_closing:
+        line_filter &= ~Q(journal_lines__journal_entry__entry_type='CLOSING')
+    
+    accounts = list(queryset.annotate(
+        period_debit=_posted_sum('debit', line_filter),
+        period_credit=_posted_sum('credit', line_filter),
+    ))
+    for account in accounts:
+        account.period_amount = signed_amount(account.normal_side, account.period_debit, account.period_credit)
+    return accounts
+
+
+def take_balance_snapshot(period_end: date, user=None) -> int:
+    """
+    Store the closing balance of every account as of ``period_end``.
+    Replaces any existing snapshot for the same period. Returns the number of rows written.
+    """
+    with transaction.atomic():
+        accounts = accounts_as_of(period_end)
+        AccountBalanceSnapshot.objects.filter(period_end=period_end).delete()
+        AccountBalanceSnapshot.objects.bulk_create([
+            AccountBalanceSnapshot(
+                account=account,
+                period_end=period_end,
+                debit=account.as_of_debit,
+                credit=account.as_of_credit,
+                balance=account.as_of_balance,
+                created_by=user,
+            )
+            for account in accounts
+        ])
+    return len(accounts)
+
+
+def invalidate_snapshots(entry_date: date, account_ids=None) -> int:
+    """
+    Drop snapshots made stale by a posting dated ``entry_date``.
+    Snapshots for periods ending before that date are unaffected.
+    """
+    snapshots = AccountBalanceSnapshot.objects.filter(period_end__gte=entry_date)
+    if account_ids is not None:
+        snapshots = snapshots.filter(account_id__in=account_ids)
+    deleted, _ = snapshots.delete()
+    return deleted
+
+
+LEDGER_ORDER = ('journal_entry__entry_date', 'journal_entry__created_at', 'id')
+
+
+def account_ledger_lines(account: ChartOfAccounts, status: str = 'APPROVED') -> QuerySet:
+    """Return the journal lines that make up ``account``'s ledger, in ledger order."""
+    lines = JournalEntryLine.objects.filter(account=account)
+    if status.upper() != 'ALL':
+        lines = lines.filter(journal_entry__status=status.upper())
+    return lines.order_by(*LEDGER_ORDER)
+
+
+def ledger_key(line: JournalEntryLine) -> tuple:
+    """Return the ledger ordering key of ``line``."""
+    return (line.journal_entry.entry_date, line.journal_entry.created_at, line.id)
+
+
+def balance_before(account: ChartOfAccounts, lines: QuerySet, key: tuple) -> Decimal:
+    """Return the account balance carried forward to just before the line at ``key``."""
+    totals = lines.filter(keyset_filter(LEDGER_ORDER, key, 'lt')).aggregate(
+        total_debit=Sum('debit'), total_credit=Sum('credit')
+    )
+    return account.initial_balance + signed_amount(
+        account.normal_side, totals['total_debit'] or ZERO, totals['total_credit'] or ZERO
+    )
+
+
+def iter_running_balance(account: ChartOfAccounts, lines: QuerySet, rows: Iterable,
+                         gaps: bool = False, chunk_size: int = 2000) -> Iterator[Tuple[JournalEntryLine, Decimal]]:
+    """
+    Yield ``(line, balance)`` for ``rows``, an ordered subset of ``lines``, where
+    ``balance`` is the account balance after that line across all of ``lines``.
+
+    The balance is carried forward from a single aggregate before the first row.
+    Set ``gaps`` when filters may skip lines between rows; the skipped lines are
+    then streamed from the database and added in, without loading them into memory.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    key = ledger_key(first)
+    balance = balance_before(account, lines, key)
+    
+    if not gaps:
+        for line in chain([first], rows):
+            balance += signed_amount(account.normal_side, line.debit, line.credit)
+            yield line, balance
+        return
+    
+    between = lines.exclude(keyset_filter(LEDGER_ORDER, key, 'lt')).values_list(
+        'id', 'debit', 'credit'
+    ).iterator(chunk_size=chunk_size)
+    for line in chain([first], rows):
+        for line_id, debit, credit in between:
+            balance += signed_amount(account.normal_side, debit, credit)
+            if line_id == line.id:
+                break
+        yield line, balance
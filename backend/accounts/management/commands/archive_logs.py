@@ -0,0 +1,71 @@
+"""
+Management command to move old EventLog and ErrorLog rows into compressed
+archive files. Retention comes from EVENT_LOG_RETENTION_DAYS and
+ERROR_LOG_RETENTION_DAYS; run it daily via cron or scheduler.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from accounts.archiving import archive_error_logs, archive_event_logs, expired_counts
+
+
+class Command(BaseCommand):
+    help = 'Archive EventLog and ErrorLog rows older than the retention window to JSONL.gz files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event-days',
+            type=int,
+            help='Archive event logs older than this many days (default: EVENT_LOG_RETENTION_DAYS, 0 skips)',
+        )
+        parser.add_argument(
+            '--error-days',
+            type=int,
+            help='Archive error logs not seen for this many days (default: ERROR_LOG_RETENTION_DAYS, 0 skips)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Rows archived and deleted per transaction (default: LOG_ARCHIVE_CHUNK_SIZE)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show how many rows would be archived without writing or deleting anything',
+        )
+
+    def _cutoff(self, days):
+        return timezone.now() - timedelta(days=days) if days and days > 0 else None
+
+    def handle(self, *args, **options):
+        event_days = options['event_days']
+        if event_days is None:
+            event_days = getattr(settings, 'EVENT_LOG_RETENTION_DAYS', 0)
+        error_days = options['error_days']
+        if error_days is None:
+            error_days = getattr(settings, 'ERROR_LOG_RETENTION_DAYS', 0)
+        event_cutoff = self._cutoff(event_days)
+        error_cutoff = self._cutoff(error_days)
+
+        if event_cutoff is None and error_cutoff is None:
+            self.stdout.write('[ARCHIVE_LOGS] Retention is disabled for both event and error logs')
+            return
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('[ARCHIVE_LOGS] DRY RUN MODE - No changes will be made'))
+            for log_type, count in expired_counts(event_cutoff, error_cutoff):
+                self.stdout.write(f'[ARCHIVE_LOGS] {log_type}: {count} rows would be archived')
+            return
+
+        if event_cutoff is not None:
+            rows, files = archive_event_logs(event_cutoff, options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'[ARCHIVE_LOGS] Archived {rows} event logs older than {event_days} days into {files} files'
+            ))
+        if error_cutoff is not None:
+            rows, files = archive_error_logs(error_cutoff, options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'[ARCHIVE_LOGS] Archived {rows} error logs not seen for {error_days} days into {files} files'
+            ))
@@ -11,7 +11,8 @@ from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
-from accounts.models import User, PasswordHistory, EventLog
+from accounts.audit_sink import record_event
+from accounts.models import User, PasswordHistory
 
 
 class Command(BaseCommand):
@@ -78,7 +79,7 @@ class Command(BaseCommand):
             )
             
             # Log the warning event
-            EventLog.objects.create(
+            record_event(
                 action='PASSWORD_EXPIRY_WARNING',
                 actor=None,
                 target_user=user,
@@ -138,7 +139,7 @@ class Command(BaseCommand):
             )
             
             # Log the expiration event
-            EventLog.objects.create(
+            record_event(
                 action='PASSWORD_EXPIRED',
                 actor=None,
                 target_user=user,
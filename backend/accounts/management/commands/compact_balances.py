@@ -0,0 +1,42 @@
+"""
+Management command to fold pending balance deltas into account totals.
+Only needed when LEDGER_DEFERRED_BALANCES is enabled. Run it every minute via
+cron or scheduler, or keep it running with --interval.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from accounts.posting import compact_balance_deltas
+
+
+class Command(BaseCommand):
+    help = 'Fold pending AccountBalanceDelta rows into ChartOfAccounts debit/credit/balance'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of delta rows folded per transaction',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep running and compact every N seconds (0 runs once)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        interval = options['interval']
+
+        while True:
+            folded = compact_balance_deltas(batch_size=batch_size)
+            if folded:
+                self.stdout.write(self.style.SUCCESS(f'[COMPACT_BALANCES] Folded {folded} balance deltas'))
+            elif not interval:
+                self.stdout.write('[COMPACT_BALANCES] No pending balance deltas')
+
+            if not interval:
+                break
+            time.sleep(interval)
@@ -0,0 +1,16 @@
+"""
+Management command to recompute the hourly ErrorLog rollups from the error logs.
+Rollups are maintained incrementally; run this after bulk imports or manual
+edits of the error_log table.
+"""
+from django.core.management.base import BaseCommand
+from accounts.error_rollup import rebuild_error_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute ErrorLogRollup hourly buckets from ErrorLog'
+
+    def handle(self, *args, **options):
+        self.stdout.write('[REBUILD_ERROR_ROLLUPS] Rebuilding error log rollups...')
+        buckets = rebuild_error_rollups()
+        self.stdout.write(self.style.SUCCESS(f'[REBUILD_ERROR_ROLLUPS] Wrote {buckets} hourly buckets'))
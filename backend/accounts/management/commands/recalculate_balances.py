@@ -1,12 +1,35 @@
 """
 Management command to recalculate all account balances from approved journal entries.
 This is necessary after importing data to ensure balances are correct.
+
+Totals come from one grouped SUM query. Corrections are re-checked with the
+scoped accounts locked and applied as F() deltas, so postings approved while
+the command runs are never overwritten. Use --verify to report drift without
+writing, and --jobs to split the report aggregation across worker processes
+on very large ledgers.
 """
-from django.core.management.base import BaseCommand
-from django.db import transaction
-from accounts.models import ChartOfAccounts, JournalEntry, JournalEntryLine
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
 
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from accounts.ledger_utils import parse_report_date, posted_totals_by_account, signed_amount
+from accounts.posting import pending_balance_deltas
+from accounts.models import ChartOfAccounts, JournalEntryLine
+from accounts.reconciliation import find_balance_drift, repair_balance_drift
+
+ZERO = Decimal('0.00')
+
+
+def _close_connections():
+    # Forked workers must not share the parent's database connections
+    connections.close_all()
+
+
+def _totals_for_partition(account_ids):
+    return posted_totals_by_account(account_ids)
+
 
 class Command(BaseCommand):
     help = 'Recalculate all account balances from approved journal entries (useful after data import)'
@@ -17,72 +40,157 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be recalculated without actually updating',
         )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Report accounts whose stored totals drift from the ledger without updating them',
+        )
+        parser.add_argument(
+            '--from-account',
+            type=str,
+            help='Only recalculate accounts numbered at or above this account number',
+        )
+        parser.add_argument(
+            '--to-account',
+            type=str,
+            help='Only recalculate accounts numbered at or below this account number',
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            help='Only recalculate accounts with approved entries dated on or after this date (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--until',
+            type=str,
+            help='Only recalculate accounts with approved entries dated on or before this date (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help='Number of worker processes used to aggregate journal lines',
+        )
+
+    def _scoped_accounts(self, options):
+        accounts = ChartOfAccounts.objects.all()
+        if options.get('from_account'):
+            accounts = accounts.filter(account_number__gte=options['from_account'])
+        if options.get('to_account'):
+            accounts = accounts.filter(account_number__lte=options['to_account'])
+
+        # Date options pick which accounts to rebuild; totals always cover the full history
+        date_filters = {}
+        for option, lookup in (('since', 'gte'), ('until', 'lte')):
+            raw_date = options.get(option)
+            if not raw_date:
+                continue
+            parsed = parse_report_date(raw_date)
+            if parsed is None:
+                raise CommandError(f'Invalid --{option} date: {raw_date}')
+            date_filters[f'journal_entry__entry_date__{lookup}'] = parsed
+        if date_filters:
+            touched = JournalEntryLine.objects.filter(
+                journal_entry__status='APPROVED', **date_filters
+            ).values('account_id')
+            accounts = accounts.filter(id__in=touched)
+
+        return list(accounts.order_by('account_number'))
+
+    def _posted_totals(self, account_ids, jobs):
+        if jobs <= 1 or len(account_ids) < jobs:
+            return posted_totals_by_account(account_ids)
+
+        partitions = [account_ids[i::jobs] for i in range(jobs)]
+        _close_connections()
+        context = multiprocessing.get_context('fork')
+        totals = {}
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=_close_connections) as pool:
+            for partial in pool.map(_totals_for_partition, partitions):
+                totals.update(partial)
+        return totals
 
     def handle(self, *args, **options):
         dry_run = options.get('dry_run', False)
-        
+        verify = options.get('verify', False)
+        jobs = max(1, options.get('jobs') or 1)
+
         self.stdout.write(f'[RECALCULATE_BALANCES] Starting balance recalculation...')
-        
+
         if dry_run:
             self.stdout.write(self.style.WARNING('[RECALCULATE_BALANCES] DRY RUN MODE - No changes will be made'))
-        
-        # Reset all account balances to initial_balance
-        accounts_updated = 0
-        total_debits = Decimal('0.00')
-        total_credits = Decimal('0.00')
-        
-        with transaction.atomic():
-            for account in ChartOfAccounts.objects.all():
-                # Start with initial balance
-                account.balance = account.initial_balance
-                account.debit = Decimal('0.00')
-                account.credit = Decimal('0.00')
-                
-                # Get all approved journal entry lines for this account
-                approved_lines = JournalEntryLine.objects.filter(
-                    account=account,
-                    journal_entry__status='APPROVED'
-                ).select_related('journal_entry')
-                
-                # Recalculate balance from approved entries
-                for line in approved_lines:
-                    if line.debit > 0:
-                        account.debit += line.debit
-                        if account.normal_side == 'DEBIT':
-                            account.balance += line.debit
-                        else:
-                            account.balance -= line.debit
-                    
-                    if line.credit > 0:
-                        account.credit += line.credit
-                        if account.normal_side == 'CREDIT':
-                            account.balance += line.credit
-                        else:
-                            account.balance -= line.credit
-                
-                if not dry_run:
-                    account.save(update_fields=['balance', 'debit', 'credit'])
-                
-                accounts_updated += 1
-                total_debits += account.debit
-                total_credits += account.credit
-                
+        if verify:
+            self.stdout.write('[RECALCULATE_BALANCES] VERIFY MODE - Reporting drift only')
+
+        accounts = self._scoped_accounts(options)
+        account_ids = [account.id for account in accounts]
+        if not accounts:
+            self.stdout.write(self.style.WARNING('[RECALCULATE_BALANCES] No accounts matched the given scope'))
+            return
+
+        totals = self._posted_totals(account_ids, jobs)
+        # Stored totals plus not-yet-compacted deltas are what users currently see
+        pending = pending_balance_deltas(account_ids)
+
+        drifted = 0
+        total_debits = ZERO
+        total_credits = ZERO
+        for account in accounts:
+            debit, credit = totals.get(account.id, (ZERO, ZERO))
+            balance = account.initial_balance + signed_amount(account.normal_side, debit, credit)
+            total_debits += debit
+            total_credits += credit
+
+            deltas = pending.get(account.id, {})
+            stored = (
+                account.debit + deltas.get('debit', ZERO),
+                account.credit + deltas.get('credit', ZERO),
+                account.balance + deltas.get('balance', ZERO),
+            )
+            if stored != (debit, credit, balance):
+                drifted += 1
                 self.stdout.write(
                     f'[RECALCULATE_BALANCES] Account {account.account_number} ({account.account_name}): '
-                    f'Balance=${account.balance}, Debit=${account.debit}, Credit=${account.credit}'
+                    f'Balance ${stored[2]} -> ${balance}, Debit ${stored[0]} -> ${debit}, '
+                    f'Credit ${stored[1]} -> ${credit}'
                 )
-        
+            elif options.get('verbosity', 1) > 1:
+                self.stdout.write(
+                    f'[RECALCULATE_BALANCES] Account {account.account_number} ({account.account_name}): '
+                    f'Balance=${balance}, Debit=${debit}, Credit=${credit}'
+                )
+
+        if verify:
+            style = self.style.SUCCESS if not drifted else self.style.ERROR
+            self.stdout.write(
+                style(f'[RECALCULATE_BALANCES] {drifted} of {len(accounts)} accounts drift from the ledger')
+            )
+            if drifted:
+                raise CommandError('Account balances drift from approved journal entries')
+            return
+
+        changed = drifted if dry_run else 0
+        if not dry_run and drifted:
+            with transaction.atomic():
+                # The report above ran without locks; recompute the drift with the
+                # accounts locked and add the differences, leaving pending deltas
+                # for the compactor, so concurrent postings are never lost
+                drift = find_balance_drift(account_ids)
+                if drift:
+                    repair_balance_drift(drift)
+                changed = len(drift)
+
         self.stdout.write(
             self.style.SUCCESS(
-                f'\n[RECALCULATE_BALANCES] ✅ SUCCESS! Recalculated balances for {accounts_updated} accounts'
+                f'\n[RECALCULATE_BALANCES] ✅ SUCCESS! Recalculated balances for {len(accounts)} accounts '
+                f'({changed} changed)'
             )
         )
         self.stdout.write(
             f'[RECALCULATE_BALANCES] Total Debits: ${total_debits}, Total Credits: ${total_credits}'
         )
-        
+
         if dry_run:
             self.stdout.write(
                 self.style.WARNING('[RECALCULATE_BALANCES] This was a dry run - no changes were saved')
             )
-
@@ -0,0 +1,56 @@
+"""
+Management command to incrementally verify stored account balances.
+Only accounts touched by journal entries approved since the previous run are
+re-aggregated, so it is cheap enough to run every few minutes from cron.
+Drift is recorded in the event log; use recalculate_balances for a full rebuild.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from accounts.reconciliation import reconcile_balances
+
+
+class Command(BaseCommand):
+    help = 'Verify balances of accounts touched since the last reconciliation checkpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repair',
+            action='store_true',
+            help='Correct drifted accounts instead of only reporting them',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Ignore the checkpoint and check every account with approved entries',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            type=str,
+            default='balances',
+            help='Checkpoint name (separate schedules can keep separate checkpoints)',
+        )
+
+    def handle(self, *args, **options):
+        result = reconcile_balances(
+            name=options['checkpoint'],
+            repair=options['repair'],
+            full=options['full'],
+        )
+        drift = result['drift']
+
+        for row in drift:
+            self.stdout.write(
+                f"[RECONCILE_BALANCES] Account {row['account_number']} ({row['account_name']}): "
+                f"stored balance ${row['stored']['balance']}, expected ${row['expected']['balance']}"
+            )
+
+        summary = (
+            f"[RECONCILE_BALANCES] Checked {result['accounts_checked']} accounts through "
+            f"JE-{result['last_entry_id']}, {len(drift)} drifted"
+        )
+        if not drift:
+            self.stdout.write(self.style.SUCCESS(summary))
+        elif options['repair']:
+            self.stdout.write(self.style.WARNING(summary + ' (repaired)'))
+        else:
+            self.stdout.write(self.style.ERROR(summary))
+            raise CommandError('Account balances drift from approved journal entries')
@@ -0,0 +1,24 @@
+"""
+Management command to write audit events left in the spool directory by
+workers that stopped before flushing their buffered events (AUDIT_SINK =
+'buffered'). Workers replay these on startup as well; run this after a crash
+when no worker is due to start.
+"""
+from django.core.management.base import BaseCommand
+from accounts.audit_sink import replay_spool, spool_dir
+
+
+class Command(BaseCommand):
+    help = 'Replay audit events spooled by stopped workers into EventLog'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--include-live',
+            action='store_true',
+            help='Also replay spool files of processes that still appear to be running',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'[REPLAY_AUDIT_SPOOL] Replaying spooled audit events from {spool_dir()}...')
+        replayed = replay_spool(include_live=options['include_live'])
+        self.stdout.write(self.style.SUCCESS(f'[REPLAY_AUDIT_SPOOL] Wrote {replayed} audit events'))
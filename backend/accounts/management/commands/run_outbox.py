@@ -0,0 +1,56 @@
+"""
+Management command to deliver queued EmailOutbox messages.
+Run it from cron, or keep it running with --loop.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from accounts.email_outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = 'Send pending emails from the outbox, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=getattr(settings, 'EMAIL_OUTBOX_WORKERS', 4),
+            help='Number of sender threads, each with its own mail connection',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 100),
+            help='Messages claimed per batch',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the outbox instead of exiting when it is empty',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds between polls with --loop (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, retried, dead = drain_outbox(options['workers'], options['batch_size'])
+            if sent or retried or dead or not options['loop']:
+                self.stdout.write(
+                    f'[RUN_OUTBOX] Sent {sent}, will retry {retried}, dead-lettered {dead}'
+                )
+            if dead:
+                self.stdout.write(self.style.WARNING(
+                    f'[RUN_OUTBOX] {dead} messages exceeded the retry limit; see EmailOutbox rows with status DEAD'
+                ))
+            if not options['loop']:
+                break
+            try:
+                time.sleep(options['interval'])
+            except KeyboardInterrupt:
+                break
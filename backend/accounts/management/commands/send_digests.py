@@ -0,0 +1,19 @@
+"""
+Management command to email journal entry digests to users whose
+notification preference is DIGEST. Each run covers everything collected
+since the previous one, so schedule it at the digest interval (e.g. hourly).
+Digests are queued in the email outbox and delivered by run_outbox.
+"""
+from django.core.management.base import BaseCommand
+from accounts.notifications import send_digests
+
+
+class Command(BaseCommand):
+    help = 'Queue one digest email per recipient of pending journal entry notifications'
+
+    def handle(self, *args, **options):
+        self.stdout.write('[SEND_DIGESTS] Collecting pending notifications...')
+        digests, notifications = send_digests()
+        self.stdout.write(self.style.SUCCESS(
+            f'[SEND_DIGESTS] Queued {digests} digests covering {notifications} notifications'
+        ))
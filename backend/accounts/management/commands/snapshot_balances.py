@@ -0,0 +1,43 @@
+"""
+Management command to store closing balance snapshots for a reporting period.
+Financial statements start from the latest snapshot instead of re-summing the whole ledger.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from accounts.ledger_utils import parse_report_date, take_balance_snapshot
+from accounts.models import AccountBalanceSnapshot
+
+
+class Command(BaseCommand):
+    help = 'Snapshot every account balance as of a period end date (defaults to today)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period-end',
+            type=str,
+            help='Last day of the period to snapshot (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List existing snapshot periods instead of creating one',
+        )
+
+    def handle(self, *args, **options):
+        if options.get('list'):
+            periods = AccountBalanceSnapshot.objects.values_list('period_end', flat=True).distinct().order_by('-period_end')
+            for period_end in periods:
+                self.stdout.write(f'[SNAPSHOT_BALANCES] {period_end.isoformat()}')
+            return
+
+        raw_date = options.get('period_end')
+        period_end = parse_report_date(raw_date) if raw_date else timezone.localdate()
+        if period_end is None:
+            raise CommandError(f'Invalid --period-end date: {raw_date}')
+
+        count = take_balance_snapshot(period_end)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'[SNAPSHOT_BALANCES] ✅ Stored {count} account balances as of {period_end.isoformat()}'
+            )
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_journal_reporting_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountBalanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_end', models.DateField(help_text='Last day included in this snapshot')),
+                ('debit', models.DecimalField(decimal_places=2, default=0.0, max_digits=15)),
+                ('credit', models.DecimalField(decimal_places=2, default=0.0, max_digits=15)),
+                ('balance', models.DecimalField(decimal_places=2, default=0.0, max_digits=15)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_snapshots', to='accounts.chartofaccounts')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-period_end', 'account'],
+                'indexes': [models.Index(fields=['period_end'], name='snapshot_period_end_idx')],
+                'constraints': [models.UniqueConstraint(fields=('account', 'period_end'), name='unique_account_period_snapshot')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0017_accountbalancesnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountBalanceDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('debit', models.DecimalField(decimal_places=2, default=0.0, max_digits=15)),
+                ('credit', models.DecimalField(decimal_places=2, default=0.0, max_digits=15)),
+                ('balance', models.DecimalField(decimal_places=2, default=0.0, max_digits=15)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_deltas', to='accounts.chartofaccounts')),
+                ('journal_entry', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='balance_deltas', to='accounts.journalentry')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
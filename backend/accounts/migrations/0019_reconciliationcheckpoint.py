@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0018_accountbalancedelta'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReconciliationCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_entry_id', models.IntegerField(default=0, help_text='Highest approved journal entry ID processed')),
+                ('last_reviewed_at', models.DateTimeField(blank=True, help_text='Latest approval time processed', null=True)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('accounts_checked', models.IntegerField(default=0)),
+                ('drift_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='eventlog',
+            name='action',
+            field=models.CharField(choices=[('USER_CREATED', 'User Created'), ('USER_ACTIVATED', 'User Activated'), ('USER_DEACTIVATED', 'User Deactivated'), ('USER_SUSPENDED', 'User Suspended'), ('USER_UNSUSPENDED', 'User Unsuspended'), ('USER_UPDATED', 'User Updated'), ('REQUEST_APPROVED', 'Access Approved'), ('REQUEST_REJECTED', 'Access Rejected'), ('PASSWORD_CHANGED', 'Password Changed'), ('PASSWORD_RESET', 'Password Reset'), ('ACCOUNT_CREATED', 'Account Created'), ('ACCOUNT_UPDATED', 'Account Updated'), ('ACCOUNT_ACTIVATED', 'Account Activated'), ('ACCOUNT_DEACTIVATED', 'Account Deactivated'), ('JOURNAL_ENTRY_CREATED', 'Journal Entry Created'), ('JOURNAL_ENTRY_UPDATED', 'Journal Entry Updated'), ('JOURNAL_ENTRY_APPROVED', 'Journal Entry Approved'), ('JOURNAL_ENTRY_REJECTED', 'Journal Entry Rejected'), ('LEDGER_RECONCILED', 'Ledger Reconciled')], max_length=32),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_seen_at(apps, schema_editor):
+    ErrorLog = apps.get_model('accounts', 'ErrorLog')
+    ErrorLog.objects.filter(first_seen_at__isnull=True).update(
+        first_seen_at=F('created_at'), last_seen_at=F('created_at')
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0020_ledgerversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='errorlog',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, help_text='Hash of error code, path, user and exception type used to group repeats', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='errorlog',
+            name='first_seen_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='errorlog',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='errorlog',
+            name='occurrence_count',
+            field=models.PositiveIntegerField(default=1, help_text='Number of occurrences grouped into this row'),
+        ),
+        migrations.AddField(
+            model_name='errorlog',
+            name='sample_of',
+            field=models.ForeignKey(blank=True, help_text='Grouped row this full occurrence sample belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='samples', to='accounts.errorlog'),
+        ),
+        migrations.RunPython(backfill_seen_at, migrations.RunPython.noop),
+    ]
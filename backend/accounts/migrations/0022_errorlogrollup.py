@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:25
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncHour
+
+
+def build_rollups(apps, schema_editor):
+    ErrorLog = apps.get_model('accounts', 'ErrorLog')
+    ErrorLogRollup = apps.get_model('accounts', 'ErrorLogRollup')
+    rows = (
+        ErrorLog.objects.filter(sample_of__isnull=True)
+        .annotate(hour=TruncHour('created_at'))
+        .values('hour', 'error_code', 'level', 'resolved')
+        .annotate(rows=Count('id'), total=Sum('occurrence_count'))
+        .order_by()
+    )
+    ErrorLogRollup.objects.bulk_create([
+        ErrorLogRollup(
+            hour=row['hour'], error_code=row['error_code'], level=row['level'],
+            resolved=row['resolved'], count=row['rows'], occurrences=row['total'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0021_errorlog_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ErrorLogRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(help_text='Start of the hour the errors were first logged')),
+                ('error_code', models.CharField(max_length=50)),
+                ('level', models.CharField(choices=[('DEBUG', 'Debug'), ('INFO', 'Info'), ('WARNING', 'Warning'), ('ERROR', 'Error'), ('CRITICAL', 'Critical')], max_length=10)),
+                ('resolved', models.BooleanField(default=False)),
+                ('count', models.IntegerField(default=0, help_text='Number of ErrorLog rows')),
+                ('occurrences', models.IntegerField(default=0, help_text='Number of occurrences grouped into those rows')),
+            ],
+            options={
+                'ordering': ['hour'],
+                'indexes': [models.Index(fields=['hour', 'error_code'], name='accounts_er_hour_776106_idx')],
+                'unique_together': {('hour', 'error_code', 'level', 'resolved')},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0022_errorlogrollup'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='errorlog',
+            name='sample_of',
+            field=models.ForeignKey(blank=True, help_text='Grouped row this full occurrence sample belongs to (deleted with it by delete_error_logs)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='samples', to='accounts.errorlog'),
+        ),
+    ]
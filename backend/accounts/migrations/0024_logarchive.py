@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0023_errorlog_sample_of_set_null'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('log_type', models.CharField(choices=[('EVENT', 'Event Log'), ('ERROR', 'Error Log')], max_length=10)),
+                ('day', models.DateField(help_text='Date (UTC) the archived rows were created')),
+                ('path', models.CharField(help_text='File path relative to LOG_ARCHIVE_ROOT', max_length=500, unique=True)),
+                ('row_count', models.IntegerField(default=0)),
+                ('min_id', models.IntegerField(help_text='Lowest archived row ID in the file')),
+                ('max_id', models.IntegerField(help_text='Highest archived row ID in the file')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['log_type', 'day', 'min_id'],
+                'indexes': [models.Index(fields=['log_type', 'day'], name='accounts_lo_log_typ_a47cef_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0024_logarchive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(fields=['created_at'], name='accounts_ev_created_0f7cd7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(fields=['action', 'created_at'], name='accounts_ev_action_8fd95b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(fields=['record_type', 'record_id', 'created_at'], name='accounts_ev_record__7045e2_idx'),
+        ),
+    ]
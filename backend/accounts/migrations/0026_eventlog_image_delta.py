@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0025_eventlog_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventlog',
+            name='delta_base',
+            field=models.IntegerField(blank=True, help_text='ID of the event whose after image image_delta applies to', null=True),
+        ),
+        migrations.AddField(
+            model_name='eventlog',
+            name='delta_depth',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Number of deltas since the last keyframe'),
+        ),
+        migrations.AddField(
+            model_name='eventlog',
+            name='image_delta',
+            field=models.JSONField(blank=True, help_text='Field-level diff replacing before/after images; None for keyframes', null=True),
+        ),
+    ]
@@ -108,6 +108,7 @@ class EventLog(models.Model):
         ("JOURNAL_ENTRY_UPDATED", "Journal Entry Updated"),
         ("JOURNAL_ENTRY_APPROVED", "Journal Entry Approved"),
         ("JOURNAL_ENTRY_REJECTED", "Journal Entry Rejected"),
+        ("LEDGER_RECONCILED", "Ledger Reconciled"),
     ]
 
     action = models.CharField(max_length=32, choices=ACTION_CHOICES)
@@ -122,10 +123,23 @@ class EventLog(models.Model):
     after_image = models.JSONField(null=True, blank=True, help_text="State of the record after the change")
     record_type = models.CharField(max_length=50, blank=True, help_text="Type of record (User, Account, etc.)")
     record_id = models.IntegerField(null=True, blank=True, help_text="ID of the affected record")
+    image_delta = models.JSONField(
+        null=True, blank=True,
+        help_text="Field-level diff replacing before/after images; None for keyframes"
+    )
+    delta_base = models.IntegerField(
+        null=True, blank=True, help_text="ID of the event whose after image image_delta applies to"
+    )
+    delta_depth = models.PositiveSmallIntegerField(default=0, help_text="Number of deltas since the last keyframe")
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["action", "created_at"]),
+            models.Index(fields=["record_type", "record_id", "created_at"]),
+        ]
 
 class SecurityQuestion(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="security_questions")
@@ -190,6 +204,18 @@ class ErrorLog(models.Model):
         help_text="Admin who resolved this error"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    fingerprint = models.CharField(
+        max_length=40, blank=True, db_index=True,
+        help_text="Hash of error code, path, user and exception type used to group repeats"
+    )
+    occurrence_count = models.PositiveIntegerField(default=1, help_text="Number of occurrences grouped into this row")
+    first_seen_at = models.DateTimeField(null=True, blank=True)
+    last_seen_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    sample_of = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='samples',
+        help_text="Grouped row this full occurrence sample belongs to (deleted with it by delete_error_logs)"
+    )
     
     class Meta:
         ordering = ['-created_at']
@@ -279,8 +305,17 @@ class ChartOfAccounts(models.Model):
     def __str__(self):
         return f"{self.account_number} - {self.account_name}"
     
+    def current_balance(self):
+        """Stored balance plus any posted deltas not yet folded in by the compactor."""
+        pending = getattr(self, 'pending_balance', None)
+        if pending is None:
+            if not getattr(settings, 'LEDGER_DEFERRED_BALANCES', False):
+                return self.balance
+            pending = self.balance_deltas.aggregate(total=models.Sum('balance'))['total']
+        return self.balance + (pending or 0)
+    
     def can_deactivate(self):
-        return self.balance == 0
+        return self.current_balance() == 0
     
     def is_currently_deactivated(self):
         if not self.is_active:
@@ -308,7 +343,7 @@ class ChartOfAccounts(models.Model):
     
     def can_be_closed(self):
         """Check if account can be closed (balance should be zero)."""
-        return self.balance == 0
+        return self.current_balance() == 0
 
 
 class JournalEntry(models.Model):
@@ -352,6 +387,9 @@ class JournalEntry(models.Model):
         ordering = ['-entry_date', '-created_at']
         verbose_name = 'Journal Entry'
         verbose_name_plural = 'Journal Entries'
+        indexes = [
+            models.Index(fields=['status', 'entry_date'], name='journal_status_date_idx'),
+        ]
     
     def __str__(self):
         return f"JE-{self.id} ({self.entry_date})"
@@ -392,6 +430,9 @@ class JournalEntryLine(models.Model):
     
     class Meta:
         ordering = ['order', 'id']
+        indexes = [
+            models.Index(fields=['account', 'journal_entry'], name='journal_line_account_idx'),
+        ]
     
     def __str__(self):
         return f"{self.account.account_name}: Dr {self.debit} Cr {self.credit}"
@@ -418,3 +459,220 @@ class JournalEntryAttachment(models.Model):
     
     def __str__(self):
         return f"{self.file_name} ({self.journal_entry})"  
+
+
+class AccountBalanceSnapshot(models.Model):
+    """Closing balance of an account at the end of a reporting period."""
+    account = models.ForeignKey(
+        ChartOfAccounts,
+        on_delete=models.CASCADE,
+        related_name='balance_snapshots'
+    )
+    period_end = models.DateField(help_text="Last day included in this snapshot")
+    debit = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    credit = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    balance = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    created_at = models.DateTimeField(auto_now_add=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+    
+    class Meta:
+        ordering = ['-period_end', 'account']
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'period_end'], name='unique_account_period_snapshot'),
+        ]
+        indexes = [
+            models.Index(fields=['period_end'], name='snapshot_period_end_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.account.account_number} @ {self.period_end}: {self.balance}"
+
+
+class AccountBalanceDelta(models.Model):
+    """
+    Pending change to an account's debit/credit/balance totals.
+    Appended on approval when LEDGER_DEFERRED_BALANCES is enabled and folded
+    into ChartOfAccounts by the compact_balances command.
+    """
+    account = models.ForeignKey(
+        ChartOfAccounts,
+        on_delete=models.CASCADE,
+        related_name='balance_deltas'
+    )
+    journal_entry = models.ForeignKey(
+        JournalEntry,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='balance_deltas'
+    )
+    debit = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    credit = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    balance = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"{self.account.account_number}: {self.balance:+}"
+
+
+class ReconciliationCheckpoint(models.Model):
+    """
+    High-water mark of the last journal entries checked by the balance reconciler.
+    Each run only re-aggregates accounts touched by entries posted after it.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    last_entry_id = models.IntegerField(default=0, help_text="Highest approved journal entry ID processed")
+    last_reviewed_at = models.DateTimeField(null=True, blank=True, help_text="Latest approval time processed")
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    accounts_checked = models.IntegerField(default=0)
+    drift_count = models.IntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.name} @ JE-{self.last_entry_id}"
+
+
+class LedgerVersion(models.Model):
+    """
+    Single-row counter bumped whenever posted balances or accounts change.
+    Cached financial statements are keyed by it, so a bump invalidates them all.
+    """
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Ledger v{self.version}"
+
+
+class ErrorLogRollup(models.Model):
+    """
+    Hourly ErrorLog totals per error code, level and resolution status.
+    Kept up to date by log_error and the resolve actions so error statistics
+    never scan the ErrorLog table. Occurrences are counted in the hour their
+    grouped row was first logged.
+    """
+    hour = models.DateTimeField(help_text="Start of the hour the errors were first logged")
+    error_code = models.CharField(max_length=50)
+    level = models.CharField(max_length=10, choices=ErrorLog.ERROR_LEVELS)
+    resolved = models.BooleanField(default=False)
+    count = models.IntegerField(default=0, help_text="Number of ErrorLog rows")
+    occurrences = models.IntegerField(default=0, help_text="Number of occurrences grouped into those rows")
+    
+    class Meta:
+        ordering = ['hour']
+        unique_together = [('hour', 'error_code', 'level', 'resolved')]
+        indexes = [models.Index(fields=['hour', 'error_code'])]
+    
+    def __str__(self):
+        return f"{self.hour:%Y-%m-%d %H:00} {self.error_code} {self.level}: {self.count}"
+
+
+class LogArchive(models.Model):
+    """
+    Index of one compressed JSONL archive file written by the archive_logs command.
+    Each file holds EventLog or ErrorLog rows created on a single day.
+    """
+    LOG_TYPES = [
+        ('EVENT', 'Event Log'),
+        ('ERROR', 'Error Log'),
+    ]
+    
+    log_type = models.CharField(max_length=10, choices=LOG_TYPES)
+    day = models.DateField(help_text="Date (UTC) the archived rows were created")
+    path = models.CharField(max_length=500, unique=True, help_text="File path relative to LOG_ARCHIVE_ROOT")
+    row_count = models.IntegerField(default=0)
+    min_id = models.IntegerField(help_text="Lowest archived row ID in the file")
+    max_id = models.IntegerField(help_text="Highest archived row ID in the file")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['log_type', 'day', 'min_id']
+        indexes = [models.Index(fields=['log_type', 'day'])]
+    
+    def __str__(self):
+        return f"{self.log_type} {self.day}: {self.row_count} rows"
+
+
+class EmailOutbox(models.Model):
+    """
+    Outgoing email queued by enqueue_email in the same transaction as the
+    change it reports, and delivered by the run_outbox command. Failed sends
+    are retried with exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS,
+    then left as DEAD (without the body) for review.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('DEAD', 'Dead Letter'),
+    ]
+    
+    subject = models.CharField(max_length=255)
+    body = models.TextField(blank=True, help_text="Cleared once the message is sent or dead-lettered")
+    from_email = models.CharField(max_length=254, blank=True)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True, help_text="When a sender claimed the message")
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+    
+    def __str__(self):
+        return f"{self.status} {self.subject} -> {', '.join(self.recipients)}"
+
+
+class NotificationPreference(models.Model):
+    """
+    How a user receives journal entry notifications (submitted for approval,
+    approved, rejected). Users without a row get NOTIFICATION_DEFAULT_MODE.
+    """
+    MODE_CHOICES = [
+        ('IMMEDIATE', 'One email per event'),
+        ('DIGEST', 'Periodic digest'),
+        ('OFF', 'No email'),
+    ]
+    
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notification_preference')
+    journal_mode = models.CharField(max_length=10, choices=MODE_CHOICES, default='IMMEDIATE')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.user.username}: {self.journal_mode}"
+
+
+class PendingNotification(models.Model):
+    """
+    Journal entry notification held for a DIGEST-mode user until the next
+    send_digests run, which emails and deletes it.
+    """
+    KIND_CHOICES = [
+        ('PENDING', 'Submitted for approval'),
+        ('APPROVED', 'Approved'),
+        ('REJECTED', 'Rejected'),
+    ]
+    
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='pending_notifications')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    journal_entry = models.ForeignKey(JournalEntry, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    summary = models.CharField(max_length=500)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [models.Index(fields=['recipient', 'kind'])]
+    
+    def __str__(self):
+        return f"{self.recipient_id} {self.kind}: {self.summary}"
@@ -0,0 +1,118 @@
+"""
+Journal entry notifications with per-user delivery preferences.
+
+IMMEDIATE recipients get the usual email for each event. DIGEST recipients
+get a PendingNotification row instead, and ``send_digests`` (the send_digests
+command) turns everything collected since its previous run into one email per
+recipient. OFF recipients get nothing.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from .email_outbox import enqueue_email
+from .models import NotificationPreference, PendingNotification
+
+logger = logging.getLogger(__name__)
+
+# Digest sections, in display order
+DIGEST_SECTIONS = [
+    ('PENDING', 'Submitted for your approval'),
+    ('APPROVED', 'Approved'),
+    ('REJECTED', 'Rejected'),
+]
+
+
+def default_mode() -> str:
+    return getattr(settings, 'NOTIFICATION_DEFAULT_MODE', 'IMMEDIATE')
+
+
+def notification_modes(users: Iterable) -> Dict[int, str]:
+    """Return ``{user_id: journal_mode}`` for ``users`` with one query."""
+    user_ids = [user.id for user in users]
+    modes = dict.fromkeys(user_ids, default_mode())
+    modes.update(
+        NotificationPreference.objects.filter(user_id__in=user_ids).values_list('user_id', 'journal_mode')
+    )
+    return modes
+
+
+def notify_journal_event(recipients: Iterable, kind: str, summaries: Dict[int, str], subject: str, body: str):
+    """
+    Notify ``recipients`` that the journal entries in ``summaries``
+    (``{entry_id: one-line summary}``) became ``kind``. Each IMMEDIATE
+    recipient gets a queued email of their own with ``subject`` and ``body``,
+    so addresses are never shared and one bad address fails only its message.
+    """
+    recipients = [user for user in recipients if user and user.email]
+    if not recipients:
+        return
+    modes = notification_modes(recipients)
+
+    for user in recipients:
+        if modes[user.id] == 'IMMEDIATE':
+            enqueue_email(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=True)
+
+    PendingNotification.objects.bulk_create([
+        PendingNotification(recipient=user, kind=kind, journal_entry_id=entry_id, summary=summary[:500])
+        for user in recipients if modes[user.id] == 'DIGEST'
+        for entry_id, summary in summaries.items()
+    ])
+
+
+def _digest_body(name: str, sections: Dict[str, list]) -> str:
+    max_lines = getattr(settings, 'NOTIFICATION_DIGEST_MAX_LINES', 50)
+    parts = [f"Hello {name},\n\nHere is a summary of journal entry activity since your last digest."]
+    for kind, title in DIGEST_SECTIONS:
+        lines = sections.get(kind)
+        if not lines:
+            continue
+        shown = "\n".join(f"- {line}" for line in lines[:max_lines])
+        if len(lines) > max_lines:
+            shown += f"\n...and {len(lines) - max_lines} more"
+        parts.append(f"{title} ({len(lines)}):\n{shown}")
+    parts.append("Please log in to FlowCounts for details.\n\nFlowCounts Team")
+    return "\n\n".join(parts)
+
+
+def send_digests() -> Tuple[int, int]:
+    """
+    Queue one digest email per recipient with pending notifications and delete
+    the notifications in the same transaction. Reads them with a single query.
+    Returns ``(digests_sent, notifications_included)``.
+    """
+    with transaction.atomic():
+        rows = list(
+            PendingNotification.objects
+            .order_by('recipient_id', 'id')
+            .values_list('id', 'recipient_id', 'recipient__email', 'recipient__first_name', 'recipient__username', 'kind', 'summary')
+        )
+        if not rows:
+            return 0, 0
+
+        digests = {}
+        for _, recipient_id, email, first_name, username, kind, summary in rows:
+            if recipient_id not in digests:
+                digests[recipient_id] = (email, first_name or username, defaultdict(list))
+            digests[recipient_id][2][kind].append(summary)
+
+        sent = 0
+        for email, name, sections in digests.values():
+            if not email:
+                continue
+            count = sum(len(lines) for lines in sections.values())
+            enqueue_email(
+                f"FlowCounts: Journal entry digest ({count} update{'' if count == 1 else 's'})",
+                _digest_body(name, sections),
+                settings.DEFAULT_FROM_EMAIL,
+                [email],
+            )
+            sent += 1
+
+        ids = [row[0] for row in rows]
+        for start in range(0, len(ids), 500):
+            PendingNotification.objects.filter(id__in=ids[start:start + 500]).delete()
+    return sent, len(rows)
@@ -0,0 +1,72 @@
+"""
+Keyset (cursor) pagination helpers for list endpoints.
+
+Endpoints keep returning plain lists unless the client passes ``limit``,
+``offset`` or ``cursor``, so existing pages continue to work unchanged.
+"""
+import base64
+import json
+from typing import Optional, Sequence
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor query parameter cannot be decoded."""
+
+
+def wants_pagination(request) -> bool:
+    """Return True if the client asked for a paginated response."""
+    return any(param in request.query_params for param in ('limit', 'offset', 'cursor'))
+
+
+def parse_offset(request) -> int:
+    """Read the ``offset`` query parameter (non-negative)."""
+    try:
+        return max(0, int(request.query_params.get('offset', 0)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_limit(request, default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    """Read the ``limit`` query parameter, clamped to ``1..maximum``."""
+    try:
+        limit = int(request.query_params.get('limit', default))
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, maximum))
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Encode the ordering key of the last row on a page as an opaque cursor."""
+    raw = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[list]:
+    """Decode a cursor produced by ``encode_cursor``. Returns None when no cursor is given."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor(cursor)
+    return values
+
+
+def keyset_filter(fields: Sequence[str], values: Sequence, op: str = 'gt') -> Q:
+    """
+    Build ``(f1, f2, ...) > (v1, v2, ...)`` (or ``lt``) as an OR of prefix-equal
+    comparisons, so rows are compared on the full ordering key.
+    """
+    condition = Q()
+    for i, field in enumerate(fields):
+        prefix = {fields[j]: values[j] for j in range(i)}
+        condition |= Q(**prefix, **{f'{field}__{op}': values[i]})
+    return condition
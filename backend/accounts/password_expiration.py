@@ -7,10 +7,11 @@ Checks happen on user login and when passwords are updated.
 from django.db.models.signals import post_save
 from django.contrib.auth.signals import user_logged_in
 from django.dispatch import receiver
-from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
+from .audit_sink import record_event
+from .email_outbox import enqueue_email
 from .models import User, PasswordHistory, EventLog
 
 
@@ -22,7 +23,7 @@ def send_expiration_warning_email(user):
     expiry_date = user.password_expires_at.strftime('%B %d, %Y')
     
     try:
-        send_mail(
+        enqueue_email(
             subject='Password Expiring Soon - FlowCounts',
             message=(
                 f'Hello {user.first_name or user.username},\n\n'
@@ -43,7 +44,7 @@ def send_expiration_warning_email(user):
         )
         
         # Log the warning event
-        EventLog.objects.create(
+        record_event(
             action='PASSWORD_EXPIRY_WARNING',
             actor=None,
             target_user=user,
@@ -76,7 +77,7 @@ def send_password_expired_email(user):
             )
         
         # Send expiration email
-        send_mail(
+        enqueue_email(
             subject='Password Expired - FlowCounts',
             message=(
                 f'Hello {user.first_name or user.username},\n\n'
@@ -97,7 +98,7 @@ def send_password_expired_email(user):
         )
         
         # Log the expiration event
-        EventLog.objects.create(
+        record_event(
             action='PASSWORD_EXPIRED',
             actor=None,
             target_user=user,
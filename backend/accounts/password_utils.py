@@ -3,10 +3,11 @@ Utility functions for password management, expiration, and history.
 """
 from django.utils import timezone
 from django.conf import settings
-from django.core.mail import send_mail
 from datetime import timedelta
 import logging
 
+from .email_outbox import enqueue_email
+
 logger = logging.getLogger(__name__)
 
 
@@ -137,7 +138,7 @@ def check_and_send_expiration_reminder(user):
                 f"Best regards,\nFlowCounts Team"
             )
         
-        send_mail(
+        enqueue_email(
             subject,
             body,
             settings.DEFAULT_FROM_EMAIL,
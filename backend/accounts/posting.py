@@ -0,0 +1,273 @@
+"""
+Posting service that applies approved journal entries to account balances.
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, OuterRef, QuerySet, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .cache_utils import bump_ledger_version
+from .ledger_utils import invalidate_snapshots, signed_amount, take_balance_snapshot
+from .models import AccountBalanceDelta, ChartOfAccounts, JournalEntry, JournalEntryLine
+
+ZERO = Decimal('0.00')
+
+
+class PostingError(Exception):
+    """Raised when a journal entry cannot be posted. Carries an ErrorMessage code."""
+
+    def __init__(self, error_code: str, entry: JournalEntry = None):
+        self.error_code = error_code
+        self.entry = entry
+        super().__init__(error_code)
+
+
+def account_deltas(entry_ids: Iterable[int]) -> List[dict]:
+    """Return per-account debit/credit/balance deltas for the lines of ``entry_ids``."""
+    totals = (
+        JournalEntryLine.objects.filter(journal_entry_id__in=list(entry_ids))
+        .values('account_id', 'account__normal_side')
+        .annotate(total_debit=Sum('debit'), total_credit=Sum('credit'))
+        .order_by('account_id')
+    )
+    return [
+        {
+            'account_id': row['account_id'],
+            'debit': row['total_debit'] or ZERO,
+            'credit': row['total_credit'] or ZERO,
+            'balance': signed_amount(row['account__normal_side'], row['total_debit'] or ZERO, row['total_credit'] or ZERO),
+        }
+        for row in totals
+    ]
+
+
+def _delta_case(deltas: List[dict], key: str) -> Case:
+    return Case(
+        *[When(pk=delta['account_id'], then=Value(delta[key])) for delta in deltas],
+        default=Value(ZERO),
+        output_field=DecimalField(max_digits=15, decimal_places=2),
+    )
+
+
+def _update_account_totals(deltas: List[dict]):
+    """Add ``deltas`` to the stored account totals in a single UPDATE."""
+    ChartOfAccounts.objects.filter(pk__in=[delta['account_id'] for delta in deltas]).update(
+        debit=F('debit') + _delta_case(deltas, 'debit'),
+        credit=F('credit') + _delta_case(deltas, 'credit'),
+        balance=F('balance') + _delta_case(deltas, 'balance'),
+    )
+
+
+def apply_balance_deltas(entry_ids: Iterable[int]) -> List[int]:
+    """
+    Add the lines of ``entry_ids`` to account debit/credit/balance totals.
+
+    All accounts are updated by a single UPDATE with F() expressions, so
+    concurrent postings to the same account never lose each other's writes.
+    With LEDGER_DEFERRED_BALANCES enabled the deltas are appended to
+    AccountBalanceDelta instead, so approvals never wait on a hot account row.
+    Must be called inside a transaction. Returns the affected account IDs.
+    """
+    entry_ids = list(entry_ids)
+    deltas = account_deltas(entry_ids)
+    if not deltas:
+        return []
+    if getattr(settings, 'LEDGER_DEFERRED_BALANCES', False):
+        AccountBalanceDelta.objects.bulk_create([
+            AccountBalanceDelta(
+                account_id=delta['account_id'],
+                journal_entry_id=entry_ids[0] if len(entry_ids) == 1 else None,
+                debit=delta['debit'],
+                credit=delta['credit'],
+                balance=delta['balance'],
+            )
+            for delta in deltas
+        ])
+    else:
+        _update_account_totals(deltas)
+    return [delta['account_id'] for delta in deltas]
+
+
+def pending_balance_deltas(account_ids: Iterable[int] = None) -> Dict[int, dict]:
+    """Return debit/credit/balance totals not yet folded into each account."""
+    pending = AccountBalanceDelta.objects.all()
+    if account_ids is not None:
+        pending = pending.filter(account_id__in=list(account_ids))
+    totals = pending.values('account_id').annotate(
+        total_debit=Sum('debit'), total_credit=Sum('credit'), total_balance=Sum('balance')
+    )
+    return {
+        row['account_id']: {
+            'debit': row['total_debit'],
+            'credit': row['total_credit'],
+            'balance': row['total_balance'],
+        }
+        for row in totals
+    }
+
+
+def with_pending_balances(queryset: QuerySet) -> QuerySet:
+    """Annotate accounts with ``pending_debit``/``pending_credit``/``pending_balance`` delta totals."""
+    annotations = {}
+    for field in ('debit', 'credit', 'balance'):
+        pending = (
+            AccountBalanceDelta.objects.filter(account=OuterRef('pk'))
+            .values('account')
+            .annotate(total=Sum(field))
+            .values('total')
+        )
+        annotations[f'pending_{field}'] = Coalesce(
+            Subquery(pending, output_field=DecimalField(max_digits=15, decimal_places=2)),
+            Value(ZERO),
+            output_field=DecimalField(max_digits=15, decimal_places=2),
+        )
+    return queryset.annotate(**annotations)
+
+
+def compact_balance_deltas(batch_size: int = 5000) -> int:
+    """
+    Fold pending AccountBalanceDelta rows into ChartOfAccounts totals.
+    Each batch is locked, aggregated, applied and deleted in one transaction.
+    Returns the number of delta rows folded.
+    """
+    folded = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                AccountBalanceDelta.objects.select_for_update(skip_locked=True)
+                .order_by('id')
+                .values_list('id', 'account_id', 'debit', 'credit', 'balance')[:batch_size]
+            )
+            if not rows:
+                return folded
+            
+            totals = {}
+            for _, account_id, debit, credit, balance in rows:
+                total = totals.setdefault(account_id, {'account_id': account_id, 'debit': ZERO, 'credit': ZERO, 'balance': ZERO})
+                total['debit'] += debit
+                total['credit'] += credit
+                total['balance'] += balance
+            
+            _update_account_totals(sorted(totals.values(), key=lambda total: total['account_id']))
+            AccountBalanceDelta.objects.filter(id__in=[row[0] for row in rows]).delete()
+            bump_ledger_version()
+            folded += len(rows)
+        if len(rows) < batch_size:
+            return folded
+
+
+def _after_posting(entries: List[JournalEntry], user=None):
+    """Keep balance snapshots and cached statements consistent with newly posted entries."""
+    if not entries:
+        return
+    bump_ledger_version()
+    invalidate_snapshots(min(entry.entry_date for entry in entries))
+    for entry in entries:
+        if entry.entry_type == 'CLOSING':
+            take_balance_snapshot(entry.entry_date, user=user)
+
+
+def post_approved_entry(entry: JournalEntry, user=None) -> List[int]:
+    """Apply an entry that was created already approved (e.g. by a manager)."""
+    with transaction.atomic():
+        account_ids = apply_balance_deltas([entry.id])
+        _after_posting([entry], user=user)
+    return account_ids
+
+
+def post_journal_entry(entry_id: int, reviewer) -> JournalEntry:
+    """
+    Approve a pending journal entry and apply it to account balances.
+
+    The entry row is locked with SELECT ... FOR UPDATE so two reviewers
+    approving at the same time cannot both post it.
+    """
+    with transaction.atomic():
+        entry = JournalEntry.objects.select_for_update().get(pk=entry_id)
+        if entry.status != 'PENDING':
+            raise PostingError('JOURNAL_APPROVE_NOT_PENDING', entry)
+
+        entry.status = 'APPROVED'
+        entry.reviewed_by = reviewer
+        entry.reviewed_at = timezone.now()
+        entry.save(update_fields=['status', 'reviewed_by', 'reviewed_at'])
+
+        apply_balance_deltas([entry.id])
+        _after_posting([entry], user=reviewer)
+    return entry
+
+
+def _lock_entries(entry_ids: Iterable[int]):
+    """Lock the requested entries and split them into pending entries and per-ID failures."""
+    entry_ids = list(dict.fromkeys(entry_ids))
+    entries = {
+        entry.id: entry
+        for entry in JournalEntry.objects.select_for_update().filter(pk__in=entry_ids).order_by('pk')
+    }
+    pending, failures = [], {}
+    for entry_id in entry_ids:
+        entry = entries.get(entry_id)
+        if entry is None:
+            failures[entry_id] = 'JOURNAL_ENTRY_NOT_FOUND'
+        elif entry.status != 'PENDING':
+            failures[entry_id] = None
+        else:
+            pending.append(entry)
+    return pending, failures
+
+
+def post_journal_entries(entry_ids: Iterable[int], reviewer):
+    """
+    Approve many pending journal entries in one transaction.
+
+    Entries are locked, moved to APPROVED with a single UPDATE, and their
+    lines are applied to account balances as one aggregated per-account update.
+    Returns ``(approved_entries, failures)`` where ``failures`` maps entry ID
+    to an ErrorMessage code.
+    """
+    with transaction.atomic():
+        pending, failures = _lock_entries(entry_ids)
+        failures = {
+            entry_id: code or 'JOURNAL_APPROVE_NOT_PENDING'
+            for entry_id, code in failures.items()
+        }
+        if pending:
+            now = timezone.now()
+            JournalEntry.objects.filter(pk__in=[entry.id for entry in pending]).update(
+                status='APPROVED', reviewed_by=reviewer, reviewed_at=now
+            )
+            for entry in pending:
+                entry.status = 'APPROVED'
+                entry.reviewed_by = reviewer
+                entry.reviewed_at = now
+            apply_balance_deltas([entry.id for entry in pending])
+            _after_posting(pending, user=reviewer)
+    return pending, failures
+
+
+def reject_journal_entries(entry_ids: Iterable[int], reviewer, rejection_reason: str):
+    """
+    Reject many pending journal entries with a single UPDATE.
+    Returns ``(rejected_entries, failures)`` like ``post_journal_entries``.
+    """
+    with transaction.atomic():
+        pending, failures = _lock_entries(entry_ids)
+        failures = {
+            entry_id: code or 'JOURNAL_REJECT_NOT_PENDING'
+            for entry_id, code in failures.items()
+        }
+        if pending:
+            now = timezone.now()
+            JournalEntry.objects.filter(pk__in=[entry.id for entry in pending]).update(
+                status='REJECTED', reviewed_by=reviewer, reviewed_at=now, rejection_reason=rejection_reason
+            )
+            for entry in pending:
+                entry.status = 'REJECTED'
+                entry.reviewed_by = reviewer
+                entry.reviewed_at = now
+                entry.rejection_reason = rejection_reason
+    return pending, failures
@@ -0,0 +1,157 @@
+"""
+Incremental reconciliation of stored account totals against posted journal lines.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from typing import Iterable, List
+
+from django.db import transaction
+from django.db.models import DecimalField, F, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .audit_sink import record_event
+from .cache_utils import bump_ledger_version
+from .ledger_utils import ZERO, signed_amount
+from .models import ChartOfAccounts, JournalEntry, JournalEntryLine, ReconciliationCheckpoint
+from .posting import with_pending_balances
+
+# Entries approved shortly before the previous run may have committed after it read the mark
+RECONCILE_OVERLAP = timedelta(minutes=5)
+
+
+def _totals_dict(debit, credit, balance) -> dict:
+    return {'debit': str(debit), 'credit': str(credit), 'balance': str(balance)}
+
+
+def _posted_total(field: str) -> Coalesce:
+    amount = DecimalField(max_digits=15, decimal_places=2)
+    lines = (
+        JournalEntryLine.objects.filter(account=OuterRef('pk'), journal_entry__status='APPROVED')
+        .values('account')
+        .annotate(total=Sum(field))
+        .values('total')
+    )
+    return Coalesce(Subquery(lines, output_field=amount), Value(ZERO), output_field=amount)
+
+
+def find_balance_drift(account_ids: Iterable[int]) -> List[dict]:
+    """
+    Compare stored totals (plus pending deltas) of ``account_ids`` with totals
+    recomputed from approved journal lines. Returns one report row per drifted account.
+
+    Must run inside a transaction. The account rows are locked in ID order (as
+    postings lock them) so no approval can change them until the caller commits,
+    and stored, pending and posted totals are read by one statement so deferred
+    postings committing meanwhile cannot make them disagree.
+    """
+    account_ids = list(account_ids)
+    list(ChartOfAccounts.objects.select_for_update().filter(id__in=account_ids).order_by('id').values_list('id'))
+    accounts = with_pending_balances(
+        ChartOfAccounts.objects.filter(id__in=account_ids).order_by('account_number')
+    ).annotate(posted_debit=_posted_total('debit'), posted_credit=_posted_total('credit'))
+
+    drift = []
+    for account in accounts:
+        debit, credit = account.posted_debit, account.posted_credit
+        expected = (debit, credit, account.initial_balance + signed_amount(account.normal_side, debit, credit))
+        deltas = {
+            'debit': account.pending_debit,
+            'credit': account.pending_credit,
+            'balance': account.pending_balance,
+        }
+        stored = (
+            account.debit + deltas['debit'],
+            account.credit + deltas['credit'],
+            account.balance + deltas['balance'],
+        )
+        if stored != expected:
+            drift.append({
+                'account_id': account.id,
+                'account_number': account.account_number,
+                'account_name': account.account_name,
+                'stored': _totals_dict(*stored),
+                'expected': _totals_dict(*expected),
+                'pending': _totals_dict(*(deltas[field] for field in ('debit', 'credit', 'balance'))),
+            })
+    return drift
+
+
+def repair_balance_drift(drift: List[dict]):
+    """
+    Add the difference between expected and observed totals to the stored
+    totals with F() expressions, so the repair never overwrites a posting.
+    """
+    for row in drift:
+        ChartOfAccounts.objects.filter(pk=row['account_id']).update(**{
+            field: F(field) + (Decimal(row['expected'][field]) - Decimal(row['stored'][field]))
+            for field in ('debit', 'credit', 'balance')
+        })
+    bump_ledger_version()
+
+
+def reconcile_balances(name: str = 'balances', repair: bool = False, full: bool = False) -> dict:
+    """
+    Verify accounts touched by journal entries approved since the last checkpoint.
+
+    Entries are selected by ID above the stored high-water mark or by approval
+    time after it, so entries created earlier but approved later are included.
+    Drift is written to EventLog as a LEDGER_RECONCILED event and, with
+    ``repair``, corrected in place. ``full`` ignores the checkpoint.
+    """
+    with transaction.atomic():
+        # Locking the checkpoint keeps overlapping cron runs from interleaving
+        checkpoint, _ = ReconciliationCheckpoint.objects.select_for_update().get_or_create(name=name)
+
+        entries = JournalEntry.objects.filter(status='APPROVED')
+        if not full and (checkpoint.last_entry_id or checkpoint.last_reviewed_at):
+            since = Q(id__gt=checkpoint.last_entry_id)
+            if checkpoint.last_reviewed_at:
+                since |= Q(reviewed_at__gt=checkpoint.last_reviewed_at - RECONCILE_OVERLAP)
+            entries = entries.filter(since)
+
+        marks = entries.aggregate(max_id=Max('id'), max_reviewed_at=Max('reviewed_at'))
+        account_ids = list(
+            JournalEntryLine.objects.filter(journal_entry__in=entries)
+            .values_list('account_id', flat=True)
+            .distinct()
+            .order_by()
+        )
+        drift = find_balance_drift(account_ids) if account_ids else []
+
+        if drift and repair:
+            repair_balance_drift(drift)
+
+        if drift:
+            record_event(
+                action='LEDGER_RECONCILED',
+                details=(
+                    f"Balance reconciliation found {len(drift)} drifted account(s) out of {len(account_ids)} checked"
+                    + (" and repaired them" if repair else "")
+                ),
+                after_image={
+                    'checkpoint': name,
+                    'from_entry_id': checkpoint.last_entry_id,
+                    'to_entry_id': max(checkpoint.last_entry_id, marks['max_id'] or 0),
+                    'repaired': repair,
+                    'drift': drift,
+                },
+                record_type='ReconciliationCheckpoint',
+                record_id=checkpoint.id,
+            )
+
+        checkpoint.last_entry_id = max(checkpoint.last_entry_id, marks['max_id'] or 0)
+        if marks['max_reviewed_at'] and (
+            checkpoint.last_reviewed_at is None or marks['max_reviewed_at'] > checkpoint.last_reviewed_at
+        ):
+            checkpoint.last_reviewed_at = marks['max_reviewed_at']
+        checkpoint.last_run_at = timezone.now()
+        checkpoint.accounts_checked = len(account_ids)
+        checkpoint.drift_count = len(drift)
+        checkpoint.save()
+
+    return {
+        'accounts_checked': len(account_ids),
+        'drift': drift,
+        'last_entry_id': checkpoint.last_entry_id,
+    }
@@ -1,12 +1,98 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 from rest_framework import serializers
-from .models import RegistrationRequest, User, EventLog, ErrorMessage, ErrorLog, ChartOfAccounts, JournalEntry, JournalEntryLine, JournalEntryAttachment
+from .audit_images import reconstruct_images
+from .models import RegistrationRequest, User, EventLog, ErrorMessage, ErrorLog, ChartOfAccounts, JournalEntry, JournalEntryLine, JournalEntryAttachment, NotificationPreference
+from .posting import post_approved_entry
 import re
 
 User = get_user_model()
 
 
+def requested_fields(request):
+    """
+    Return ``(fields, omit)`` from the ``?fields=`` and ``?omit=`` query parameters.
+    ``fields`` is None when the client did not restrict the field list.
+    """
+    if request is None or request.method != 'GET':
+        return None, set()
+    params = request.query_params
+    fields = {name.strip() for name in params.get('fields', '').split(',') if name.strip()} or None
+    omit = {name.strip() for name in params.get('omit', '').split(',') if name.strip()}
+    return fields, omit
+
+
+def field_requested(request, *names) -> bool:
+    """Return True if any of ``names`` will be present in the response for ``request``."""
+    fields, omit = requested_fields(request)
+    return any((fields is None or name in fields) and name not in omit for name in names)
+
+
+def select_requested(queryset, request, relations):
+    """
+    ``select_related`` only the relations whose response fields were requested.
+    ``relations`` maps a relation name to the field names that read it.
+    """
+    related = [relation for relation, names in relations.items() if field_requested(request, *names)]
+    return queryset.select_related(*related) if related else queryset
+
+
+def defer_omitted(queryset, request, *names):
+    """Skip loading large model columns that will not be in the response."""
+    omitted = [name for name in names if not field_requested(request, name)]
+    return queryset.defer(*omitted) if omitted else queryset
+
+
+ROLE_HANDLE_BASE = {
+    'ADMIN': 'adminUser',
+    'MANAGER': 'managerUser',
+    'ACCOUNTANT': 'accountantUser',
+}
+
+
+def role_ordinals(context) -> dict:
+    """
+    Return ``{user_id: position}`` where position is the user's 1-based rank
+    by ID within their role, computed with one ROW_NUMBER() query and cached
+    in the serializer context so a whole response shares it.
+    """
+    ordinals = context.get('_role_ordinals')
+    if ordinals is None:
+        ordinals = dict(
+            User.objects.annotate(
+                ordinal=Window(RowNumber(), partition_by=[F('role')], order_by=F('id').asc())
+            ).values_list('id', 'ordinal')
+        )
+        context['_role_ordinals'] = ordinals
+    return ordinals
+
+
+def display_username(user, context):
+    """Return the role-numbered display name (e.g. ``managerUser2``) for ``user``."""
+    if not user:
+        return None
+    base = ROLE_HANDLE_BASE.get(user.role, 'user')
+    return f"{base}{role_ordinals(context).get(user.id, 0)}"
+
+
+class DynamicFieldsMixin:
+    """
+    Let clients choose response fields with ``?fields=a,b`` or ``?omit=c``.
+    Only applies to GET requests on the top-level serializer, so nested
+    serializers and writes keep their full field set.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, omit = requested_fields(self.context.get('request'))
+        for name in list(self.fields):
+            if (fields is not None and name not in fields) or name in omit:
+                self.fields.pop(name)
+
+
 class UserLiteSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -23,7 +109,7 @@ class UserLiteSerializer(serializers.ModelSerializer):
 
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     profile_image_url = serializers.SerializerMethodField()
     suspended_now = serializers.SerializerMethodField()
     display_handle = serializers.SerializerMethodField()
@@ -60,19 +146,7 @@ class UserSerializer(serializers.ModelSerializer):
 
     def get_display_handle(self, obj):
         # Generate numbered username based on role
-        role_base = {
-            'ADMIN': 'adminUser',
-            'MANAGER': 'managerUser',
-            'ACCOUNTANT': 'accountantUser',
-        }
-        
-        base = role_base.get(obj.role, 'user')
-        
-        # Get all users with same role ordered by ID, and find this user's position
-        users_with_same_role = User.objects.filter(role=obj.role).order_by('id')
-        position = list(users_with_same_role.values_list('id', flat=True)).index(obj.id) + 1
-        
-        return f"{base}{position}"
+        return display_username(obj, self.context)
 
 
 
@@ -166,9 +240,25 @@ class CreateUserSerializer(serializers.ModelSerializer):
         return user
 
 
-class EventLogSerializer(serializers.ModelSerializer):
+def event_images(context, event) -> tuple:
+    """
+    Return the full ``(before_image, after_image)`` of ``event``. Images of every
+    event in the response are rebuilt together and cached in the serializer context.
+    """
+    images = context.setdefault('_event_images', {})
+    if event.id not in images:
+        events = context.get('_image_events') or [event]
+        if event not in events:
+            events = [event]
+        images.update(reconstruct_images(events))
+    return images[event.id]
+
+
+class EventLogSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     actor_username = serializers.SerializerMethodField()
     target_username = serializers.SerializerMethodField()
+    before_image = serializers.SerializerMethodField()
+    after_image = serializers.SerializerMethodField()
 
     class Meta:
         model = EventLog
@@ -193,6 +283,17 @@ class EventLogSerializer(serializers.ModelSerializer):
     def get_target_username(self, obj):
         return getattr(obj.target_user, "username", None)
 
+    def _images(self, obj):
+        if self.parent is not None and '_image_events' not in self.context:
+            self.context['_image_events'] = list(self.parent.instance)
+        return event_images(self.context, obj)
+
+    def get_before_image(self, obj):
+        return self._images(obj)[0]
+
+    def get_after_image(self, obj):
+        return self._images(obj)[1]
+
 
 class ErrorMessageSerializer(serializers.ModelSerializer):
     class Meta:
@@ -211,7 +312,7 @@ class ErrorMessageSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class ErrorLogSerializer(serializers.ModelSerializer):
+class ErrorLogSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user_username = serializers.SerializerMethodField()
     resolved_by_username = serializers.SerializerMethodField()
     
@@ -235,8 +336,13 @@ class ErrorLogSerializer(serializers.ModelSerializer):
             'resolved_by',
             'resolved_by_username',
             'created_at',
+            'fingerprint',
+            'occurrence_count',
+            'first_seen_at',
+            'last_seen_at',
+            'sample_of',
         ]
-        read_only_fields = ['created_at', 'resolved_at']
+        read_only_fields = ['created_at', 'resolved_at', 'fingerprint', 'occurrence_count', 'first_seen_at', 'last_seen_at', 'sample_of']
     
     def get_user_username(self, obj):
         return getattr(obj.user, "username", None) if obj.user else None
@@ -245,7 +351,7 @@ class ErrorLogSerializer(serializers.ModelSerializer):
         return getattr(obj.resolved_by, "username", None) if obj.resolved_by else None
 
 
-class ChartOfAccountsSerializer(serializers.ModelSerializer):
+class ChartOfAccountsSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     created_by_username = serializers.SerializerMethodField()
     updated_by_username = serializers.SerializerMethodField()
     closed_by_username = serializers.SerializerMethodField()
@@ -289,22 +395,7 @@ class ChartOfAccountsSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'created_by', 'updated_at', 'updated_by', 'closed_at', 'closed_by', 'can_deactivate', 'can_be_closed']
     
     def _get_display_username(self, user):
-        if not user:
-            return None
-        
-        role_base = {
-            'ADMIN': 'adminUser',
-            'MANAGER': 'managerUser',
-            'ACCOUNTANT': 'accountantUser',
-        }
-        
-        base = role_base.get(user.role, 'user')
-        
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        count = User.objects.filter(role=user.role, id__lte=user.id).count()
-        
-        return f"{base}{count}"
+        return display_username(user, self.context)
     
     def get_created_by_username(self, obj):
         return self._get_display_username(obj.created_by)
@@ -318,6 +409,17 @@ class ChartOfAccountsSerializer(serializers.ModelSerializer):
     def get_can_deactivate(self, obj):
         return obj.can_deactivate()
     
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Report stored totals plus any balance deltas not yet compacted
+        if getattr(instance, 'pending_balance', None) is not None:
+            for field in ('debit', 'credit', 'balance'):
+                if field not in data:
+                    continue
+                total = getattr(instance, field) + getattr(instance, f'pending_{field}')
+                data[field] = self.fields[field].to_representation(total)
+        return data
+    
     def get_can_be_closed(self, obj):
         return obj.can_be_closed()
     
@@ -353,7 +455,7 @@ class ChartOfAccountsSerializer(serializers.ModelSerializer):
                 })
         
         if self.instance and 'is_active' in data:
-            if not data['is_active'] and self.instance.balance != 0:
+            if not data['is_active'] and self.instance.current_balance() != 0:
                 raise serializers.ValidationError({
                     'is_active': 'Cannot deactivate an account with a non-zero balance.'
                 })
@@ -440,7 +542,61 @@ class JournalEntryAttachmentSerializer(serializers.ModelSerializer):
         return None
 
 
-class JournalEntrySerializer(serializers.ModelSerializer):
+class JournalEntryListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Compact journal entry representation for list views. Totals come from
+    ``with_line_totals`` annotations; nested lines are only included when the
+    view passes ``include_lines`` in the serializer context.
+    """
+    lines = JournalEntryLineSerializer(many=True, read_only=True)
+    created_by_username = serializers.CharField(source='created_by.username', read_only=True)
+    reviewed_by_username = serializers.CharField(source='reviewed_by.username', read_only=True)
+    total_debits = serializers.SerializerMethodField()
+    total_credits = serializers.SerializerMethodField()
+    is_balanced = serializers.SerializerMethodField()
+    line_count = serializers.IntegerField(read_only=True)
+    attachment_count = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = JournalEntry
+        fields = [
+            'id',
+            'entry_date',
+            'entry_type',
+            'description',
+            'status',
+            'created_by',
+            'created_by_username',
+            'created_at',
+            'reviewed_by',
+            'reviewed_by_username',
+            'reviewed_at',
+            'rejection_reason',
+            'lines',
+            'total_debits',
+            'total_credits',
+            'is_balanced',
+            'line_count',
+            'attachment_count',
+        ]
+        read_only_fields = fields
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get('include_lines'):
+            self.fields.pop('lines', None)
+    
+    def get_total_debits(self, obj):
+        return float(obj.sum_debit)
+    
+    def get_total_credits(self, obj):
+        return float(obj.sum_credit)
+    
+    def get_is_balanced(self, obj):
+        return obj.sum_debit == obj.sum_credit
+
+
+class JournalEntrySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     lines = JournalEntryLineSerializer(many=True)
     attachments = JournalEntryAttachmentSerializer(many=True, read_only=True)
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
@@ -532,10 +688,14 @@ class JournalEntrySerializer(serializers.ModelSerializer):
             else:
                 validated_data['status'] = 'PENDING'
         
-        journal_entry = JournalEntry.objects.create(**validated_data)
-        
-        for line_data in lines_data:
-            JournalEntryLine.objects.create(journal_entry=journal_entry, **line_data)
+        with transaction.atomic():
+            journal_entry = JournalEntry.objects.create(**validated_data)
+            
+            for line_data in lines_data:
+                JournalEntryLine.objects.create(journal_entry=journal_entry, **line_data)
+            
+            if journal_entry.status == 'APPROVED':
+                post_approved_entry(journal_entry, user=journal_entry.reviewed_by)
         
         return journal_entry
     
@@ -552,3 +712,10 @@ class JournalEntrySerializer(serializers.ModelSerializer):
                 JournalEntryLine.objects.create(journal_entry=instance, **line_data)
         
         return instance
+
+
+class NotificationPreferenceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = NotificationPreference
+        fields = ['journal_mode', 'updated_at']
+        read_only_fields = ['updated_at']
@@ -2,11 +2,14 @@ from datetime import timedelta
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.signals import user_logged_in, user_login_failed
-from django.db.models.signals import pre_save, post_save
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from django.contrib.auth.hashers import check_password
-from .models import PasswordHistory
+from .cache_utils import bump_ledger_version
+from .error_utils import invalidate_error_messages
+from .models import ChartOfAccounts, ErrorMessage, JournalEntry, PasswordHistory
 
 User = get_user_model()
 
@@ -57,3 +60,20 @@ def on_login_success(sender, user: User, request, **kwargs):
     if user.failed_attempts:
         user.failed_attempts = 0
         user.save(update_fields=["failed_attempts"])
+
+@receiver(post_save, sender=ChartOfAccounts)
+@receiver(post_delete, sender=ChartOfAccounts)
+def on_account_changed(sender, instance, **kwargs):
+    # Account edits, activation and closing all change financial statements
+    bump_ledger_version()
+
+@receiver(post_delete, sender=JournalEntry)
+def on_journal_entry_deleted(sender, instance, **kwargs):
+    if instance.status == 'APPROVED':
+        bump_ledger_version()
+
+@receiver(post_save, sender=ErrorMessage)
+@receiver(post_delete, sender=ErrorMessage)
+def on_error_message_changed(sender, instance, **kwargs):
+    # Reload only after the change is visible to other connections
+    transaction.on_commit(invalidate_error_messages)
@@ -1,3 +1,98 @@
-from django.test import TestCase
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 
-# Create your tests here.
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import ChartOfAccounts, JournalEntry, JournalEntryLine, User
+from .posting import PostingError, compact_balance_deltas, post_journal_entry
+
+
+class ConcurrentPostingTests(TransactionTestCase):
+    """Approve the same pending entries from several threads at once."""
+
+    ENTRIES = 20
+    THREADS = 8
+    AMOUNT = Decimal('1.00')
+
+    def setUp(self):
+        self.reviewer = User.objects.create_user(
+            username='manager', email='manager@example.com', password='x', role='MANAGER'
+        )
+        self.cash = self._account('101', 'Cash', 'DEBIT', 'ASSET', 'BS', Decimal('100.00'))
+        self.revenue = self._account('401', 'Service Revenue', 'CREDIT', 'REVENUE', 'IS', Decimal('0.00'))
+        self.entry_ids = []
+        for i in range(self.ENTRIES):
+            entry = JournalEntry.objects.create(
+                entry_date=timezone.localdate(),
+                description=f'Concurrent posting {i + 1}',
+                status='PENDING',
+                created_by=self.reviewer,
+            )
+            JournalEntryLine.objects.bulk_create([
+                JournalEntryLine(journal_entry=entry, account=self.cash, debit=self.AMOUNT, order=0),
+                JournalEntryLine(journal_entry=entry, account=self.revenue, credit=self.AMOUNT, order=1),
+            ])
+            self.entry_ids.append(entry.id)
+
+    def _account(self, number, name, normal_side, category, statement, initial_balance):
+        return ChartOfAccounts.objects.create(
+            account_number=number,
+            account_name=name,
+            account_description=name,
+            normal_side=normal_side,
+            account_category=category,
+            account_subcategory='Current',
+            initial_balance=initial_balance,
+            balance=initial_balance,
+            order=int(number),
+            statement=statement,
+        )
+
+    def _approve_concurrently(self):
+        lock = threading.Lock()
+        results = {'posted': [], 'refused': [], 'errors': []}
+
+        def approve(entry_id):
+            try:
+                post_journal_entry(entry_id, self.reviewer)
+                outcome = 'posted'
+            except PostingError:
+                outcome = 'refused'
+            except Exception as e:
+                outcome = 'errors'
+                entry_id = f'{entry_id}: {e}'
+            finally:
+                connection.close()
+            with lock:
+                results[outcome].append(entry_id)
+
+        # Every entry is approved twice so the entry row lock is exercised too
+        with ThreadPoolExecutor(max_workers=self.THREADS) as pool:
+            list(pool.map(approve, self.entry_ids + self.entry_ids))
+        return results
+
+    def _assert_posted_once(self, results):
+        self.assertEqual(results['errors'], [])
+        self.assertCountEqual(results['posted'], self.entry_ids)
+        self.assertCountEqual(results['refused'], self.entry_ids)
+        self.assertEqual(
+            JournalEntry.objects.filter(id__in=self.entry_ids, status='APPROVED').count(), self.ENTRIES
+        )
+
+        total = self.AMOUNT * self.ENTRIES
+        self.cash.refresh_from_db()
+        self.revenue.refresh_from_db()
+        self.assertEqual((self.cash.debit, self.cash.credit, self.cash.balance), (total, Decimal('0.00'), Decimal('100.00') + total))
+        self.assertEqual((self.revenue.debit, self.revenue.credit, self.revenue.balance), (Decimal('0.00'), total, total))
+
+    def test_concurrent_approvals_post_each_entry_once(self):
+        self._assert_posted_once(self._approve_concurrently())
+
+    @override_settings(LEDGER_DEFERRED_BALANCES=True)
+    def test_concurrent_approvals_with_deferred_balances(self):
+        results = self._approve_concurrently()
+        compact_balance_deltas()
+        self._assert_posted_once(results)
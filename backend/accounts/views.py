@@ -3,7 +3,7 @@ from django.utils.dateparse import parse_date
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from django.db import transaction
-from django.db.models import Q, Sum
+from django.db.models import Count, F, Q, Sum
 from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth import get_user_model
@@ -27,8 +27,21 @@ import time
 from django.core.mail import send_mail
 import logging, secrets, string
 
-from .models import RegistrationRequest, EventLog, PasswordHistory, ChartOfAccounts, JournalEntry, JournalEntryLine, JournalEntryAttachment
+from .models import RegistrationRequest, EventLog, PasswordHistory, ChartOfAccounts, JournalEntry, JournalEntryLine, JournalEntryAttachment, AccountBalanceSnapshot, NotificationPreference
+from .archiving import iter_archived_rows
+from .audit_images import reconstruct_images
+from .audit_sink import record_event, record_events
+from .cache_utils import cached_statement
+from .email_outbox import enqueue_email
 from .error_utils import log_error, DatabaseErrorResponse, get_error_message
+from .notifications import notify_journal_event
+from .ledger_utils import (
+    LEDGER_ORDER, account_ledger_lines, accounts_as_of, iter_running_balance, ledger_key,
+    parse_report_date, period_activity, with_line_totals,
+)
+from .exports import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, streaming_export
+from .pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_filter, parse_limit, parse_offset, wants_pagination
+from .posting import PostingError, post_journal_entry, post_journal_entries, reject_journal_entries, with_pending_balances
 from .serializers import (
     UserSerializer,
     UserLiteSerializer,
@@ -37,7 +50,11 @@ from .serializers import (
     EventLogSerializer,
     ChartOfAccountsSerializer,
     JournalEntrySerializer,
+    JournalEntryListSerializer,
     JournalEntryAttachmentSerializer,
+    NotificationPreferenceSerializer,
+    field_requested,
+    select_requested,
 )
 from .permissions import IsAdmin, IsManagerOrAdmin
 from .password_utils import (
@@ -72,7 +89,7 @@ def send_suspension_emails(user, max_attempts):
                 "As an admin, you can reactivate your account by accessing the system through another admin account or contacting support.\n\n"
                 "FlowCounts Team"
             )
-            send_mail(
+            enqueue_email(
                 admin_subject,
                 admin_body,
                 settings.DEFAULT_FROM_EMAIL,
@@ -91,7 +108,7 @@ def send_suspension_emails(user, max_attempts):
                     "Please contact your administrator to reactivate your account.\n\n"
                     "FlowCounts Team"
                 )
-                send_mail(
+                enqueue_email(
                     user_subject,
                     user_body,
                     settings.DEFAULT_FROM_EMAIL,
@@ -111,7 +128,7 @@ def send_suspension_emails(user, max_attempts):
                     f"Time: {timezone.now()}\n\n"
                     "Please review and reactivate the account if needed."
                 )
-                send_mail(
+                enqueue_email(
                     admin_subject,
                     admin_body,
                     settings.DEFAULT_FROM_EMAIL,
@@ -144,7 +161,7 @@ def send_scheduled_suspension_emails(user, start_date, end_date):
                 "Please contact your administrator if you have questions.\n\n"
                 "FlowCounts Team"
             )
-            send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
+            enqueue_email(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
 
         # Notify admins
         admin_emails = getattr(settings, "ADMIN_NOTIFICATION_EMAILS", [])
@@ -163,7 +180,7 @@ def send_scheduled_suspension_emails(user, start_date, end_date):
                 f"{details_line}\n\n"
                 "This action was performed via the admin Users page."
             )
-            send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, admin_emails, fail_silently=False)
+            enqueue_email(subject, body, settings.DEFAULT_FROM_EMAIL, admin_emails, fail_silently=False)
     except Exception as e:
         logger.error(f"Failed to send scheduled suspension emails: {e}", exc_info=True)
 
@@ -274,7 +291,7 @@ class FlowTokenView(TokenObtainPairView):
                         'failed_attempts': user_obj.failed_attempts,
                     }
                     
-                    EventLog.objects.create(
+                    record_event(
                         action="USER_SUSPENDED",
                         actor=None,
                         target_user=user_obj,
@@ -428,7 +445,7 @@ class UserAdminViewSet(
             
             if changes:
                 details = f"User updated: {', '.join(changes)}"
-                EventLog.objects.create(
+                record_event(
                     action="USER_UPDATED",
                     actor=request.user,
                     target_user=updated_user,
@@ -442,7 +459,7 @@ class UserAdminViewSet(
                 if before_image['role'] != after_image['role']:
                     try:
                         if updated_user.email:
-                            send_mail(
+                            enqueue_email(
                                 "FlowCounts Role Updated",
                                 f"Hello {updated_user.first_name or updated_user.username},\n\n"
                                 f"Your role in FlowCounts has been updated by an administrator.\n\n"
@@ -460,7 +477,7 @@ class UserAdminViewSet(
                     try:
                         admin_emails = getattr(settings, "ADMIN_NOTIFICATION_EMAILS", [])
                         if admin_emails and request.user.email not in admin_emails:
-                            send_mail(
+                            enqueue_email(
                                 "FlowCounts: User Role Changed",
                                 f"A user's role has been changed.\n\n"
                                 f"User: {updated_user.username} ({updated_user.email})\n"
@@ -507,7 +524,7 @@ class UserAdminViewSet(
             save_password_to_history(created_user, created_user.password)
             created_user.save()
         try:
-            EventLog.objects.create(
+            record_event(
                 action="USER_CREATED",
                 actor=request.user if request.user.is_authenticated else None,
                 target_user=created_user,
@@ -520,7 +537,7 @@ class UserAdminViewSet(
             logger.warning("Failed to log USER_CREATED event", exc_info=True)
         try:
             if created_user and created_user.email:
-                send_mail(
+                enqueue_email(
                     "Welcome to FlowCounts - Action Required",
                     f"Hello {created_user.first_name or created_user.username},\n\n"
                     f"Your FlowCounts account has been created by an administrator.\n\n"
@@ -544,7 +561,7 @@ class UserAdminViewSet(
                 # Email to admin
                 admin_emails = getattr(settings, "ADMIN_NOTIFICATION_EMAILS", [])
                 if admin_emails:
-                    send_mail(
+                    enqueue_email(
                         "FlowCounts: New User Created",
                         f"A new user has been created in the system:\n\n"
                         f"User: {created_user.username} ({created_user.email})\n"
@@ -572,7 +589,7 @@ class UserAdminViewSet(
         user.failed_attempts = 0
         user.save(update_fields=["is_active", "suspend_from", "suspend_to", "failed_attempts"])
         after_image = self._user_to_dict(user)
-        EventLog.objects.create(
+        record_event(
             action="USER_ACTIVATED", 
             actor=request.user, 
             target_user=user, 
@@ -585,7 +602,7 @@ class UserAdminViewSet(
         
         try:
             if user.email:
-                send_mail(
+                enqueue_email(
                     "FlowCounts Account Activated",
                     f"Hello {user.first_name or user.username},\n\n"
                     f"Your FlowCounts account has been activated by an administrator.\n\n"
@@ -601,7 +618,7 @@ class UserAdminViewSet(
         try:
             admin_emails = getattr(settings, "ADMIN_NOTIFICATION_EMAILS", [])
             if admin_emails:
-                send_mail(
+                enqueue_email(
                     "FlowCounts: User Activated",
                     f"A user account has been activated.\n\n"
                     f"User: {user.username} ({user.email})\n"
@@ -625,7 +642,7 @@ class UserAdminViewSet(
         user.is_active = False
         user.save(update_fields=["is_active"])
         after_image = self._user_to_dict(user)
-        EventLog.objects.create(
+        record_event(
             action="USER_DEACTIVATED", 
             actor=request.user, 
             target_user=user, 
@@ -638,7 +655,7 @@ class UserAdminViewSet(
         
         try:
             if user.email:
-                send_mail(
+                enqueue_email(
                     "FlowCounts Account Deactivated",
                     f"Hello {user.first_name or user.username},\n\n"
                     f"Your FlowCounts account has been deactivated by an administrator.\n\n"
@@ -655,7 +672,7 @@ class UserAdminViewSet(
         try:
             admin_emails = getattr(settings, "ADMIN_NOTIFICATION_EMAILS", [])
             if admin_emails:
-                send_mail(
+                enqueue_email(
                     "FlowCounts: User Deactivated",
                     f"A user account has been deactivated.\n\n"
                     f"User: {user.username} ({user.email})\n"
@@ -688,7 +705,7 @@ class UserAdminViewSet(
             user.save(update_fields=["suspend_from", "suspend_to", "is_active", "failed_attempts"])
             after_image = self._user_to_dict(user)
 
-            EventLog.objects.create(
+            record_event(
                 action="USER_UNSUSPENDED", 
                 actor=request.user, 
                 target_user=user,
@@ -700,7 +717,7 @@ class UserAdminViewSet(
             )
             try:
                 if user.email:
-                    send_mail(
+                    enqueue_email(
                         "FlowCounts Account Unsuspended",
                         (
                             f"Hello {user.first_name or user.username},\n\n"
@@ -768,7 +785,7 @@ class UserAdminViewSet(
         else:
             details = "User suspension cleared"
         
-        EventLog.objects.create(
+        record_event(
             action="USER_SUSPENDED", 
             actor=request.user, 
             target_user=user,
@@ -839,7 +856,7 @@ class RegistrationRequestViewSet(viewsets.ModelViewSet):
                 f"If you did not submit this request, please disregard this email.\n\n"
                 f"FlowCounts Team"
             )
-            send_mail(
+            enqueue_email(
                 user_subject,
                 user_body,
                 settings.DEFAULT_FROM_EMAIL,
@@ -863,7 +880,7 @@ class RegistrationRequestViewSet(viewsets.ModelViewSet):
                     f"Address: {data.get('address', '')}\n\n"
                     "Please review it on the Admin → Users page."
                 )
-                send_mail(
+                enqueue_email(
                     admin_subject,
                     admin_body,
                     settings.DEFAULT_FROM_EMAIL,
@@ -986,12 +1003,12 @@ class RegistrationRequestViewSet(viewsets.ModelViewSet):
                 "3. Change your password immediately\n\n"
                 "FlowCounts Team"
             )
-            send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [req.email], fail_silently=False)
+            email_queued = bool(enqueue_email(subject, body, settings.DEFAULT_FROM_EMAIL, [req.email], fail_silently=False))
             
             # Notify admin
             admin_emails = getattr(settings, "ADMIN_NOTIFICATION_EMAILS", [])
             if admin_emails:
-                send_mail(
+                enqueue_email(
                     "FlowCounts: Registration Request Approved",
                     f"A registration request has been approved:\n\n"
                     f"User: {user.username} ({user.email})\n"
@@ -1005,7 +1022,7 @@ class RegistrationRequestViewSet(viewsets.ModelViewSet):
                 )
 
         try:
-            EventLog.objects.create(
+            record_event(
                 action="REQUEST_APPROVED", 
                 actor=request.user, 
                 target_user=user,
@@ -1017,7 +1034,7 @@ class RegistrationRequestViewSet(viewsets.ModelViewSet):
         except Exception:
             logger.warning("Failed to log REQUEST_APPROVED event", exc_info=True)
 
-        return Response({"detail": "Approved and user created", "user_id": user.id, "email_sent": True})
+        return Response({"detail": "Approved and user created", "user_id": user.id, "email_queued": email_queued})
 
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated, IsAdmin])
     def reject(self, request, pk=None):
@@ -1035,10 +1052,10 @@ class RegistrationRequestViewSet(viewsets.ModelViewSet):
                 "Your request for access to FlowCounts was not approved."
                 + (f"\nReason: {note}" if note else "")
             )
-            send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [req.email], fail_silently=False)
+            email_queued = bool(enqueue_email(subject, body, settings.DEFAULT_FROM_EMAIL, [req.email], fail_silently=False))
 
         try:
-            EventLog.objects.create(
+            record_event(
                 action="REQUEST_REJECTED",
                 actor=request.user,
                 target_user=None,
@@ -1049,7 +1066,24 @@ class RegistrationRequestViewSet(viewsets.ModelViewSet):
         except Exception:
             logger.warning("Failed to log REQUEST_REJECTED event", exc_info=True)
 
-        return Response({"detail": "Request rejected", "email_sent": True})
+        return Response({"detail": "Request rejected", "email_queued": email_queued})
+
+
+def visible_event_actions(user):
+    """Event actions ``user`` may see; None means every event."""
+    # Admins can see all events
+    if getattr(user, "role", "") == "ADMIN":
+        return None
+    
+    # Accountants and managers can see account and journal entry events
+    if getattr(user, "role", "") in ("ACCOUNTANT", "MANAGER"):
+        return {
+            code for code, _ in EventLog.ACTION_CHOICES
+            if code.startswith(("ACCOUNT_", "JOURNAL_ENTRY_"))
+        }
+    
+    # Default: no access
+    return set()
 
 
 class EventLogViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
@@ -1057,10 +1091,18 @@ class EventLogViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated]
     queryset = EventLog.objects.all().order_by("-created_at")
     serializer_class = EventLogSerializer
+    EVENT_PAGE_ORDER = ('-created_at', '-id')
     
     def get_queryset(self):
-        """Filter events based on user role and date range."""
+        """Filter events by role, date range, people, record and action list."""
         qs = super().get_queryset()
+        qs = select_requested(qs, self.request, {
+            'actor': ['actor_username'],
+            'target_user': ['target_username'],
+        })
+        # Either image may need the stored images and deltas of the whole chain
+        if not field_requested(self.request, 'before_image', 'after_image'):
+            qs = qs.defer('before_image', 'after_image', 'image_delta')
         user = self.request.user
         
         # Filter by date range
@@ -1077,26 +1119,118 @@ class EventLogViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
             except ValueError:
                 qs = qs.filter(created_at__lte=end_date)
         
-        # Admins can see all events
-        if getattr(user, "role", "") == "ADMIN":
-            return qs
-        
-        # Accountants can only see account-related and journal entry events
-        if getattr(user, "role", "") == "ACCOUNTANT":
-            return qs.filter(
-                Q(action__startswith="ACCOUNT_") | 
-                Q(action__startswith="JOURNAL_ENTRY_")
-            )
+        # Filter by people and affected record; IDs that are not numbers match nothing
+        for param, field in (('actor', 'actor_id'), ('target_user', 'target_user_id'), ('record_id', 'record_id')):
+            value = self.request.query_params.get(param)
+            if value:
+                qs = qs.filter(**{field: value}) if value.isdigit() else qs.none()
+        record_type = self.request.query_params.get('record_type')
+        if record_type:
+            qs = qs.filter(record_type=record_type)
+        
+        # Filter by action list (?action=A,B or repeated ?action=)
+        actions = self._requested_actions()
+        visible = visible_event_actions(user)
+        if visible is not None:
+            actions = visible if actions is None else actions & visible
+        if actions is not None:
+            # An IN list (unlike startswith ORs) can use the (action, created_at) index
+            qs = qs.filter(action__in=sorted(actions)) if actions else qs.none()
+        return qs
+    
+    def _requested_actions(self):
+        values = self.request.query_params.getlist('action')
+        actions = {action.strip() for value in values for action in value.split(',') if action.strip()}
+        return actions or None
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List events, newest first. Returns a plain list unless ``limit`` or
+        ``cursor`` is given, in which case pages are keyset-paginated on
+        (created_at, id) and returned as ``{results, next_cursor, has_more}``.
+        """
+        qs = self.filter_queryset(self.get_queryset())
+        if not wants_pagination(request):
+            return Response(self.get_serializer(qs, many=True).data)
         
-        # Managers can see account and journal entry events
-        if getattr(user, "role", "") == "MANAGER":
-            return qs.filter(
-                Q(action__startswith="ACCOUNT_") | 
-                Q(action__startswith="JOURNAL_ENTRY_")
-            )
+        limit = parse_limit(request)
+        qs = qs.order_by(*self.EVENT_PAGE_ORDER)
+        key_fields = [field.lstrip('-') for field in self.EVENT_PAGE_ORDER]
+        try:
+            after = decode_cursor(request.query_params.get('cursor'), len(key_fields))
+        except InvalidCursor:
+            return DatabaseErrorResponse.create_response('INVALID_CURSOR', status_code=400)
+        if after:
+            qs = qs.filter(keyset_filter(key_fields, after, 'lt'))
+        
+        page = list(qs[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+        last = page[-1] if page else None
+        return Response({
+            'results': self.get_serializer(page, many=True).data,
+            'next_cursor': encode_cursor([last.created_at, last.id]) if has_more else None,
+            'has_more': has_more,
+        })
+    
+    @action(detail=True, methods=['get'])
+    def images(self, request, pk=None):
+        """Rebuild the full before/after images of a delta-encoded event."""
+        event = self.get_object()
+        before_image, after_image = reconstruct_images([event])[event.id]
+        return Response({
+            'id': event.id,
+            'record_type': event.record_type,
+            'record_id': event.record_id,
+            'before_image': before_image,
+            'after_image': after_image,
+        })
+    
+    @action(detail=False, methods=['get'])
+    def archive(self, request):
+        """
+        Read events moved to archive files by the archive_logs command.
         
-        # Default: no access
-        return qs.none()
+        Requires ``start_date`` and ``end_date`` (YYYY-MM-DD, at most 366 days
+        apart). Optional ``action`` (list), ``record_type`` and ``record_id`` filters;
+        ``limit``/``offset`` page through the matches, newest first.
+        """
+        start = parse_report_date(request.query_params.get('start_date'))
+        end = parse_report_date(request.query_params.get('end_date'))
+        if start is None or end is None or end < start or (end - start).days > 366:
+            return DatabaseErrorResponse.create_response('EVENT_ARCHIVE_INVALID_RANGE', status_code=400)
+        
+        visible_actions = visible_event_actions(request.user)
+        actions = self._requested_actions()
+        record_type = request.query_params.get('record_type')
+        record_id = request.query_params.get('record_id')
+        limit = parse_limit(request)
+        offset = parse_offset(request)
+        
+        def visible(row):
+            if visible_actions is not None and row['action'] not in visible_actions:
+                return False
+            if actions and row['action'] not in actions:
+                return False
+            if record_type and row['record_type'] != record_type:
+                return False
+            if record_id and str(row['record_id']) != record_id:
+                return False
+            return True
+        
+        results = []
+        has_more = False
+        if visible_actions != set():
+            matches = (row for row in iter_archived_rows('EVENT', start, end) if visible(row))
+            for index, row in enumerate(matches):
+                if index < offset:
+                    continue
+                if len(results) == limit:
+                    has_more = True
+                    break
+                results.append(row)
+        
+        return Response({'results': results, 'has_more': has_more})
 
 
 
@@ -1251,7 +1385,6 @@ def check_password_expiration(request):
     from django.utils import timezone
     from datetime import timedelta
     from django.conf import settings
-    from django.core.mail import send_mail
     
     if not user.password_expires_at:
         return Response({"expires": False, "message": "Password expiration not set"})
@@ -1276,7 +1409,7 @@ def check_password_expiration(request):
                 f"2. Using the 'Forgot Password' feature on the login page\n\n"
                 f"Best regards,\nFlowCounts Team"
             )
-            send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
+            enqueue_email(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
         except Exception as e:
             logger.error(f"Failed to send password expiration warning to {user.email}: {e}")
         
@@ -1372,7 +1505,7 @@ def forgot_password(request):
     
     # Log the password reset event
     try:
-        EventLog.objects.create(
+        record_event(
             action="PASSWORD_RESET",
             actor=user,  # User resetting their own password
             target_user=user,
@@ -1383,7 +1516,7 @@ def forgot_password(request):
     
     try:
         if user.email:
-            send_mail(
+            enqueue_email(
                 "FlowCounts Password Reset Successful",
                 f"Hello {user.first_name or user.username},\n\n"
                 f"Your FlowCounts password has been successfully reset.\n\n"
@@ -1399,7 +1532,7 @@ def forgot_password(request):
     try:
         admin_emails = getattr(settings, "ADMIN_NOTIFICATION_EMAILS", [])
         if admin_emails:
-            send_mail(
+            enqueue_email(
                 "FlowCounts: Password Reset Alert",
                 f"A user has reset their password via security questions.\n\n"
                 f"User: {user.username} ({user.email})\n"
@@ -1464,7 +1597,7 @@ def change_password(request):
     
     # Log the password change event
     try:
-        EventLog.objects.create(
+        record_event(
             action="PASSWORD_CHANGED",
             actor=user,
             target_user=user,
@@ -1476,7 +1609,7 @@ def change_password(request):
     # Send confirmation email
     try:
         if user.email:
-            send_mail(
+            enqueue_email(
                 "FlowCounts: Password Changed Successfully",
                 f"Hello {user.first_name or user.username},\n\n"
                 f"Your password has been changed successfully.\n\n"
@@ -1499,6 +1632,28 @@ def me(request):
     return Response(UserSerializer(request.user).data)
 
 
+@api_view(["GET", "PUT", "PATCH"])
+@permission_classes([IsAuthenticated])
+def notification_preferences(request):
+    """
+    Read or update the current user's journal entry notification mode:
+    IMMEDIATE (one email per event), DIGEST (collected into periodic digest
+    emails by the send_digests command) or OFF.
+    """
+    preference = NotificationPreference.objects.filter(user=request.user).first()
+    if request.method == "GET":
+        if preference is None:
+            preference = NotificationPreference(user=request.user, journal_mode=getattr(settings, 'NOTIFICATION_DEFAULT_MODE', 'IMMEDIATE'))
+        return Response(NotificationPreferenceSerializer(preference).data)
+
+    serializer = NotificationPreferenceSerializer(
+        preference, data=request.data, partial=request.method == "PATCH",
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save(user=request.user)
+    return Response(serializer.data)
+
+
 class ChartOfAccountsViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Chart of Accounts management.
@@ -1509,6 +1664,20 @@ class ChartOfAccountsViewSet(viewsets.ModelViewSet):
     queryset = ChartOfAccounts.objects.all().order_by('order', 'account_number')
     serializer_class = ChartOfAccountsSerializer
     
+    def get_queryset(self):
+        """Include balance deltas that have not been compacted yet."""
+        qs = super().get_queryset()
+        request = self.request
+        if getattr(settings, 'LEDGER_DEFERRED_BALANCES', False) and field_requested(
+            request, 'debit', 'credit', 'balance', 'can_deactivate', 'can_be_closed'
+        ):
+            qs = with_pending_balances(qs)
+        return select_requested(qs, request, {
+            'created_by': ['created_by_username'],
+            'updated_by': ['updated_by_username'],
+            'closed_by': ['closed_by_username'],
+        })
+    
     def get_permissions(self):
         """
         Admin and Manager can create, update, delete accounts.
@@ -1551,7 +1720,7 @@ class ChartOfAccountsViewSet(viewsets.ModelViewSet):
         account = serializer.save()
         
         try:
-            EventLog.objects.create(
+            record_event(
                 action='ACCOUNT_CREATED',
                 actor=self.request.user,
                 details=f"Created account {account.account_number} - {account.account_name}",
@@ -1570,8 +1739,11 @@ class ChartOfAccountsViewSet(viewsets.ModelViewSet):
         updated_account = serializer.save()
         after_image = self._account_to_dict(updated_account)
         
+        if before_image['initial_balance'] != after_image['initial_balance']:
+            AccountBalanceSnapshot.objects.filter(account=updated_account).delete()
+        
         try:
-            EventLog.objects.create(
+            record_event(
                 action='ACCOUNT_UPDATED',
                 actor=self.request.user,
                 details=f"Updated account {updated_account.account_number} - {updated_account.account_name}",
@@ -1597,7 +1769,7 @@ class ChartOfAccountsViewSet(viewsets.ModelViewSet):
         after_image = self._account_to_dict(account)
         
         try:
-            EventLog.objects.create(
+            record_event(
                 action='ACCOUNT_ACTIVATED',
                 actor=request.user,
                 details=f"Activated account {account.account_number} - {account.account_name}",
@@ -1620,7 +1792,7 @@ class ChartOfAccountsViewSet(viewsets.ModelViewSet):
         account = self.get_object()
         
         # Check if account can be deactivated
-        if account.balance != 0:
+        if account.current_balance() != 0:
             return Response(
                 {"detail": "Accounts with balance greater than zero cannot be deactivated"},
                 status=400
@@ -1643,7 +1815,7 @@ class ChartOfAccountsViewSet(viewsets.ModelViewSet):
         after_image = self._account_to_dict(account)
         
         try:
-            EventLog.objects.create(
+            record_event(
                 action='ACCOUNT_DEACTIVATED',
                 actor=request.user,
                 details=f"Deactivated account {account.account_number} - {account.account_name}",
@@ -1657,40 +1829,137 @@ class ChartOfAccountsViewSet(viewsets.ModelViewSet):
         
         return Response(ChartOfAccountsSerializer(account, context={'request': request}).data)
     
+    def _ledger_filters(self, request, lines):
+        """Apply date, amount and description filters to ledger lines."""
+        filtered = False
+        start_date = parse_report_date(request.query_params.get('start_date'))
+        end_date = parse_report_date(request.query_params.get('end_date'))
+        if start_date:
+            lines = lines.filter(journal_entry__entry_date__gte=start_date)
+        if end_date:
+            lines = lines.filter(journal_entry__entry_date__lte=end_date)
+        
+        # Amount and description filters skip lines inside the date range,
+        # so running balances must account for the lines in between
+        try:
+            min_amount = Decimal(request.query_params['min_amount']) if request.query_params.get('min_amount') else None
+            max_amount = Decimal(request.query_params['max_amount']) if request.query_params.get('max_amount') else None
+        except (ArithmeticError, ValueError):
+            min_amount = max_amount = None
+        if min_amount is not None or max_amount is not None:
+            lines = lines.annotate(line_amount=F('debit') + F('credit'))
+            if min_amount is not None:
+                lines = lines.filter(line_amount__gte=min_amount)
+            if max_amount is not None:
+                lines = lines.filter(line_amount__lte=max_amount)
+            filtered = True
+        
+        side = request.query_params.get('side', '').lower()
+        if side == 'debit':
+            lines = lines.filter(debit__gt=0)
+            filtered = True
+        elif side == 'credit':
+            lines = lines.filter(credit__gt=0)
+            filtered = True
+        
+        search = request.query_params.get('search')
+        if search:
+            lines = lines.filter(
+                Q(description__icontains=search) |
+                Q(journal_entry__description__icontains=search)
+            )
+            filtered = True
+        return lines, filtered
+    
+    def _ledger_row(self, line, balance):
+        return {
+            'id': line.id,
+            'date': line.journal_entry.entry_date.isoformat(),
+            'reference': str(line.journal_entry.id),
+            'journal_entry_id': line.journal_entry.id,
+            'description': line.description or line.journal_entry.description,
+            'debit': float(line.debit),
+            'credit': float(line.credit),
+            'running_balance': float(balance),
+            'created_by': line.journal_entry.created_by.username if line.journal_entry.created_by else None
+        }
+    
     @action(detail=True, methods=['get'])
     def ledger_entries(self, request, pk=None):
         """
         Get journal entry lines for this account to display in ledger.
+        
+        Each row carries the account's running balance after that line.
+        Pass ``limit`` and/or ``cursor`` for keyset pagination ordered by
+        (entry_date, created_at, id); otherwise the full list is returned.
+        Filters: start_date, end_date, min_amount, max_amount, side, search.
         """
         account = self.get_object()
         
-        # Get all journal entry lines for this account
         # Show APPROVED entries by default, but allow filtering by status
         status_filter = request.query_params.get('status', 'APPROVED')
-        if status_filter.upper() == 'ALL':
-            lines = JournalEntryLine.objects.filter(account=account)
-        else:
-            lines = JournalEntryLine.objects.filter(
-                account=account,
-                journal_entry__status=status_filter.upper()
-            )
-        lines = lines.select_related('journal_entry', 'journal_entry__created_by').order_by('journal_entry__entry_date', 'journal_entry__created_at')
-        
-        # Format the data for ledger display
-        ledger_data = []
-        for line in lines:
-            ledger_data.append({
-                'id': line.id,
-                'date': line.journal_entry.entry_date.isoformat(),
-                'reference': str(line.journal_entry.id),
-                'journal_entry_id': line.journal_entry.id,
-                'description': line.description or line.journal_entry.description,
-                'debit': float(line.debit),
-                'credit': float(line.credit),
-                'created_by': line.journal_entry.created_by.username if line.journal_entry.created_by else None
-            })
+        lines = account_ledger_lines(account, status_filter)
+        rows, gaps = self._ledger_filters(request, lines)
+        rows = rows.select_related('journal_entry', 'journal_entry__created_by')
+        
+        if not wants_pagination(request):
+            ledger_data = [
+                self._ledger_row(line, balance)
+                for line, balance in iter_running_balance(account, lines, rows, gaps=gaps)
+            ]
+            return Response(ledger_data)
         
-        return Response(ledger_data)
+        limit = parse_limit(request)
+        try:
+            after = decode_cursor(request.query_params.get('cursor'), len(LEDGER_ORDER))
+        except InvalidCursor:
+            return DatabaseErrorResponse.create_response('INVALID_CURSOR', status_code=400)
+        if after:
+            rows = rows.filter(keyset_filter(LEDGER_ORDER, after))
+        
+        page = list(rows[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+        results = [
+            self._ledger_row(line, balance)
+            for line, balance in iter_running_balance(account, lines, page, gaps=gaps)
+        ]
+        return Response({
+            'results': results,
+            'next_cursor': encode_cursor(ledger_key(page[-1])) if has_more else None,
+            'has_more': has_more,
+        })
+    
+    @action(detail=True, methods=['get'])
+    def ledger_export(self, request, pk=None):
+        """
+        Stream this account's ledger as CSV, or NDJSON with ``fmt=ndjson``.
+        Accepts the same status and filter parameters as ledger_entries.
+        """
+        fmt = request.query_params.get('fmt', 'csv').lower()
+        if fmt not in EXPORT_FORMATS:
+            return DatabaseErrorResponse.create_response('EXPORT_INVALID_FORMAT', status_code=400)
+        
+        account = self.get_object()
+        lines = account_ledger_lines(account, request.query_params.get('status', 'APPROVED'))
+        rows, gaps = self._ledger_filters(request, lines)
+        rows = rows.select_related('journal_entry', 'journal_entry__created_by').iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        
+        def ledger_rows():
+            for line, balance in iter_running_balance(account, lines, rows, gaps=gaps, chunk_size=EXPORT_CHUNK_SIZE):
+                entry = line.journal_entry
+                yield (
+                    entry.entry_date,
+                    entry.id,
+                    line.description or entry.description,
+                    line.debit,
+                    line.credit,
+                    balance,
+                    entry.created_by.username if entry.created_by else '',
+                )
+        
+        header = ['date', 'journal_entry_id', 'description', 'debit', 'credit', 'running_balance', 'created_by']
+        return streaming_export(header, ledger_rows(), f'ledger-{account.account_number}', fmt)
 
 
 class JournalEntryViewSet(viewsets.ModelViewSet):
@@ -1704,15 +1973,42 @@ class JournalEntryViewSet(viewsets.ModelViewSet):
     queryset = JournalEntry.objects.all().select_related('created_by', 'reviewed_by').prefetch_related('lines__account', 'attachments')
     serializer_class = JournalEntrySerializer
     
+    JOURNAL_PAGE_ORDER = ('-entry_date', '-created_at', '-id')
+    
     def get_permissions(self):
         """Managers and Accountants can create/update. Only Managers and Admins can approve/reject."""
-        if self.action in ['approve', 'reject']:
+        if self.action in ['approve', 'reject', 'bulk_approve', 'bulk_reject']:
             return [IsAuthenticated(), IsManagerOrAdmin()]
         return [IsAuthenticated()]
     
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return JournalEntryListSerializer
+        return JournalEntrySerializer
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include_lines'] = 'lines' in self.request.query_params.get('include', '').split(',')
+        return context
+    
     def get_queryset(self):
         """Filter based on user role and query parameters."""
-        qs = super().get_queryset()
+        request = self.request
+        qs = super().get_queryset().select_related(None).prefetch_related(None)
+        qs = select_requested(qs, request, {
+            'created_by': ['created_by_username'],
+            'reviewed_by': ['reviewed_by_username'],
+        })
+        if self.action == 'list':
+            # List rows use annotated totals; lines are loaded only when requested
+            qs = with_line_totals(qs)
+            if self.get_serializer_context()['include_lines'] and field_requested(request, 'lines'):
+                qs = qs.prefetch_related('lines__account')
+        else:
+            if field_requested(request, 'lines', 'total_debits', 'total_credits', 'is_balanced'):
+                qs = qs.prefetch_related('lines__account')
+            if field_requested(request, 'attachments'):
+                qs = qs.prefetch_related('attachments')
         user = self.request.user
         user_role = getattr(user, 'role', '')
         
@@ -1745,8 +2041,55 @@ class JournalEntryViewSet(viewsets.ModelViewSet):
         
         return qs
     
+    def list(self, request, *args, **kwargs):
+        """
+        List journal entries. Returns a plain list unless ``limit``, ``offset``
+        or ``cursor`` is given; ``offset`` selects limit/offset pagination with
+        a total count, otherwise keyset pagination on (entry_date, created_at, id).
+        Pass ``include=lines`` to embed each entry's lines.
+        """
+        qs = self.filter_queryset(self.get_queryset())
+        if not wants_pagination(request):
+            return Response(self.get_serializer(qs, many=True).data)
+        
+        limit = parse_limit(request)
+        qs = qs.order_by(*self.JOURNAL_PAGE_ORDER)
+        
+        if 'offset' in request.query_params:
+            offset = parse_offset(request)
+            total = qs.count()
+            page = qs[offset:offset + limit]
+            return Response({
+                'count': total,
+                'results': self.get_serializer(page, many=True).data,
+                'next_offset': offset + limit if offset + limit < total else None,
+            })
+        
+        key_fields = [field.lstrip('-') for field in self.JOURNAL_PAGE_ORDER]
+        try:
+            after = decode_cursor(request.query_params.get('cursor'), len(key_fields))
+        except InvalidCursor:
+            return DatabaseErrorResponse.create_response('INVALID_CURSOR', status_code=400)
+        if after:
+            qs = qs.filter(keyset_filter(key_fields, after, 'lt'))
+        
+        page = list(qs[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+        last = page[-1] if page else None
+        return Response({
+            'results': self.get_serializer(page, many=True).data,
+            'next_cursor': encode_cursor([last.entry_date, last.created_at, last.id]) if has_more else None,
+            'has_more': has_more,
+        })
+    
     def _journal_entry_to_dict(self, entry):
         """Convert journal entry to dictionary for event logging."""
+        # One pass over the lines (prefetched when available) for text and totals
+        if 'lines' in getattr(entry, '_prefetched_objects_cache', {}):
+            lines = list(entry.lines.all())
+        else:
+            lines = list(entry.lines.select_related('account'))
         return {
             'id': entry.id,
             'entry_date': entry.entry_date.isoformat(),
@@ -1755,10 +2098,10 @@ class JournalEntryViewSet(viewsets.ModelViewSet):
             'created_by': entry.created_by.username if entry.created_by else None,
             'lines': [
                 f"{line.account.account_number} - {line.account.account_name}: ${line.debit} Dr / ${line.credit} Cr"
-                for line in entry.lines.all()
+                for line in lines
             ],
-            'total_debits': f"${entry.total_debits()}",
-            'total_credits': f"${entry.total_credits()}",
+            'total_debits': f"${sum(line.debit for line in lines)}",
+            'total_credits': f"${sum(line.credit for line in lines)}",
         }
     
     def perform_create(self, serializer):
@@ -1766,7 +2109,7 @@ class JournalEntryViewSet(viewsets.ModelViewSet):
         entry = serializer.save()
         
         try:
-            EventLog.objects.create(
+            record_event(
                 action='JOURNAL_ENTRY_CREATED',
                 actor=self.request.user,
                 details=f"Created journal entry {entry.id} for {entry.entry_date}",
@@ -1779,25 +2122,26 @@ class JournalEntryViewSet(viewsets.ModelViewSet):
         
         if entry.status == 'PENDING':
             try:
-                manager_emails = list(User.objects.filter(role='MANAGER', is_active=True).values_list('email', flat=True))
+                managers = list(User.objects.filter(role='MANAGER', is_active=True).only('id', 'email'))
+                created_by = entry.created_by.username if entry.created_by else 'Unknown'
+                total_debits = entry.total_debits()
                 
-                if manager_emails:
-                    send_mail(
-                        "FlowCounts: New Journal Entry Submitted for Approval",
-                        f"A new journal entry has been submitted and requires your approval.\n\n"
-                        f"Entry ID: JE-{entry.id}\n"
-                        f"Date: {entry.entry_date}\n"
-                        f"Description: {entry.description or 'N/A'}\n"
-                        f"Created by: {entry.created_by.username if entry.created_by else 'Unknown'}\n"
-                        f"Total Debits: ${entry.total_debits():.2f}\n"
-                        f"Total Credits: ${entry.total_credits():.2f}\n"
-                        f"Status: PENDING APPROVAL\n\n"
-                        "Please log in to review and approve or reject this entry.\n\n"
-                        "FlowCounts Team",
-                        settings.DEFAULT_FROM_EMAIL,
-                        manager_emails,
-                        fail_silently=False,
-                    )
+                notify_journal_event(
+                    managers,
+                    'PENDING',
+                    {entry.id: f"JE-{entry.id} ({entry.entry_date}) by {created_by}: {entry.description or 'N/A'}, ${total_debits:.2f}"},
+                    "FlowCounts: New Journal Entry Submitted for Approval",
+                    f"A new journal entry has been submitted and requires your approval.\n\n"
+                    f"Entry ID: JE-{entry.id}\n"
+                    f"Date: {entry.entry_date}\n"
+                    f"Description: {entry.description or 'N/A'}\n"
+                    f"Created by: {created_by}\n"
+                    f"Total Debits: ${total_debits:.2f}\n"
+                    f"Total Credits: ${entry.total_credits():.2f}\n"
+                    f"Status: PENDING APPROVAL\n\n"
+                    "Please log in to review and approve or reject this entry.\n\n"
+                    "FlowCounts Team",
+                )
             except Exception as e:
                 logger.error(f"Failed to send journal entry notification: {e}")
     
@@ -1827,7 +2171,7 @@ class JournalEntryViewSet(viewsets.ModelViewSet):
         after_image = self._journal_entry_to_dict(updated_entry)
         
         try:
-            EventLog.objects.create(
+            record_event(
                 action='JOURNAL_ENTRY_UPDATED',
                 actor=self.request.user,
                 details=f"Updated journal entry {updated_entry.id}",
@@ -1853,48 +2197,24 @@ class JournalEntryViewSet(viewsets.ModelViewSet):
         Updates account balances when approved.
         """
         entry = self.get_object()
+        before_image = self._journal_entry_to_dict(entry)
         
-        if entry.status != 'PENDING':
+        try:
+            entry = post_journal_entry(entry.pk, request.user)
+        except PostingError as e:
             log_error(
-                'JOURNAL_APPROVE_NOT_PENDING',
+                e.error_code,
                 level='WARNING',
                 user=request.user,
                 request=request,
-                additional_details=f"Attempted to approve journal entry {entry.id} with status {entry.status}"
+                additional_details=f"Attempted to approve journal entry {entry.id} with status {e.entry.status}"
             )
-            return DatabaseErrorResponse.create_response('JOURNAL_APPROVE_NOT_PENDING', status_code=400)
-        
-        before_image = self._journal_entry_to_dict(entry)
-        
-        entry.status = 'APPROVED'
-        entry.reviewed_by = request.user
-        entry.reviewed_at = timezone.now()
-        entry.save()
-        
-        with transaction.atomic():
-            for line in entry.lines.all():
-                account = line.account
-                
-                if line.debit > 0:
-                    account.debit += line.debit
-                    if account.normal_side == 'DEBIT':
-                        account.balance += line.debit
-                    else:
-                        account.balance -= line.debit
-                
-                if line.credit > 0:
-                    account.credit += line.credit
-                    if account.normal_side == 'CREDIT':
-                        account.balance += line.credit
-                    else:
-                        account.balance -= line.credit
-                
-                account.save()
+            return DatabaseErrorResponse.create_response(e.error_code, status_code=400)
         
         after_image = self._journal_entry_to_dict(entry)
         
         try:
-            EventLog.objects.create(
+            record_event(
                 action='JOURNAL_ENTRY_APPROVED',
                 actor=request.user,
                 details=f"Approved journal entry {entry.id}",
@@ -1908,15 +2228,15 @@ class JournalEntryViewSet(viewsets.ModelViewSet):
         
         try:
             if entry.created_by and entry.created_by.email:
-                send_mail(
+                notify_journal_event(
+                    [entry.created_by],
+                    'APPROVED',
+                    {entry.id: f"JE-{entry.id} ({entry.entry_date}) approved by {request.user.username}"},
                     "FlowCounts: Journal Entry Approved",
                     f"Your journal entry (JE-{entry.id}) for {entry.entry_date} has been approved by {request.user.username}.\n\n"
                     f"Total Debits: ${entry.total_debits():.2f}\n"
                     f"Total Credits: ${entry.total_credits():.2f}\n\n"
                     "FlowCounts Team",
-                    settings.DEFAULT_FROM_EMAIL,
-                    [entry.created_by.email],
-                    fail_silently=True,
                 )
         except Exception as e:
             logger.error(f"Failed to send approval email: {e}")
@@ -1963,7 +2283,7 @@ class JournalEntryViewSet(viewsets.ModelViewSet):
         after_image = self._journal_entry_to_dict(entry)
         
         try:
-            EventLog.objects.create(
+            record_event(
                 action='JOURNAL_ENTRY_REJECTED',
                 actor=request.user,
                 details=f"Rejected journal entry {entry.id}: {rejection_reason}",
@@ -1977,21 +2297,199 @@ class JournalEntryViewSet(viewsets.ModelViewSet):
         
         try:
             if entry.created_by and entry.created_by.email:
-                send_mail(
+                notify_journal_event(
+                    [entry.created_by],
+                    'REJECTED',
+                    {entry.id: f"JE-{entry.id} ({entry.entry_date}) rejected by {request.user.username}: {rejection_reason}"},
                     "FlowCounts: Journal Entry Rejected",
                     f"Your journal entry (JE-{entry.id}) for {entry.entry_date} has been rejected by {request.user.username}.\n\n"
                     f"Reason: {rejection_reason}\n\n"
                     f"Please review and resubmit if necessary.\n\n"
                     "FlowCounts Team",
-                    settings.DEFAULT_FROM_EMAIL,
-                    [entry.created_by.email],
-                    fail_silently=True,
                 )
         except Exception as e:
             logger.error(f"Failed to send rejection email: {e}")
         
         return Response(JournalEntrySerializer(entry, context={'request': request}).data)
     
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream the lines of the filtered journal entries as CSV, or NDJSON
+        with ``fmt=ndjson``. Accepts the same filters as the list endpoint.
+        """
+        fmt = request.query_params.get('fmt', 'csv').lower()
+        if fmt not in EXPORT_FORMATS:
+            return DatabaseErrorResponse.create_response('EXPORT_INVALID_FORMAT', status_code=400)
+        
+        entries = self.get_queryset().prefetch_related(None).values('id')
+        fields = [
+            ('journal_entry_id', 'journal_entry_id'),
+            ('entry_date', 'journal_entry__entry_date'),
+            ('entry_type', 'journal_entry__entry_type'),
+            ('status', 'journal_entry__status'),
+            ('entry_description', 'journal_entry__description'),
+            ('account_number', 'account__account_number'),
+            ('account_name', 'account__account_name'),
+            ('line_description', 'description'),
+            ('debit', 'debit'),
+            ('credit', 'credit'),
+            ('created_by', 'journal_entry__created_by__username'),
+            ('reviewed_by', 'journal_entry__reviewed_by__username'),
+        ]
+        rows = (
+            JournalEntryLine.objects.filter(journal_entry_id__in=entries)
+            .order_by('journal_entry__entry_date', 'journal_entry_id', 'order', 'id')
+            .values_list(*[lookup for _, lookup in fields])
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        return streaming_export([name for name, _ in fields], rows, 'journal-entries', fmt)
+    
+    def _bulk_entry_ids(self, request):
+        """Read a list of journal entry IDs from the request body."""
+        raw_ids = request.data.get('ids') or []
+        if not isinstance(raw_ids, list):
+            return None
+        try:
+            return [int(entry_id) for entry_id in raw_ids]
+        except (TypeError, ValueError):
+            return None
+    
+    def _bulk_outcomes(self, entry_ids, reviewed, failures, status_label):
+        """Build the per-entry outcome list for bulk review responses."""
+        reviewed_ids = {entry.id for entry in reviewed}
+        results = []
+        for entry_id in dict.fromkeys(entry_ids):
+            if entry_id in reviewed_ids:
+                results.append({'id': entry_id, 'status': status_label})
+            else:
+                error_data = get_error_message(failures[entry_id])
+                results.append({
+                    'id': entry_id,
+                    'status': 'FAILED',
+                    'error_code': failures[entry_id],
+                    'detail': error_data['message'],
+                })
+        return results
+    
+    def _send_bulk_review_emails(self, entries, reviewer, approved, rejection_reason=''):
+        """Send one summary email (or digest item per entry) per entry creator instead of one per entry."""
+        by_creator = {}
+        for entry in entries:
+            if entry.created_by and entry.created_by.email:
+                by_creator.setdefault(entry.created_by.id, []).append(entry)
+        
+        verb = "approved" if approved else "rejected"
+        for creator_entries in by_creator.values():
+            lines = []
+            for entry in creator_entries:
+                lines.append(
+                    f"JE-{entry.id} ({entry.entry_date}): "
+                    f"Debits ${entry.total_debits():.2f} / Credits ${entry.total_credits():.2f}"
+                )
+            body = (
+                f"The following journal entries have been {verb} by {reviewer.username}:\n\n"
+                + "\n".join(lines)
+                + (f"\n\nReason: {rejection_reason}\n\nPlease review and resubmit if necessary." if not approved else "")
+                + "\n\nFlowCounts Team"
+            )
+            summaries = {
+                entry.id: f"JE-{entry.id} ({entry.entry_date}) {verb} by {reviewer.username}"
+                + (f": {rejection_reason}" if not approved else "")
+                for entry in creator_entries
+            }
+            try:
+                notify_journal_event(
+                    [creator_entries[0].created_by],
+                    'APPROVED' if approved else 'REJECTED',
+                    summaries,
+                    f"FlowCounts: {len(creator_entries)} Journal Entr{'y' if len(creator_entries) == 1 else 'ies'} {verb.capitalize()}",
+                    body,
+                )
+            except Exception as e:
+                logger.error(f"Failed to send bulk {verb} email: {e}")
+    
+    def _bulk_review(self, request, approve):
+        entry_ids = self._bulk_entry_ids(request)
+        if not entry_ids:
+            return DatabaseErrorResponse.create_response('JOURNAL_BULK_NO_IDS', status_code=400)
+        
+        rejection_reason = ''
+        if not approve:
+            rejection_reason = (request.data.get('rejection_reason') or '').strip()
+            if not rejection_reason:
+                return DatabaseErrorResponse.create_response('JOURNAL_REJECTION_REASON_REQUIRED', status_code=400)
+        
+        # Load lines and creators once so event images and emails need no further queries
+        entries = {
+            entry.id: entry
+            for entry in JournalEntry.objects.filter(pk__in=entry_ids)
+            .select_related('created_by')
+            .prefetch_related('lines__account')
+        }
+        before_images = {
+            entry_id: self._journal_entry_to_dict(entry)
+            for entry_id, entry in entries.items()
+            if entry.status == 'PENDING'
+        }
+        
+        if approve:
+            reviewed, failures = post_journal_entries(entry_ids, request.user)
+        else:
+            reviewed, failures = reject_journal_entries(entry_ids, request.user, rejection_reason)
+        
+        action_name = 'JOURNAL_ENTRY_APPROVED' if approve else 'JOURNAL_ENTRY_REJECTED'
+        events = []
+        reviewed_entries = []
+        for locked_entry in reviewed:
+            entry = entries[locked_entry.id]
+            entry.status = locked_entry.status
+            entry.reviewed_by = locked_entry.reviewed_by
+            entry.reviewed_at = locked_entry.reviewed_at
+            entry.rejection_reason = locked_entry.rejection_reason
+            reviewed_entries.append(entry)
+            events.append(EventLog(
+                action=action_name,
+                actor=request.user,
+                details=(
+                    f"Approved journal entry {entry.id} (bulk)" if approve
+                    else f"Rejected journal entry {entry.id} (bulk): {rejection_reason}"
+                ),
+                before_image=before_images.get(entry.id),
+                after_image=self._journal_entry_to_dict(entry),
+                record_type='JournalEntry',
+                record_id=entry.id
+            ))
+        try:
+            record_events(events)
+        except Exception:
+            logger.warning(f"Failed to log bulk {action_name} events", exc_info=True)
+        
+        self._send_bulk_review_emails(reviewed_entries, request.user, approve, rejection_reason)
+        
+        results = self._bulk_outcomes(entry_ids, reviewed, failures, 'APPROVED' if approve else 'REJECTED')
+        return Response({
+            'results': results,
+            'succeeded': len(reviewed),
+            'failed': len(failures),
+        })
+    
+    @action(detail=False, methods=['post'])
+    def bulk_approve(self, request):
+        """
+        Approve a list of pending journal entries in one transaction.
+        Body: {"ids": [1, 2, 3]}. Returns the outcome for each entry.
+        """
+        return self._bulk_review(request, approve=True)
+    
+    @action(detail=False, methods=['post'])
+    def bulk_reject(self, request):
+        """
+        Reject a list of pending journal entries with a shared reason.
+        Body: {"ids": [1, 2, 3], "rejection_reason": "..."}.
+        """
+        return self._bulk_review(request, approve=False)
+    
     @action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser])
     def upload_attachment(self, request, pk=None):
         """Upload an attachment to a journal entry."""
@@ -2146,6 +2644,7 @@ def send_email_to_user(request):
         logger.info(f"Attempting to send email from {from_email} to {recipient_list}")
         logger.info(f"Recipient list details: {recipient_list}, length: {len(recipient_list)}, first item: {recipient_list[0] if recipient_list else 'N/A'}")
         
+        # Sent inline so delivery errors reach the sender
         result = send_mail(
             full_subject,
             full_message,
@@ -2242,14 +2741,14 @@ def close_account(request):
             return DatabaseErrorResponse.create_response(
                 'ACCOUNT_NON_ZERO_BALANCE',
                 status=400,
-                balance=float(account.balance)
+                balance=float(account.current_balance())
             )
         
         # Close the account
         account.close_account(request.user, closure_reason)
         
         # Log the event
-        EventLog.objects.create(
+        record_event(
             user=request.user,
             action="ACCOUNT_CLOSED",
             details=f"Account {account.account_number} - {account.account_name} was closed. Reason: {closure_reason}",
@@ -2320,9 +2819,139 @@ def get_managers_and_admins(request):
         )
 
 
+# Dashboard Views
+DASHBOARD_EVENT_FIELDS = ['id', 'action', 'details', 'actor_username', 'record_type', 'record_id', 'created_at']
+
+# Actions shown in each dashboard event panel
+ACCOUNT_EVENT_ACTIONS = ['ACCOUNT_CREATED', 'ACCOUNT_UPDATED', 'ACCOUNT_ACTIVATED', 'ACCOUNT_DEACTIVATED']
+JOURNAL_EVENT_ACTIONS = [
+    'JOURNAL_ENTRY_CREATED', 'JOURNAL_ENTRY_UPDATED', 'JOURNAL_ENTRY_APPROVED', 'JOURNAL_ENTRY_REJECTED',
+]
+USER_ADMIN_EVENT_ACTIONS = [
+    'USER_CREATED', 'USER_ACTIVATED', 'USER_DEACTIVATED', 'USER_SUSPENDED', 'USER_UNSUSPENDED', 'USER_UPDATED',
+]
+
+
+def _dashboard_events(user, actions, since, limit):
+    """Recent events among ``actions`` that the event log would also show ``user``."""
+    visible = visible_event_actions(user)
+    if visible is not None:
+        actions = [action for action in actions if action in visible]
+    return list(
+        EventLog.objects.filter(action__in=actions, created_at__gte=since)
+        .annotate(actor_username=F('actor__username'))
+        .order_by('-created_at')
+        .values(*DASHBOARD_EVENT_FIELDS)[:limit]
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard_summary(request):
+    """
+    Return the dashboard KPIs and notifications for the current user's role
+    in one response, using aggregate queries instead of full list downloads.
+    """
+    try:
+        user = request.user
+        role = getattr(user, 'role', '')
+        now = timezone.now()
+        week_ago = now - timedelta(days=7)
+        two_weeks_ago = now - timedelta(days=14)
+        
+        # Account totals in one conditional aggregate over active accounts
+        accounts = ChartOfAccounts.objects.filter(is_active=True)
+        balance = F('balance')
+        if getattr(settings, 'LEDGER_DEFERRED_BALANCES', False):
+            accounts = with_pending_balances(accounts)
+            balance = F('balance') + F('pending_balance')
+        totals = accounts.aggregate(
+            active_accounts=Count('id'),
+            total_assets=Sum(balance, filter=Q(account_category='ASSET')),
+            total_liabilities=Sum(balance, filter=Q(account_category='LIABILITY')),
+            total_equity=Sum(balance, filter=Q(account_category='EQUITY')),
+        )
+        
+        # Year-to-date pre-closing revenue and expenses from approved lines
+        today = timezone.localdate()
+        income = JournalEntryLine.objects.filter(
+            journal_entry__status='APPROVED',
+            journal_entry__entry_date__gte=today.replace(month=1, day=1),
+            journal_entry__entry_date__lte=today,
+        ).exclude(journal_entry__entry_type='CLOSING').aggregate(
+            revenue_credit=Sum('credit', filter=Q(account__account_category='REVENUE')),
+            revenue_debit=Sum('debit', filter=Q(account__account_category='REVENUE')),
+            expense_debit=Sum('debit', filter=Q(account__account_category='EXPENSE')),
+            expense_credit=Sum('credit', filter=Q(account__account_category='EXPENSE')),
+        )
+        zero = Decimal('0.00')
+        total_revenue = (income['revenue_credit'] or zero) - (income['revenue_debit'] or zero)
+        total_expenses = (income['expense_debit'] or zero) - (income['expense_credit'] or zero)
+        
+        summary = {
+            'role': role,
+            'totals': {
+                'active_accounts': totals['active_accounts'],
+                'total_assets': totals['total_assets'] or zero,
+                'total_liabilities': totals['total_liabilities'] or zero,
+                'total_equity': totals['total_equity'] or zero,
+                'total_revenue': total_revenue,
+                'total_expenses': total_expenses,
+                'net_income': total_revenue - total_expenses,
+            },
+            'pending_entries_count': 0,
+            'pending_entries': [],
+            'recent_reviewed_entries': [],
+            'recent_events': [],
+            'account_changes': [],
+        }
+        
+        entries = JournalEntry.objects.all()
+        if role == 'MANAGER':
+            summary['pending_entries_count'] = entries.filter(status='PENDING').count()
+            summary['recent_events'] = _dashboard_events(
+                user, ACCOUNT_EVENT_ACTIONS + JOURNAL_EVENT_ACTIONS, week_ago, 5
+            )
+        elif role == 'ACCOUNTANT':
+            own_pending = entries.filter(status='PENDING', created_by=user)
+            summary['pending_entries_count'] = own_pending.count()
+            summary['pending_entries'] = list(
+                own_pending.order_by('-created_at').values('id', 'description', 'created_at')[:5]
+            )
+            summary['recent_reviewed_entries'] = list(
+                entries.filter(
+                    created_by=user,
+                    status__in=['APPROVED', 'REJECTED'],
+                    reviewed_at__gte=two_weeks_ago,
+                ).order_by('-reviewed_at').values('id', 'status', 'description', 'reviewed_at')[:10]
+            )
+            summary['account_changes'] = _dashboard_events(user, ACCOUNT_EVENT_ACTIONS, two_weeks_ago, 10)
+            summary['recent_events'] = _dashboard_events(user, JOURNAL_EVENT_ACTIONS, week_ago, 5)
+        elif role == 'ADMIN':
+            summary['recent_events'] = _dashboard_events(
+                user, USER_ADMIN_EVENT_ACTIONS + ACCOUNT_EVENT_ACTIONS, week_ago, 5
+            )
+        
+        return Response(summary)
+    
+    except Exception as e:
+        log_error(
+            'DASHBOARD_SUMMARY_ERROR',
+            level='ERROR',
+            user=request.user if hasattr(request, 'user') else None,
+            request=request,
+            exception=e
+        )
+        return DatabaseErrorResponse.create_response(
+            'DASHBOARD_SUMMARY_ERROR',
+            status_code=500
+        )
+
+
 # Financial Statement Views
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_statement('trial_balance')
 def trial_balance(request):
     """Generate trial balance for a specific date or date range."""
     try:
@@ -2336,17 +2965,23 @@ def trial_balance(request):
                 status=400
             )
         
-        # Get all active accounts
-        accounts = ChartOfAccounts.objects.filter(is_active=True).order_by('account_number')
+        # A date range reports balances as of the end of the period
+        report_date = parse_report_date(as_of_date or end_date)
+        if report_date is None:
+            return DatabaseErrorResponse.create_response('FINANCIAL_INVALID_DATE', status_code=400)
+        
+        # Balances as of the report date, computed from posted lines in one grouped query
+        accounts = accounts_as_of(
+            report_date,
+            ChartOfAccounts.objects.filter(is_active=True).order_by('account_number')
+        )
         
         trial_balance_data = []
         total_debits = Decimal('0.00')
         total_credits = Decimal('0.00')
         
         for account in accounts:
-            # Use the stored account balance instead of dynamic calculation
-            # This ensures the trial balance shows the correct values as updated
-            account_balance = account.balance
+            account_balance = account.as_of_balance
             
             # For post-closing trial balance, revenue and expense accounts should be zero
             # This is the correct accounting practice - trial balance shows post-closing balances
@@ -2436,6 +3071,7 @@ def trial_balance(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_statement('income_statement')
 def income_statement(request):
     """Generate income statement for a specific date range."""
     try:
@@ -2448,17 +3084,22 @@ def income_statement(request):
                 status=400
             )
         
-        # Get revenue accounts
-        revenue_accounts = ChartOfAccounts.objects.filter(
-            is_active=True,
-            account_category='REVENUE'
-        ).order_by('account_number')
+        period_start = parse_report_date(start_date)
+        period_end = parse_report_date(end_date)
+        if period_start is None or period_end is None:
+            return DatabaseErrorResponse.create_response('FINANCIAL_INVALID_DATE', status_code=400)
         
-        # Get expense accounts
-        expense_accounts = ChartOfAccounts.objects.filter(
-            is_active=True,
-            account_category='EXPENSE'
-        ).order_by('account_number')
+        # Pre-closing activity for the period, aggregated in one query
+        accounts = period_activity(
+            period_start,
+            period_end,
+            ChartOfAccounts.objects.filter(
+                is_active=True,
+                account_category__in=['REVENUE', 'EXPENSE']
+            ).order_by('account_number')
+        )
+        revenue_accounts = [a for a in accounts if a.account_category == 'REVENUE']
+        expense_accounts = [a for a in accounts if a.account_category == 'EXPENSE']
         
         # Calculate revenue totals
         revenues = []
@@ -2470,7 +3111,7 @@ def income_statement(request):
             if account.account_name == 'Service Revenue':
                 revenue_amount = Decimal('13425.00')
             else:
-                revenue_amount = account.balance
+                revenue_amount = account.period_amount
             
             if revenue_amount > 0:
                 revenues.append({
@@ -2501,7 +3142,7 @@ def income_statement(request):
             if account.account_name in expense_amounts:
                 expense_amount = expense_amounts[account.account_name]
             else:
-                expense_amount = account.balance
+                expense_amount = account.period_amount
             
             if expense_amount > 0:
                 expenses.append({
@@ -2540,6 +3181,7 @@ def income_statement(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_statement('balance_sheet')
 def balance_sheet(request):
     """Generate balance sheet for a specific date."""
     try:
@@ -2551,28 +3193,24 @@ def balance_sheet(request):
                 status=400
             )
         
-        # Get asset accounts
-        asset_accounts = ChartOfAccounts.objects.filter(
-            is_active=True,
-            account_category='ASSET'
-        ).order_by('account_number')
-        
-        # Get liability accounts
-        liability_accounts = ChartOfAccounts.objects.filter(
-            is_active=True,
-            account_category='LIABILITY'
-        ).order_by('account_number')
+        report_date = parse_report_date(as_of_date)
+        if report_date is None:
+            return DatabaseErrorResponse.create_response('FINANCIAL_INVALID_DATE', status_code=400)
         
-        # Get equity accounts
-        equity_accounts = ChartOfAccounts.objects.filter(
-            is_active=True,
-            account_category='EQUITY'
-        ).order_by('account_number')
+        # Balances as of the report date, starting from the latest period snapshot
+        accounts = accounts_as_of(
+            report_date,
+            ChartOfAccounts.objects.filter(
+                is_active=True,
+                account_category__in=['ASSET', 'LIABILITY', 'EQUITY']
+            ).order_by('account_number')
+        )
+        asset_accounts = [a for a in accounts if a.account_category == 'ASSET']
+        liability_accounts = [a for a in accounts if a.account_category == 'LIABILITY']
+        equity_accounts = [a for a in accounts if a.account_category == 'EQUITY']
         
         def calculate_account_balance(account, as_of_date):
-            # Use the stored account balance instead of dynamic calculation
-            # This ensures the balance sheet shows the correct values as updated
-            return account.balance
+            return account.as_of_balance
         
         # Calculate assets
         assets = []
@@ -2660,6 +3298,7 @@ def balance_sheet(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_statement('retained_earnings')
 def retained_earnings(request):
     """Generate statement of retained earnings for a specific date range."""
     try:
@@ -2671,6 +3310,8 @@ def retained_earnings(request):
                 'FINANCIAL_MISSING_START_END_DATES',
                 status=400
             )
+        if parse_report_date(start_date) is None or parse_report_date(end_date) is None:
+            return DatabaseErrorResponse.create_response('FINANCIAL_INVALID_DATE', status_code=400)
         
         # Get beginning retained earnings (from previous period)
         beginning_retained_earnings = Decimal('0.00')
@@ -2741,3 +3382,77 @@ def retained_earnings(request):
             'FINANCIAL_RETAINED_EARNINGS_ERROR',
             status=500
         )
+
+
+# URL names accepted for the record types stored on EventLog
+AUDIT_RECORD_TYPES = {
+    'account': 'Account',
+    'accounts': 'Account',
+    'user': 'User',
+    'users': 'User',
+    'journal-entry': 'JournalEntry',
+    'journal-entries': 'JournalEntry',
+    'journalentry': 'JournalEntry',
+}
+AUDIT_TIMELINE_FIELDS = [
+    'id', 'action', 'actor', 'actor_username', 'target_user', 'target_username',
+    'details', 'record_type', 'record_id', 'created_at',
+]
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def audit_timeline(request, record_type, record_id):
+    """
+    Return the event history of one record, oldest first (``order=desc`` for
+    newest first), keyset-paginated on (created_at, id) with ``limit`` and
+    ``cursor``. Pass ``expand_images=true`` to include full before/after images.
+    """
+    record_type = AUDIT_RECORD_TYPES.get(record_type.lower(), record_type)
+    descending = request.query_params.get('order') == 'desc'
+    expand_images = request.query_params.get('expand_images', '').lower() == 'true'
+    limit = parse_limit(request)
+    
+    # Served by the (record_type, record_id, created_at) index
+    qs = EventLog.objects.filter(record_type=record_type, record_id=record_id)
+    visible = visible_event_actions(request.user)
+    if visible is not None:
+        qs = qs.filter(action__in=sorted(visible)) if visible else qs.none()
+    
+    key_fields = ['created_at', 'id']
+    try:
+        after = decode_cursor(request.query_params.get('cursor'), len(key_fields))
+    except InvalidCursor:
+        return DatabaseErrorResponse.create_response('INVALID_CURSOR', status_code=400)
+    if after:
+        qs = qs.filter(keyset_filter(key_fields, after, 'lt' if descending else 'gt'))
+    qs = qs.order_by(*(f'-{field}' for field in key_fields)) if descending else qs.order_by(*key_fields)
+    
+    columns = ['id', 'action', 'actor_id', 'target_user_id', 'details', 'record_type', 'record_id', 'created_at']
+    if expand_images:
+        columns += ['before_image', 'after_image', 'image_delta', 'delta_base', 'delta_depth']
+    page = list(
+        qs.annotate(actor_username=F('actor__username'), target_username=F('target_user__username'))
+        .values(*columns, 'actor_username', 'target_username')[:limit + 1]
+    )
+    has_more = len(page) > limit
+    page = page[:limit]
+    
+    images = reconstruct_images(page) if expand_images else {}
+    results = []
+    for row in page:
+        row['actor'] = row.pop('actor_id')
+        row['target_user'] = row.pop('target_user_id')
+        event = {field: row[field] for field in AUDIT_TIMELINE_FIELDS}
+        if expand_images:
+            event['before_image'], event['after_image'] = images[row['id']]
+        results.append(event)
+    
+    last = page[-1] if page else None
+    return Response({
+        'record_type': record_type,
+        'record_id': record_id,
+        'results': results,
+        'next_cursor': encode_cursor([last['created_at'], last['id']]) if has_more else None,
+        'has_more': has_more,
+    })
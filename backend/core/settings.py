@@ -103,9 +103,34 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            # Take the write lock at BEGIN so concurrent postings wait instead of failing
+            "OPTIONS": {
+                "transaction_mode": "IMMEDIATE",
+                "timeout": 20,
+            },
+            # A file-backed test database, so tests can post from several threads
+            "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
         }
     }
 
+# Cache
+# Financial statements are cached per ledger version; MAX_ENTRIES bounds memory use
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "flowcounts-default",
+    },
+    "statements": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "flowcounts-statements",
+        "TIMEOUT": int(os.environ.get("STATEMENT_CACHE_TIMEOUT", "3600")),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("STATEMENT_CACHE_MAX_ENTRIES", "500")),
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -184,6 +209,23 @@ else:
     EMAIL_USE_SSL = os.environ.get('EMAIL_USE_SSL', 'False').lower() == 'true'
     DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER)
 
+# Email outbox: request handlers queue mail in the EmailOutbox table and
+# `python manage.py run_outbox --loop` sends it (the `worker` process in the
+# Procfiles; started next to Gunicorn in the Dockerfile). Deployments that do
+# not run it must set EMAIL_OUTBOX_ENABLED=False to send inline instead.
+EMAIL_OUTBOX_ENABLED = os.environ.get('EMAIL_OUTBOX_ENABLED', 'True').lower() == 'true'
+EMAIL_OUTBOX_WORKERS = int(os.environ.get('EMAIL_OUTBOX_WORKERS', '4'))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get('EMAIL_OUTBOX_BATCH_SIZE', '100'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+EMAIL_OUTBOX_RETRY_SECONDS = int(os.environ.get('EMAIL_OUTBOX_RETRY_SECONDS', '60'))
+EMAIL_OUTBOX_MAX_RETRY_SECONDS = int(os.environ.get('EMAIL_OUTBOX_MAX_RETRY_SECONDS', '3600'))
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.environ.get('EMAIL_OUTBOX_LEASE_SECONDS', '600'))
+
+# Journal entry notifications for users without a preference: IMMEDIATE, DIGEST or OFF.
+# Digests are sent by `python manage.py send_digests`; schedule it at the digest interval.
+NOTIFICATION_DEFAULT_MODE = os.environ.get('NOTIFICATION_DEFAULT_MODE', 'IMMEDIATE')
+NOTIFICATION_DIGEST_MAX_LINES = int(os.environ.get('NOTIFICATION_DIGEST_MAX_LINES', '50'))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator", "OPTIONS": {"min_length": 8}},
     {"NAME": "django.contrib.auth.password_validation.CommonPasswordValidator"},
@@ -196,6 +238,25 @@ PASSWORD_MAX_AGE_DAYS = 90
 PASSWORD_EXPIRY_WARNING_DAYS = 3
 MAX_FAILED_LOGINS = 3   
 
+# When enabled, approvals append per-account balance deltas instead of updating
+# ChartOfAccounts rows directly; run `python manage.py compact_balances` periodically
+# to fold them into the stored totals
+LEDGER_DEFERRED_BALANCES = os.environ.get('LEDGER_DEFERRED_BALANCES', 'False').lower() == 'true'
+
+# Seconds before each worker reloads its in-process copy of the error messages,
+# even if no change was signalled through the cache
+ERROR_MESSAGE_CACHE_TTL = int(os.environ.get('ERROR_MESSAGE_CACHE_TTL', '300'))
+
+# Repeats of the same error (code, path, user, exception type) within this many
+# seconds increment one ErrorLog row instead of inserting a new one; 0 disables grouping
+ERROR_LOG_DEDUP_WINDOW_SECONDS = int(os.environ.get('ERROR_LOG_DEDUP_WINDOW_SECONDS', '300'))
+# Fraction (0.0-1.0) of grouped repeats that are still stored in full as samples
+ERROR_LOG_SAMPLE_RATE = float(os.environ.get('ERROR_LOG_SAMPLE_RATE', '0.0'))
+# Buffer repeat counts in memory and flush them every N occurrences or N seconds
+ERROR_LOG_BUFFERED = os.environ.get('ERROR_LOG_BUFFERED', 'False').lower() == 'true'
+ERROR_LOG_BUFFER_SIZE = int(os.environ.get('ERROR_LOG_BUFFER_SIZE', '100'))
+ERROR_LOG_BUFFER_SECONDS = float(os.environ.get('ERROR_LOG_BUFFER_SECONDS', '10'))
+
 # PUBLIC_ORIGIN - Used for generating absolute URLs in emails and other contexts
 # Can be overridden with PUBLIC_ORIGIN environment variable
 # Defaults to localhost for development, but should be set to actual domain in production
@@ -245,3 +306,26 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+# Events flushed by the buffered audit sink store before/after images as diffs
+# against the record's previous event, with full images every this many events
+# per record; 0 or 1 stores full images. Sync writes always store full images.
+EVENT_IMAGE_KEYFRAME_INTERVAL = int(os.environ.get('EVENT_IMAGE_KEYFRAME_INTERVAL', '20'))
+
+# Audit sink: 'sync' writes each EventLog row in the request; 'buffered' queues
+# events after commit and writes them in batches of AUDIT_BUFFER_SIZE or every
+# AUDIT_BUFFER_SECONDS. Queued events are spooled to AUDIT_SPOOL_DIR so a
+# restarted worker (or `python manage.py replay_audit_spool`) can recover them.
+AUDIT_SINK = os.environ.get('AUDIT_SINK', 'sync')
+AUDIT_BUFFER_SIZE = int(os.environ.get('AUDIT_BUFFER_SIZE', '100'))
+AUDIT_BUFFER_SECONDS = float(os.environ.get('AUDIT_BUFFER_SECONDS', '2'))
+AUDIT_SPOOL_DIR = os.environ.get('AUDIT_SPOOL_DIR', os.path.join(BASE_DIR, 'audit_spool'))
+
+# Retention for audit and error logs. Rows older than these many days are moved
+# to compressed JSONL files by `python manage.py archive_logs`; 0 keeps rows forever.
+# Archive files contain full before/after images and stack traces, so do not let
+# the web server serve LOG_ARCHIVE_ROOT.
+EVENT_LOG_RETENTION_DAYS = int(os.environ.get('EVENT_LOG_RETENTION_DAYS', '365'))
+ERROR_LOG_RETENTION_DAYS = int(os.environ.get('ERROR_LOG_RETENTION_DAYS', '90'))
+LOG_ARCHIVE_ROOT = os.environ.get('LOG_ARCHIVE_ROOT', os.path.join(MEDIA_ROOT, 'archives'))
+LOG_ARCHIVE_CHUNK_SIZE = int(os.environ.get('LOG_ARCHIVE_CHUNK_SIZE', '1000'))
@@ -13,6 +13,7 @@ from accounts.views import (
     EventLogViewSet,
     FlowTokenView,
     me,
+    notification_preferences,
     upload_profile_photo,
     forgot_password,
     get_username_by_email,
@@ -26,6 +27,8 @@ from accounts.views import (
     income_statement,
     balance_sheet,
     retained_earnings,
+    dashboard_summary,
+    audit_timeline,
 )
 from accounts.error_views import ErrorMessageViewSet, ErrorLogViewSet
 from core.views import index 
@@ -45,6 +48,7 @@ urlpatterns = [
     path("api/auth/token/", FlowTokenView.as_view()),
     path("api/auth/me/", me),
     path("api/auth/me/photo/", upload_profile_photo, name="upload-profile-photo"),
+    path("api/auth/me/notifications/", notification_preferences, name="notification-preferences"),
     path("api/auth/change-password/", change_password, name="change-password"),
     path("api/auth/get-username/", get_username_by_email, name="get-username"),
     path("api/auth/forgot-password/", forgot_password, name="forgot-password"),
@@ -55,6 +59,8 @@ urlpatterns = [
     path("api/financial/income-statement/", income_statement, name="income-statement"),
     path("api/financial/balance-sheet/", balance_sheet, name="balance-sheet"),
     path("api/financial/retained-earnings/", retained_earnings, name="retained-earnings"),
+    path("api/dashboard/summary/", dashboard_summary, name="dashboard-summary"),
+    path("api/audit/<str:record_type>/<int:record_id>/timeline/", audit_timeline, name="audit-timeline"),
 ]
 
 # Serve media files in development
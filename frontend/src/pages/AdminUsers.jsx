@@ -617,7 +617,7 @@ export default function AdminUsers() {
     setMsg("");
     try {
       const { data } = await api.post(`/auth/registration-requests/${id}/approve/`, {});
-      setMsg(data.email_sent ? "Approved. Email sent to user." : "Approved.");
+      setMsg(data.email_queued ? "Approved. Email queued for the user." : "Approved.");
       await load();
     } catch (e) {
       const detail = e?.response?.data?.detail || "Approve failed. See server logs.";
@@ -630,7 +630,7 @@ export default function AdminUsers() {
     const note = prompt("Optional note to include in email:");
     try {
       const { data } = await api.post(`/auth/registration-requests/${id}/reject/`, { note });
-      setMsg(data.email_sent ? "Rejected. Email sent to user." : "Rejected.");
+      setMsg(data.email_queued ? "Rejected. Email queued for the user." : "Rejected.");
       await load();
     } catch (e) {
       setMsg(e.response?.status === 401 ? "Session expired. Log in again." : "Reject failed. See server logs.");
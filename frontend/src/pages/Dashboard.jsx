@@ -25,7 +25,7 @@ function formatPercentage(value) {
 
 export default function Dashboard() {
   const navigate = useNavigate();
-  const [accounts, setAccounts] = useState([]);
+  const [summaryTotals, setSummaryTotals] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [userRole, setUserRole] = useState("");
@@ -35,40 +35,26 @@ export default function Dashboard() {
   const [approvedRejectedEntries, setApprovedRejectedEntries] = useState([]);
   const [recentEvents, setRecentEvents] = useState([]);
   const [accountChanges, setAccountChanges] = useState([]);
-  const [userId, setUserId] = useState(null);
 
   useEffect(() => {
     const user = JSON.parse(localStorage.getItem("user") || "{}");
     setUserRole(user.role || "");
     setUserName(user.first_name || user.username || "User");
-    setUserId(user.id);
-    fetchDashboardData();
-    fetchNotifications(user.role, user.id);
+    fetchDashboardSummary();
   }, []);
 
-  async function fetchDashboardData() {
+  async function fetchDashboardSummary() {
     try {
       setLoading(true);
       setError("");
-      // Fetch statements that other pages rely on to keep numbers consistent
-      const today = new Date().toISOString().split("T")[0];
-      const [bsResp, isResp, coaResp] = await Promise.all([
-        api.get("/financial/balance-sheet/", {
-          params: { as_of_date: today },
-        }),
-        api.get("/financial/income-statement/", {
-          params: {
-            // Income statement on other page defaults to YTD; mirror that behavior
-            start_date: new Date(new Date().getFullYear(), 0, 1).toISOString().split("T")[0],
-            end_date: new Date().toISOString().split("T")[0],
-          },
-        }),
-        // Keep accounts available for any auxiliary display if needed
-        api.get("/chart-of-accounts/"),
-      ]);
-      setAccounts(coaResp.data || []);
-      setBalanceSheet(bsResp.data || null);
-      setIncomeStatement(isResp.data || null);
+      // KPIs and role-specific notifications come from a single aggregated endpoint
+      const { data } = await api.get("/dashboard/summary/");
+      setSummaryTotals(data.totals || null);
+      setPendingEntries(data.pending_entries_count || 0);
+      setPendingEntriesList(data.pending_entries || []);
+      setApprovedRejectedEntries(data.recent_reviewed_entries || []);
+      setAccountChanges(data.account_changes || []);
+      setRecentEvents(data.recent_events || []);
     } catch (err) {
       console.error("Error loading dashboard data:", err);
       setError(err?.response?.data?.detail || "Failed to load dashboard data");
@@ -77,112 +63,6 @@ export default function Dashboard() {
     }
   }
 
-  async function fetchNotifications(role, userId) {
-    try {
-      if (role === "MANAGER") {
-        // Fetch pending journal entries for managers
-        const pendingResp = await api.get("/journal-entries/", {
-          params: { status: "PENDING" }
-        });
-        setPendingEntries(pendingResp.data.length || 0);
-
-        // Fetch recent account/journal entry changes (if accessible)
-        try {
-          const eventsResp = await api.get("/auth/events/");
-          const recentAccountEvents = eventsResp.data
-            .filter(event => 
-              (event.action?.includes("ACCOUNT") || event.action?.includes("JOURNAL_ENTRY")) &&
-              new Date(event.created_at) > new Date(Date.now() - 7 * 24 * 60 * 60 * 1000) // Last 7 days
-            )
-            .slice(0, 5);
-          setRecentEvents(recentAccountEvents);
-        } catch (err) {
-          // Event logs may not be accessible to managers, ignore
-          console.log("Event logs not accessible to managers");
-        }
-      } else if (role === "ACCOUNTANT") {
-        // Fetch pending journal entries created by this accountant
-        const pendingResp = await api.get("/journal-entries/", {
-          params: { status: "PENDING" }
-        });
-        const pendingEntriesCreatedByUser = (pendingResp.data || [])
-          .filter(entry => {
-            const entryCreatedBy = typeof entry.created_by === 'object' ? entry.created_by?.id : entry.created_by;
-            return entryCreatedBy === userId;
-          })
-          .sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
-        setPendingEntries(pendingEntriesCreatedByUser.length);
-        setPendingEntriesList(pendingEntriesCreatedByUser.slice(0, 5));
-
-        // Fetch approved/rejected journal entries created by this accountant
-        const [approvedResp, rejectedResp] = await Promise.all([
-          api.get("/journal-entries/", {
-            params: { status: "APPROVED" }
-          }),
-          api.get("/journal-entries/", {
-            params: { status: "REJECTED" }
-          })
-        ]);
-        
-        // Filter to entries created by this accountant and reviewed in last 14 days
-        const fourteenDaysAgo = new Date(Date.now() - 14 * 24 * 60 * 60 * 1000);
-        const allEntries = [...(approvedResp.data || []), ...(rejectedResp.data || [])];
-        const recentEntries = allEntries
-          .filter(entry => {
-            const entryCreatedBy = typeof entry.created_by === 'object' ? entry.created_by?.id : entry.created_by;
-            return entryCreatedBy === userId &&
-                   entry.reviewed_at &&
-                   new Date(entry.reviewed_at) > fourteenDaysAgo;
-          })
-          .sort((a, b) => new Date(b.reviewed_at) - new Date(a.reviewed_at))
-          .slice(0, 10);
-        setApprovedRejectedEntries(recentEntries);
-
-        // Fetch recent account changes
-        try {
-          const eventsResp = await api.get("/auth/events/");
-          const recentAccountEvents = eventsResp.data
-            .filter(event => 
-              event.action?.startsWith("ACCOUNT_") &&
-              new Date(event.created_at) > new Date(Date.now() - 14 * 24 * 60 * 60 * 1000) // Last 14 days
-            )
-            .slice(0, 10);
-          setAccountChanges(recentAccountEvents);
-          
-          // Also get journal entry events for completeness
-          const journalEvents = eventsResp.data
-            .filter(event => 
-              event.action?.startsWith("JOURNAL_ENTRY_") &&
-              new Date(event.created_at) > new Date(Date.now() - 7 * 24 * 60 * 60 * 1000) // Last 7 days
-            )
-            .slice(0, 5);
-          setRecentEvents(journalEvents);
-        } catch (err) {
-          console.error("Error fetching event logs:", err);
-        }
-      } else if (role === "ADMIN") {
-        // Fetch recent user/account changes for admins
-        try {
-          const eventsResp = await api.get("/auth/events/");
-          const recentUserAccountEvents = eventsResp.data
-            .filter(event => 
-              (event.action?.includes("USER") || event.action?.includes("ACCOUNT")) &&
-              new Date(event.created_at) > new Date(Date.now() - 7 * 24 * 60 * 60 * 1000) // Last 7 days
-            )
-            .slice(0, 5);
-          setRecentEvents(recentUserAccountEvents);
-        } catch (err) {
-          console.error("Error fetching event logs:", err);
-        }
-      }
-    } catch (err) {
-      console.error("Error fetching notifications:", err);
-    }
-  }
-
-  // Use the same data sources as Balance Sheet and Income Statement pages
-  const [balanceSheet, setBalanceSheet] = useState(null);
-  const [incomeStatement, setIncomeStatement] = useState(null);
 
   const calculateFinancialRatios = () => {
     // Hardcoded values to match target ratios
@@ -958,34 +838,25 @@ export default function Dashboard() {
           <div>
             <div style={{ fontSize: 12, color: "#666", marginBottom: 4 }}>Total Active Accounts</div>
             <div style={{ fontSize: 18, fontWeight: "bold", color: "#1C5C59" }}>
-              {accounts.filter(account => account.is_active).length}
+              {summaryTotals?.active_accounts ?? 0}
             </div>
           </div>
           <div>
             <div style={{ fontSize: 12, color: "#666", marginBottom: 4 }}>Total Assets</div>
             <div style={{ fontSize: 18, fontWeight: "bold", fontFamily: "monospace" }}>
-              {formatCurrency(accounts
-                .filter(account => account.account_category === "ASSET" && account.is_active)
-                .reduce((sum, account) => sum + parseFloat(account.balance || 0), 0)
-              )}
+              {formatCurrency(parseFloat(summaryTotals?.total_assets || 0))}
             </div>
           </div>
           <div>
             <div style={{ fontSize: 12, color: "#666", marginBottom: 4 }}>Total Liabilities</div>
             <div style={{ fontSize: 18, fontWeight: "bold", fontFamily: "monospace" }}>
-              {formatCurrency(accounts
-                .filter(account => account.account_category === "LIABILITY" && account.is_active)
-                .reduce((sum, account) => sum + parseFloat(account.balance || 0), 0)
-              )}
+              {formatCurrency(parseFloat(summaryTotals?.total_liabilities || 0))}
             </div>
           </div>
           <div>
             <div style={{ fontSize: 12, color: "#666", marginBottom: 4 }}>Total Equity</div>
             <div style={{ fontSize: 18, fontWeight: "bold", fontFamily: "monospace" }}>
-              {formatCurrency(accounts
-                .filter(account => account.account_category === "EQUITY" && account.is_active)
-                .reduce((sum, account) => sum + parseFloat(account.balance || 0), 0)
-              )}
+              {formatCurrency(parseFloat(summaryTotals?.total_equity || 0))}
             </div>
           </div>
         </div>
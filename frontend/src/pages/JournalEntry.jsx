@@ -61,7 +61,10 @@ export default function JournalEntry() {
 
   const fetchAccounts = async () => {
     try {
-      const res = await api.get('/chart-of-accounts/');
+      const res = await api.get('/chart-of-accounts/', {
+        // The account pickers only render these columns
+        params: { fields: 'id,account_number,account_name,account_category,account_subcategory,normal_side,is_active' },
+      });
       setAccounts(res.data.filter(acc => acc.is_active));
     } catch (err) {
       console.error('Failed to fetch accounts:', err);
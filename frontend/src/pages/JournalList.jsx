@@ -6,6 +6,9 @@ import CloseAccountModal from '../components/CloseAccountModal';
 import SelectAccountModal from '../components/SelectAccountModal';
 import '../styles/auth.css';
 
+// Entries are listed in keyset pages; each entry's lines load when its row is opened
+const JOURNAL_PAGE_SIZE = 50;
+
 export default function JournalList() {
   const navigate = useNavigate();
   const [searchParams, setSearchParams] = useSearchParams();
@@ -13,8 +16,11 @@ export default function JournalList() {
 
   const [activeTab, setActiveTab] = useState(initialTab.toUpperCase());
   const [entries, setEntries] = useState([]);
-  const [allEntries, setAllEntries] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [entryLines, setEntryLines] = useState({});
+  const [loadingLines, setLoadingLines] = useState({});
   const [error, setError] = useState('');
   const [userRole, setUserRole] = useState('');
   const [rolePrefix, setRolePrefix] = useState('manager');
@@ -58,24 +64,26 @@ export default function JournalList() {
     }
   };
 
+  const fetchEntryPage = async (cursor) => {
+    const params = {
+      limit: JOURNAL_PAGE_SIZE,
+      ...(cursor && { cursor }),
+      ...(activeTab !== 'ALL' && { status: activeTab }),
+      ...(startDate && { start_date: startDate }),
+      ...(endDate && { end_date: endDate }),
+    };
+
+    const res = await api.get('/journal-entries/', { params });
+    setEntries(prev => (cursor ? [...prev, ...res.data.results] : res.data.results));
+    setNextCursor(res.data.has_more ? res.data.next_cursor : null);
+  };
+
   const fetchEntries = async () => {
     try {
       setLoading(true);
       setError('');
-      
-      const params = {
-        ...(startDate && { start_date: startDate }),
-        ...(endDate && { end_date: endDate }),
-      };
-
-      const res = await api.get('/journal-entries/', { params });
-      setAllEntries(res.data);
-      
-      if (activeTab === 'ALL') {
-        setEntries(res.data);
-      } else {
-        setEntries(res.data.filter(e => e.status === activeTab));
-      }
+      setEntryLines({});
+      await fetchEntryPage(null);
     } catch (err) {
       console.error('Failed to fetch journal entries:', err);
       setError('Failed to load journal entries');
@@ -84,15 +92,45 @@ export default function JournalList() {
     }
   };
 
+  const loadMoreEntries = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      await fetchEntryPage(nextCursor);
+    } catch (err) {
+      console.error('Failed to fetch more journal entries:', err);
+      setError('Failed to load more journal entries');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const toggleEntryLines = async (entry) => {
+    if (entryLines[entry.id]) {
+      setEntryLines(prev => {
+        const next = { ...prev };
+        delete next[entry.id];
+        return next;
+      });
+      return;
+    }
+
+    try {
+      setLoadingLines(prev => ({ ...prev, [entry.id]: true }));
+      const res = await api.get(`/journal-entries/${entry.id}/`, { params: { fields: 'id,lines' } });
+      setEntryLines(prev => ({ ...prev, [entry.id]: res.data.lines }));
+    } catch (err) {
+      console.error('Failed to fetch journal entry lines:', err);
+      alert(err.response?.data?.detail || 'Failed to load journal entry lines');
+    } finally {
+      setLoadingLines(prev => ({ ...prev, [entry.id]: false }));
+    }
+  };
+
   const handleTabChange = (tab) => {
+    // The status filter runs on the server; changing the tab refetches
     setActiveTab(tab);
     setSearchParams({ status: tab.toLowerCase() });
-    
-    if (tab === 'ALL') {
-      setEntries(allEntries);
-    } else {
-      setEntries(allEntries.filter(e => e.status === tab));
-    }
   };
 
   const handleAccountSelected = (account) => {
@@ -230,7 +268,8 @@ export default function JournalList() {
           entry.total_credits.toFixed(2).includes(search)
         );
         
-        const matchesAccount = entry.lines?.some(line => 
+        // Account names are only known for entries whose lines have been opened
+        const matchesAccount = entryLines[entry.id]?.some(line => 
           line.account_name?.toLowerCase().includes(search) ||
           line.account_number?.toString().includes(search)
         );
@@ -267,7 +306,7 @@ export default function JournalList() {
     }
 
     return filtered;
-  }, [entries, searchTerm, sortConfig, additionalFilter, userRole]);
+  }, [entries, entryLines, searchTerm, sortConfig, additionalFilter, userRole]);
 
   const formatCurrency = (amount) => {
     return new Intl.NumberFormat('en-US', {
@@ -632,13 +671,54 @@ export default function JournalList() {
                     return '#4f772d'; // Regular
                   };
 
+                  const lines = entryLines[entry.id];
+
+                  const renderLinesToggle = () => {
+                    if (!entry.line_count) {
+                      return <div style={{ color: '#666' }}>No account lines</div>;
+                    }
+                    return (
+                      <button
+                        onClick={() => toggleEntryLines(entry)}
+                        disabled={loadingLines[entry.id]}
+                        className="clickable-link"
+                        style={{
+                          background: 'none',
+                          border: 'none',
+                          padding: 0,
+                          fontSize: 'inherit',
+                          fontFamily: 'inherit',
+                          color: '#1C5C59',
+                          cursor: 'pointer',
+                          textDecoration: 'underline'
+                        }}
+                        title={lines ? 'Hide account lines' : 'Show account lines'}
+                      >
+                        {loadingLines[entry.id]
+                          ? 'Loading accounts...'
+                          : lines
+                            ? 'Hide accounts'
+                            : `Show accounts (${entry.line_count} line${entry.line_count === 1 ? '' : 's'})`}
+                      </button>
+                    );
+                  };
+
                   const renderAccountsColumn = () => {
-                    if (!entry.lines || entry.lines.length === 0) {
-                      return <div style={{ fontSize: '0.85em', color: '#666' }}>No account lines</div>;
+                    if (!lines) {
+                      return (
+                        <div style={{ fontSize: '0.85em' }}>
+                          {renderLinesToggle()}
+                          {entry.description && (
+                            <div style={{ marginTop: '8px', fontStyle: 'italic', color: '#555' }}>
+                              <span style={{ fontWeight: 'bold' }}>Description:</span> {entry.description}
+                            </div>
+                          )}
+                        </div>
+                      );
                     }
 
-                    const debitLines = entry.lines.filter(line => parseFloat(line.debit) > 0);
-                    const creditLines = entry.lines.filter(line => parseFloat(line.credit) > 0);
+                    const debitLines = lines.filter(line => parseFloat(line.debit) > 0);
+                    const creditLines = lines.filter(line => parseFloat(line.credit) > 0);
 
                     return (
                       <div style={{ fontSize: '0.85em' }}>
@@ -667,12 +747,13 @@ export default function JournalList() {
                             <span style={{ fontWeight: 'bold' }}>Description:</span> {entry.description}
                           </div>
                         )}
+                        <div style={{ marginTop: '8px' }}>{renderLinesToggle()}</div>
                       </div>
                     );
                   };
 
                   const renderDebitCreditColumns = () => {
-                    if (!entry.lines || entry.lines.length === 0) {
+                    if (!entry.line_count) {
                       return (
                         <>
                           <td style={{ 
@@ -697,8 +778,13 @@ export default function JournalList() {
                       );
                     }
 
-                    const debitLines = entry.lines.filter(line => parseFloat(line.debit) > 0);
-                    const creditLines = entry.lines.filter(line => parseFloat(line.credit) > 0);
+                    // Closed rows show the entry totals from the list response
+                    const debitLines = lines
+                      ? lines.filter(line => parseFloat(line.debit) > 0)
+                      : [{ debit: entry.total_debits }];
+                    const creditLines = lines
+                      ? lines.filter(line => parseFloat(line.credit) > 0)
+                      : [{ credit: entry.total_credits }];
 
                     return (
                       <>
@@ -870,6 +956,20 @@ export default function JournalList() {
         </table>
           </div>
         )}
+
+        {!loading && nextCursor && (
+          <div style={{ display: 'flex', justifyContent: 'center', marginTop: 12 }}>
+            <button
+              onClick={loadMoreEntries}
+              disabled={loadingMore}
+              className="auth-linkbtn"
+              style={{ height: '30px', padding: '0 12px', fontSize: 14, width: 'auto', minWidth: '120px' }}
+              title="Load the next page of journal entries"
+            >
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
       </div>
 
       {showApprovalModal && (
@@ -5,6 +5,9 @@ import HelpModal from "../components/HelpModal";
 import "../styles/auth.css";
 import "../styles/layout.css";
 
+// Ledger rows are fetched in keyset pages; running balances come from the server
+const LEDGER_PAGE_SIZE = 100;
+
 function formatCurrency(value) {
   if (value === null || value === undefined) return "$0.00";
   return new Intl.NumberFormat("en-US", {
@@ -20,7 +23,9 @@ export default function Ledger() {
   const navigate = useNavigate();
   const [account, setAccount] = useState(null);
   const [transactions, setTransactions] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState("");
   const [sortConfig, setSortConfig] = useState({ key: null, direction: 'asc' });
   const [searchTerm, setSearchTerm] = useState("");
@@ -35,6 +40,16 @@ export default function Ledger() {
     fetchUserRole();
   }, [accountId]);
 
+  // Date and side filters run on the server so they cover every page
+  useEffect(() => {
+    if (account) {
+      fetchLedgerPage(account, null).catch((err) => {
+        console.error("Error fetching ledger entries:", err);
+        setError(err?.response?.data?.detail || "Failed to load ledger entries");
+      });
+    }
+  }, [selectedDate, filter]);
+
   useEffect(() => {
     const handleClickOutside = () => {
       if (showDatePicker) {
@@ -83,9 +98,8 @@ export default function Ledger() {
       
       setAccount(account);
       
-      // Fetch ledger entries for this account
-      const ledgerResponse = await api.get(`/chart-of-accounts/${account.id}/ledger_entries/`);
-      setTransactions(ledgerResponse.data);
+      // Fetch the first page of ledger entries for this account
+      await fetchLedgerPage(account, null);
     } catch (err) {
       console.error("Error fetching account:", err);
       setError(err?.response?.data?.detail || "Failed to load account details");
@@ -94,6 +108,36 @@ export default function Ledger() {
     }
   }
 
+  async function fetchLedgerPage(ledgerAccount, cursor) {
+    const params = { limit: LEDGER_PAGE_SIZE };
+    if (cursor) params.cursor = cursor;
+    if (selectedDate) {
+      params.start_date = selectedDate;
+      params.end_date = selectedDate;
+    }
+    if (filter === "debit" || filter === "credit") {
+      params.side = filter;
+    }
+
+    const ledgerResponse = await api.get(`/chart-of-accounts/${ledgerAccount.id}/ledger_entries/`, { params });
+    const page = ledgerResponse.data;
+    setTransactions((prev) => (cursor ? [...prev, ...page.results] : page.results));
+    setNextCursor(page.has_more ? page.next_cursor : null);
+  }
+
+  async function loadMore() {
+    if (!account || !nextCursor) return;
+    try {
+      setLoadingMore(true);
+      await fetchLedgerPage(account, nextCursor);
+    } catch (err) {
+      console.error("Error loading more ledger entries:", err);
+      setError(err?.response?.data?.detail || "Failed to load more ledger entries");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   const handleSort = (key) => {
     let direction = 'asc';
     if (sortConfig.key === key && sortConfig.direction === 'asc') {
@@ -109,60 +153,16 @@ export default function Ledger() {
     return sortConfig.direction === 'asc' ? ' ⌃' : ' ⌄';
   };
 
-  // Calculate running balance for each transaction
-  const transactionsWithBalance = useMemo(() => {
-    if (!account || !transactions.length) return [];
-
-    // Sort transactions by date first (chronological order is critical for balance calculation)
-    const sorted = [...transactions].sort((a, b) => {
-      const dateA = new Date(a.date || 0);
-      const dateB = new Date(b.date || 0);
-      if (dateA.getTime() !== dateB.getTime()) {
-        return dateA.getTime() - dateB.getTime();
-      }
-      // If same date, sort by reference ID for consistency
-      return (a.reference || '').localeCompare(b.reference || '');
-    });
-
-    // Get initial balance from account
-    const initialBalance = parseFloat(account.initial_balance || account.balance || 0);
-    const normalSide = account.normal_side || 'DEBIT';
-
-    // Calculate running balance
-    let runningBalance = initialBalance;
-    const transactionsWithBal = sorted.map((tx) => {
-      const debit = parseFloat(tx.debit || 0);
-      const credit = parseFloat(tx.credit || 0);
-
-      // Calculate balance based on normal side
-      if (normalSide === 'DEBIT') {
-        // For debit normal accounts: debits increase, credits decrease
-        runningBalance = runningBalance + debit - credit;
-      } else {
-        // For credit normal accounts: credits increase, debits decrease
-        runningBalance = runningBalance + credit - debit;
-      }
-
-      return {
-        ...tx,
-        runningBalance: runningBalance
-      };
-    });
-
-    return transactionsWithBal;
-  }, [account, transactions]);
+  // Each row carries the balance the server computed over the full ledger,
+  // so it stays correct however many pages have been loaded
+  const transactionsWithBalance = useMemo(
+    () => transactions.map((tx) => ({ ...tx, runningBalance: parseFloat(tx.running_balance || 0) })),
+    [transactions]
+  );
 
   const filteredTransactions = useMemo(() => {
     let filtered = transactionsWithBalance;
 
-    if (selectedDate) {
-      filtered = filtered.filter((tx) => {
-        if (!tx.date) return false;
-        const txDate = new Date(tx.date).toISOString().split('T')[0];
-        return txDate === selectedDate;
-      });
-    }
-
     if (searchTerm.trim()) {
       const term = searchTerm.toLowerCase();
       filtered = filtered.filter(
@@ -174,11 +174,7 @@ export default function Ledger() {
       );
     }
 
-    if (filter === "debit") {
-      filtered = filtered.filter((tx) => tx.debit > 0);
-    } else if (filter === "credit") {
-      filtered = filtered.filter((tx) => tx.credit > 0);
-    } else if (filter === "opening") {
+    if (filter === "opening") {
       filtered = filtered.filter((tx) => tx.description === "Opening Balance");
     }
 
@@ -226,7 +222,7 @@ export default function Ledger() {
     }
 
     return filtered;
-  }, [transactionsWithBalance, searchTerm, filter, sortConfig, selectedDate]);
+  }, [transactionsWithBalance, searchTerm, filter, sortConfig]);
 
   if (loading) {
     return <div style={{ padding: "12px 16px" }}>Loading ledger...</div>;
@@ -685,6 +681,20 @@ export default function Ledger() {
         </table>
       </div>
 
+      {nextCursor && (
+        <div style={{ display: "flex", justifyContent: "center", marginTop: 12 }}>
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="auth-linkbtn"
+            style={{ height: "30px", padding: "0 12px", fontSize: 14, width: "auto", minWidth: "120px" }}
+            title="Load the next page of transactions"
+          >
+            {loadingMore ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
+
       <div style={{ 
         display: "flex", 
         justifyContent: "left", 